@@ -2,37 +2,82 @@
 API FastAPI pour l'enrichissement de scénarios pédagogiques
 """
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Header, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, FileResponse, Response, StreamingResponse
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
 import json
 import os
-import zipfile
+import sys
+import time
+import importlib
+from contextlib import asynccontextmanager
 import shutil
 from pathlib import Path
 import uuid
+import socket
 from datetime import datetime
 import asyncio
 import logging
 import traceback
+import threading
 
 from src.config import Config
 from src.models.pedagogical_scenario import PedagogicalScenario
-from src.enrichment.scenario_enrichment import ScenarioEnrichment
-from src.loaders.markdown_loader import MarkdownLoader
-from src.loaders.airtable_loader import AirtableArticleManager
-from src.processors.generate_md_for_marp import generate_marp_slides_from_md
+from src.concurrency import run_bounded
+from src.tasks import (
+    create_task_store, JobScheduler, QueueFullError, Stage, run_pipeline, TaskEventBus, END_EVENT,
+    directory_fingerprint, archive_cache_path, stream_task_archive, build_task_archive, prune_task_archives
+)
 import ssl
 ssl._create_default_https_context = ssl._create_unverified_context
 # Configuration du logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Modules des traitements, importés en arrière-plan au démarrage si API_PRELOAD_MODULES=true
+PRELOAD_MODULES = (
+    "src.enrichment.scenario_enrichment",
+    "src.processors.generate_md_for_marp",
+    "src.loaders.airtable_loader",
+)
+
+def preload_modules() -> None:
+    """Importe les modules lourds des traitements (exécuté dans un thread de fond)."""
+    start = time.perf_counter()
+    for module_name in PRELOAD_MODULES:
+        try:
+            importlib.import_module(module_name)
+        except Exception as e:
+            logger.warning(f"Préchargement de {module_name} impossible: {e}")
+    logger.info(f"Modules de traitement préchargés en {time.perf_counter() - start:.1f}s")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Cycle de vie de l'API: tâches dont le bail a expiré (worker arrêté) marquées
+    en échec, renouvellement du bail des tâches de ce worker en arrière-plan,
+    archives en cache des tâches supprimées effacées, préchargement optionnel des modules lourds après le démarrage (l'API
+    répond déjà pendant ce temps), arrêt du planificateur et fermeture des
+    connexions LLM à la fin.
+    """
+    fail_expired_tasks()
+    prune_download_cache()
+    heartbeat_stop = threading.Event()
+    threading.Thread(target=task_heartbeat_loop, args=(heartbeat_stop,), name="task-heartbeat", daemon=True).start()
+    if Config.API_PRELOAD_MODULES:
+        threading.Thread(target=preload_modules, name="preload-modules", daemon=True).start()
+    yield
+    heartbeat_stop.set()
+    job_scheduler.shutdown(wait=False)
+    if "src.llm.clients" in sys.modules:
+        sys.modules["src.llm.clients"].close_llm_clients()
+
 app = FastAPI(
     title="Agrivision - Enrichissement de Scénarios",
     description="API pour enrichir des scénarios pédagogiques avec des articles scientifiques",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Modèles Pydantic pour l'API
@@ -49,6 +94,7 @@ class EnrichmentResponse(BaseModel):
 class AirtableSyncRequest(BaseModel):
     data_directory: str = "data"
     clean_before_sync: bool = False
+    full_sync: bool = False
 
 class AirtableSyncResponse(BaseModel):
     task_id: str
@@ -82,8 +128,39 @@ class TaskStatus(BaseModel):
     created_at: str
     completed_at: Optional[str] = None
 
-# Stockage des tâches en mémoire (pour une version production, utiliser Redis/DB)
-tasks_storage = {}
+# Stockage des tâches (SQLite par défaut, voir TASK_STORE_BACKEND): les tâches
+# survivent aux redémarrages et sont visibles de tous les workers uvicorn
+task_store = create_task_store()
+
+# Planificateur des traitements longs: nombre de pipelines simultanées et taille
+# de la file d'attente bornés (JOB_WORKERS, JOB_QUEUE_SIZE)
+job_scheduler = JobScheduler(Config.JOB_WORKERS, Config.JOB_QUEUE_SIZE)
+
+# Événements d'avancement diffusés par /tasks/{task_id}/events (SSE) et /tasks/{task_id}/ws
+task_events = TaskEventBus()
+
+# Intervalle de lecture du stockage pour les tâches absentes du bus de ce processus
+# (tâche exécutée par un autre worker ou avant un redémarrage)
+TASK_EVENTS_POLL_SECONDS = 1.0
+
+# Durée maximale de lecture du stockage sans changement de la tâche: au-delà, le
+# flux est fermé (le client peut se reconnecter)
+TASK_EVENTS_POLL_MAX_IDLE_SECONDS = 3600
+
+# Erreur des tâches dont le worker s'est arrêté (bail expiré, voir TASK_LEASE_SECONDS)
+TASK_INTERRUPTED_ERROR = "Tâche interrompue par l'arrêt ou le redémarrage de son worker"
+
+# Identifiant de ce worker, propriétaire (champ `owner`) des tâches qu'il exécute
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+# Délai suggéré au client (en-tête Retry-After) lorsque la file est pleine
+QUEUE_FULL_RETRY_AFTER_SECONDS = 30
+
+# Modèles de requête, par nom de classe, pour reconstruire une tâche stockée
+REQUEST_MODELS = {
+    model.__name__: model
+    for model in (EnrichmentRequest, AirtableSyncRequest, MarpSlidesRequest, EnrichAndSlidesRequest)
+}
 
 def load_scenario_from_json(json_path: str) -> PedagogicalScenario:
     """
@@ -107,7 +184,11 @@ def load_scenario_from_json(json_path: str) -> PedagogicalScenario:
     return PedagogicalScenario(**scenario_data)
 
 class EnrichmentTask:
+    # Champs dont la modification est immédiatement répercutée dans task_store
+    PERSISTED_FIELDS = ("status", "progress", "result", "error", "completed_at", "heartbeat_at")
+    
     def __init__(self, task_id: str, request: EnrichmentRequest):
+        self._persisted = False
         self.task_id = task_id
         self.request = request
         self.status = "pending"
@@ -116,6 +197,146 @@ class EnrichmentTask:
         self.error = None
         self.created_at = datetime.now().isoformat()
         self.completed_at = None
+        # Bail de la tâche: worker propriétaire et dernier renouvellement
+        self.owner = WORKER_ID
+        self.heartbeat_at = time.time()
+    
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name in self.PERSISTED_FIELDS and self._persisted:
+            task_store.save(self.to_dict())
+            if name == "status":
+                task_events.publish(self.task_id, "status", {"status": value})
+            elif name == "progress":
+                task_events.publish(self.task_id, "progress", {"message": value})
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Sérialise la tâche pour le stockage."""
+        return {
+            "task_id": self.task_id,
+            "request_type": type(self.request).__name__,
+            "request": self.request.model_dump(),
+            "status": self.status,
+            "progress": self.progress,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "completed_at": self.completed_at,
+            "owner": self.owner,
+            "heartbeat_at": self.heartbeat_at
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "EnrichmentTask":
+        """Reconstruit une tâche (non liée au stockage) depuis sa forme sérialisée."""
+        request_model = REQUEST_MODELS.get(data.get("request_type"), EnrichmentRequest)
+        task = cls(data["task_id"], request_model(**data.get("request", {})))
+        for field in cls.PERSISTED_FIELDS + ("created_at", "owner"):
+            setattr(task, field, data.get(field))
+        return task
+
+# Tâches non terminées exécutées par ce worker, dont le bail est renouvelé par task_heartbeat_loop
+active_tasks: Dict[str, EnrichmentTask] = {}
+active_tasks_lock = threading.Lock()
+
+def fail_expired_tasks() -> None:
+    """Marque en échec les tâches dont le worker a cessé de renouveler le bail."""
+    interrupted = task_store.fail_expired(TASK_INTERRUPTED_ERROR, Config.TASK_LEASE_SECONDS)
+    if interrupted:
+        logger.warning(f"{interrupted} tâche(s) interrompue(s) (bail expiré) marquée(s) en échec")
+
+def task_heartbeat_loop(stop: threading.Event) -> None:
+    """
+    Renouvelle toutes les TASK_HEARTBEAT_SECONDS le bail des tâches de ce worker,
+    puis marque en échec les tâches abandonnées par les autres workers.
+    """
+    while not stop.wait(Config.TASK_HEARTBEAT_SECONDS):
+        with active_tasks_lock:
+            tasks = list(active_tasks.values())
+        try:
+            for task in tasks:
+                task.heartbeat_at = time.time()
+            fail_expired_tasks()
+        except Exception as e:
+            logger.warning(f"Renouvellement du bail des tâches impossible: {e}")
+
+def prune_download_cache() -> None:
+    """Supprime les archives ZIP en cache des tâches qui ne sont plus dans le stockage."""
+    removed = prune_task_archives(Path(Config.DOWNLOAD_CACHE_DIR), (task["task_id"] for task in task_store.list()))
+    if removed:
+        logger.info(f"{removed} archive(s) en cache de tâches supprimées effacée(s)")
+
+def register_task(task: EnrichmentTask) -> None:
+    """
+    Enregistre une nouvelle tâche dans le stockage et y répercute ses mises à jour.
+    
+    Les tâches terminées expirées (TASK_TTL_SECONDS) ou en surnombre
+    (TASK_STORE_MAX_FINISHED) sont supprimées au passage, avec leurs archives en cache.
+    """
+    evicted = task_store.evict(Config.TASK_TTL_SECONDS, Config.TASK_STORE_MAX_FINISHED)
+    if evicted:
+        logger.info(f"{evicted} tâche(s) terminée(s) supprimée(s) du stockage")
+        prune_download_cache()
+    
+    task_store.save(task.to_dict())
+    task_events.open(task.task_id)
+    task._persisted = True
+    with active_tasks_lock:
+        active_tasks[task.task_id] = task
+
+def run_task(func, task: EnrichmentTask, *args) -> None:
+    """Exécute le traitement d'une tâche puis publie son état final (événement de fin)."""
+    try:
+        func(task, *args)
+    finally:
+        with active_tasks_lock:
+            active_tasks.pop(task.task_id, None)
+        task_events.publish(task.task_id, END_EVENT, {
+            "status": task.status,
+            "progress": task.progress,
+            "result": task.result,
+            "error": task.error,
+            "completed_at": task.completed_at
+        })
+
+def enrichment_progress_publisher(task: EnrichmentTask):
+    """Retourne un callback publiant les événements de ScenarioEnrichment (articles, séquences)."""
+    return lambda event, data: task_events.publish(task.task_id, event, data)
+
+def submit_task(task: EnrichmentTask, func, *args) -> None:
+    """
+    Enregistre une tâche et soumet son traitement au planificateur.
+    
+    Tant que la tâche attend un worker, sa position dans la file est indiquée
+    dans `progress`.
+    
+    Raises:
+        HTTPException: 429 si la file d'attente est pleine
+    """
+    def report_queue_position(position: int) -> None:
+        if task.status == "pending":
+            task.progress = f"En file d'attente (position {position})"
+    
+    register_task(task)
+    try:
+        job_scheduler.submit(task.task_id, run_task, func, task, *args, on_queue_position=report_queue_position)
+    except QueueFullError as e:
+        with active_tasks_lock:
+            active_tasks.pop(task.task_id, None)
+        task_store.delete(task.task_id)
+        task_events.discard(task.task_id)
+        raise HTTPException(
+            status_code=429,
+            detail=f"{e}. Réessayez plus tard.",
+            headers={"Retry-After": str(QUEUE_FULL_RETRY_AFTER_SECONDS)}
+        )
+
+def get_task_or_404(task_id: str) -> EnrichmentTask:
+    """Charge une tâche depuis le stockage ou lève une erreur 404."""
+    data = task_store.get(task_id)
+    if data is None:
+        raise HTTPException(status_code=404, detail="Tâche non trouvée")
+    return EnrichmentTask.from_dict(data)
 
 def load_scenario_from_json(json_path: str) -> PedagogicalScenario:
     """
@@ -138,8 +359,17 @@ def load_scenario_from_json(json_path: str) -> PedagogicalScenario:
     scenario_data = scenarios_data[0]
     return PedagogicalScenario(**scenario_data)
 
-async def process_enrichment_task(task: EnrichmentTask):
-    """Traitement asynchrone de l'enrichissement"""
+# Les dépendances lourdes (langchain, openai, pyairtable, unstructured, docx) et
+# les clients LLM ne sont importés qu'à la première exécution d'un traitement,
+# dans les fonctions ci-dessous: le démarrage de l'API et /health restent rapides.
+
+# Les traitements de fond sont des fonctions synchrones (appels LLM, Airtable et
+# fichiers bloquants): ils s'exécutent dans les workers de job_scheduler (ou le
+# pool de threads de FastAPI pour la synchronisation Airtable), ce qui laisse
+# la boucle d'événements libre pour /tasks, /health et les autres requêtes.
+
+def process_enrichment_task(task: EnrichmentTask):
+    """Traitement en arrière-plan de l'enrichissement"""
     try:
         logger.info(f"Démarrage de la tâche {task.task_id}")
         task.status = "running"
@@ -194,8 +424,9 @@ async def process_enrichment_task(task: EnrichmentTask):
         
         # Initialisation de l'enrichisseur
         try:
-            loader = MarkdownLoader()
-            enricher = ScenarioEnrichment(            )
+            from src.enrichment.scenario_enrichment import ScenarioEnrichment
+            
+            enricher = ScenarioEnrichment(progress_callback=enrichment_progress_publisher(task))
             logger.info("Enrichisseur initialisé")
         except Exception as e:
             error_msg = f"Erreur lors de l'initialisation de l'enrichisseur: {str(e)}"
@@ -316,10 +547,7 @@ async def process_enrichment_task(task: EnrichmentTask):
         task.progress = f"Erreur: {str(e)}"
 
 @app.post("/generate-marp-slides", response_model=MarpSlidesResponse)
-async def generate_marp_slides(
-    request: MarpSlidesRequest,
-    background_tasks: BackgroundTasks
-):
+async def generate_marp_slides(request: MarpSlidesRequest):
     """
     Génère des slides Marp pour chaque document dans le dossier /data
     Les slides sont nommées avec task_id + document_id
@@ -339,10 +567,9 @@ async def generate_marp_slides(
     
     # Création d'une nouvelle tâche pour les slides
     slides_task = EnrichmentTask(slides_task_id, request)
-    tasks_storage[slides_task_id] = slides_task
     
-    # Lancement de la génération en arrière-plan
-    background_tasks.add_task(process_marp_slides_from_data_task, slides_task, md_files)
+    # Mise en file d'attente de la génération
+    submit_task(slides_task, process_marp_slides_from_data_task, md_files)
     
     return MarpSlidesResponse(
         task_id=slides_task_id,
@@ -350,8 +577,88 @@ async def generate_marp_slides(
         message=f"Génération de slides Marp lancée pour {len(md_files)} documents. Vérifiez l'avancement avec /tasks/{slides_task_id}"
     )
 
-async def process_marp_slides_from_data_task(slides_task: EnrichmentTask, md_files: list):
-    """Traitement asynchrone de la génération de slides Marp pour tous les documents du dossier data"""
+def generate_task_slides(task: EnrichmentTask, md_files: list, task_output_dir: Path,
+                         report_progress=None) -> tuple:
+    """
+    Génère en parallèle les slides Marp de chaque document pour une tâche.
+    
+    Au plus MARP_MAX_CONCURRENCY documents sont traités simultanément; chaque
+    fichier de slides est écrit dès que son document est terminé et le compteur
+    d'avancement de la tâche est mis à jour sous verrou.
+    
+    Args:
+        task: Tâche à laquelle rattacher les slides
+        md_files: Fichiers .md sources
+        task_output_dir: Répertoire de sortie de la tâche
+        report_progress: Fonction recevant les messages d'avancement (par défaut,
+            ils sont écrits dans task.progress)
+        
+    Returns:
+        Tuple (slides générées, erreurs), dans l'ordre des fichiers sources
+    """
+    if report_progress is None:
+        report_progress = lambda message: setattr(task, "progress", message)
+    
+    from src.processors.generate_md_for_marp import generate_marp_file
+    
+    progress_lock = threading.Lock()
+    counters = {"done": 0, "errors": 0}
+    total = len(md_files)
+    
+    def generate_document(md_file: Path) -> dict:
+        # Extraction de l'ID du document depuis le nom du fichier
+        # Format attendu: YYYYMMDD_recXXXXXXXXXXXXXX.md
+        doc_name = md_file.stem
+        doc_id = doc_name.split('_')[-1] if '_' in doc_name else doc_name
+        
+        # Nom du fichier de sortie: task_id + doc_id
+        slides_path = task_output_dir / f"marp_{task.task_id}_{doc_id}.md"
+        
+        try:
+            slides_count = generate_marp_file(md_file, slides_path)
+            logger.info(f"Slides générées pour {md_file.name}: {slides_path.name} ({slides_count} slides)")
+        except Exception as e:
+            logger.error(f"Erreur lors du traitement de {md_file.name}: {str(e)}")
+            with progress_lock:
+                counters["done"] += 1
+                counters["errors"] += 1
+                task_events.publish(task.task_id, "document", {
+                    "done": counters["done"], "total": total, "file": md_file.name, "status": "error"
+                })
+                report_progress(f"Génération slides {counters['done']}/{total} ({counters['errors']} erreurs)")
+            raise
+        
+        with progress_lock:
+            counters["done"] += 1
+            task_events.publish(task.task_id, "document", {
+                "done": counters["done"], "total": total, "file": md_file.name, "status": "generated"
+            })
+            report_progress(f"Génération slides {counters['done']}/{total}: {md_file.name}")
+        
+        return {
+            "source_file": str(md_file),
+            "slides_file": str(slides_path),
+            "slides_count": slides_count,
+            "document_id": doc_id
+        }
+    
+    generated_slides = []
+    errors = []
+    results = run_bounded(generate_document, md_files, Config.MARP_MAX_CONCURRENCY)
+    for md_file, (slides_info, error) in zip(md_files, results):
+        if error:
+            errors.append({
+                "source_file": str(md_file),
+                "error": str(error),
+                "error_type": type(error).__name__
+            })
+        else:
+            generated_slides.append(slides_info)
+    
+    return generated_slides, errors
+
+def process_marp_slides_from_data_task(slides_task: EnrichmentTask, md_files: list):
+    """Traitement en arrière-plan de la génération de slides Marp pour tous les documents du dossier data"""
     try:
         logger.info(f"Démarrage de la génération de slides Marp {slides_task.task_id} pour {len(md_files)} documents")
         slides_task.status = "running"
@@ -361,77 +668,8 @@ async def process_marp_slides_from_data_task(slides_task: EnrichmentTask, md_fil
         task_output_dir = Path(f"output/task_{slides_task.task_id}")
         task_output_dir.mkdir(parents=True, exist_ok=True)
         
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        generated_slides = []
-        errors = []
-        
-        # Traitement de chaque fichier .md
-        for i, md_file in enumerate(md_files, 1):
-            try:
-                slides_task.progress = f"Traitement document {i}/{len(md_files)}: {md_file.name}"
-                logger.info(f"Traitement de {md_file.name}")
-                
-                # Extraction de l'ID du document depuis le nom du fichier
-                # Format attendu: YYYYMMDD_recXXXXXXXXXXXXXX.md
-                doc_name = md_file.stem
-                doc_id = doc_name.split('_')[-1] if '_' in doc_name else doc_name
-                
-                # Lecture du contenu Markdown
-                with open(md_file, 'r', encoding='utf-8') as f:
-                    md_content = f.read()
-                logger.info(f"Fichier {md_file.name} lu: {len(md_content)} caractères")
-                
-                # Génération des slides avec le processeur existant
-                marp_content = generate_marp_slides_from_md(md_content)
-                
-                # Traitement du contenu retourné par l'IA
-                if hasattr(marp_content, 'content'):
-                    markdown_content = marp_content.content
-                else:
-                    markdown_content = str(marp_content)
-                
-                # Nettoyage du contenu (même logique que dans le script original)
-                if "```markdown" in markdown_content:
-                    markdown_content = markdown_content.split("```markdown", 1)[1]
-                if "```" in markdown_content:
-                    markdown_content = markdown_content.split("```", 1)[0]
-                
-                markdown_content = markdown_content.strip()
-                if markdown_content.startswith("---"):
-                    markdown_content = markdown_content.split("---", 1)[1].lstrip()
-                
-                # Diviser en slides
-                slides = markdown_content.split("---")
-                non_empty_slides = [slide.strip() for slide in slides if slide.strip()]
-                
-                # Construction du contenu final
-                final_content = "---\nmarp: true\n---\n\n" + "\n\n---\n\n".join(non_empty_slides)
-                
-                # Nom du fichier de sortie: task_id + doc_id
-                slides_filename = f"marp_{slides_task.task_id}_{doc_id}.md"
-                slides_path = task_output_dir / slides_filename
-                
-                # Sauvegarde des slides
-                with open(slides_path, 'w', encoding='utf-8') as f:
-                    f.write(final_content)
-                
-                generated_slides.append({
-                    "source_file": str(md_file),
-                    "slides_file": str(slides_path),
-                    "slides_count": len(non_empty_slides),
-                    "document_id": doc_id
-                })
-                
-                logger.info(f"Slides générées pour {md_file.name}: {slides_filename} ({len(non_empty_slides)} slides)")
-                
-            except Exception as e:
-                error_info = {
-                    "source_file": str(md_file),
-                    "error": str(e),
-                    "error_type": type(e).__name__
-                }
-                errors.append(error_info)
-                logger.error(f"Erreur lors du traitement de {md_file.name}: {str(e)}")
+        # Génération parallèle des slides de chaque fichier .md
+        generated_slides, errors = generate_task_slides(slides_task, md_files, task_output_dir)
         
         slides_task.progress = "Sauvegarde des métadonnées..."
         
@@ -490,10 +728,7 @@ async def process_marp_slides_from_data_task(slides_task: EnrichmentTask, md_fil
         slides_task.progress = f"Erreur: {str(e)}"
 
 @app.post("/enrich-and-slides", response_model=EnrichAndSlidesResponse)
-async def enrich_and_generate_slides(
-    request: EnrichAndSlidesRequest,
-    background_tasks: BackgroundTasks
-):
+async def enrich_and_generate_slides(request: EnrichAndSlidesRequest):
     """
     Enrichit un scénario puis génère des slides pour chaque document du dossier data
     avec le même ID de tâche pour les deux opérations
@@ -503,10 +738,9 @@ async def enrich_and_generate_slides(
     
     # Création de la tâche
     task = EnrichmentTask(task_id, request)
-    tasks_storage[task_id] = task
     
-    # Lancement de la pipeline complète en arrière-plan
-    background_tasks.add_task(process_enrich_and_slides_task, task)
+    # Mise en file d'attente de la pipeline complète
+    submit_task(task, process_enrich_and_slides_task)
     
     return EnrichAndSlidesResponse(
         task_id=task_id,
@@ -514,14 +748,46 @@ async def enrich_and_generate_slides(
         message=f"Pipeline d'enrichissement et génération de slides lancée. Vérifiez l'avancement avec /tasks/{task_id}"
     )
 
-async def process_enrich_and_slides_task(task: EnrichmentTask):
-    """Pipeline complète : enrichissement + génération de slides"""
+class PipelineProgress:
+    """
+    Combine dans `task.progress` les messages d'avancement d'étapes exécutées en parallèle.
+    """
+    
+    def __init__(self, task: EnrichmentTask, labels: Dict[str, str]):
+        """
+        Args:
+            task: Tâche dont l'avancement est mis à jour
+            labels: Libellé affiché pour chaque étape, dans l'ordre d'affichage
+        """
+        self.task = task
+        self.labels = labels
+        self.messages: Dict[str, str] = {}
+        self._lock = threading.Lock()
+    
+    def update(self, stage: str, message: str) -> None:
+        with self._lock:
+            self.messages[stage] = message
+            self.task.progress = " | ".join(
+                f"{label} : {self.messages[name]}" for name, label in self.labels.items() if name in self.messages
+            )
+    
+    def reporter(self, stage: str):
+        """Retourne une fonction de rapport d'avancement pour une étape."""
+        return lambda message: self.update(stage, message)
+
+def process_enrich_and_slides_task(task: EnrichmentTask):
+    """
+    Pipeline complète : enrichissement + génération de slides.
+    
+    Les slides ne dépendent que des fichiers .md du répertoire data, pas du
+    scénario enrichi: les deux étapes s'exécutent en parallèle (run_pipeline)
+    et la tâche se termine lorsque les deux sont finies.
+    """
     try:
         logger.info(f"Démarrage de la pipeline complète {task.task_id}")
         task.status = "running"
-        task.progress = "Étape 1/2 : Enrichissement du scénario..."
+        task.progress = "Préparation de la pipeline..."
         
-        # ÉTAPE 1 : ENRICHISSEMENT (code existant)
         # Vérification des fichiers
         scenario_path = Path(task.request.scenario_json)
         data_path = Path(task.request.data_directory)
@@ -538,10 +804,11 @@ async def process_enrich_and_slides_task(task: EnrichmentTask):
             logger.error(error_msg)
             raise FileNotFoundError(error_msg)
         
-        task.progress = "Étape 1/2 : Chargement du scénario depuis JSON..."
+        task.progress = "Chargement du scénario depuis JSON..."
         logger.info("Chargement du scénario depuis JSON")
         
-        # Chargement du scénario depuis JSON
+        # Chargement du scénario depuis JSON (avant de lancer les étapes, pour
+        # échouer rapidement sans générer de slides inutiles)
         try:
             scenario = load_scenario_from_json(str(scenario_path))
             logger.info(f"Scénario chargé: {scenario.scenario_title or 'Sans titre'}, {len(scenario.days)} jours")
@@ -565,174 +832,125 @@ async def process_enrich_and_slides_task(task: EnrichmentTask):
             logger.error(error_msg)
             raise Exception(error_msg)
         
-        task.progress = "Étape 1/2 : Analyse des articles scientifiques..."
-        logger.info("Démarrage de l'analyse des articles")
-        
-        # Initialisation de l'enrichisseur
-        try:
-            loader = MarkdownLoader()
-            enricher = ScenarioEnrichment()
-            logger.info("Enrichisseur initialisé")
-        except Exception as e:
-            error_msg = f"Erreur lors de l'initialisation de l'enrichisseur: {str(e)}"
-            logger.error(error_msg)
-            raise Exception(error_msg)
-        
-        # Analyse des articles
-        try:
-            articles = enricher.analyze_scientific_articles(str(data_path))
-            logger.info(f"Articles analysés: {len(articles)}")
-        except Exception as e:
-            error_msg = f"Erreur lors de l'analyse des articles: {str(e)}"
-            logger.error(error_msg)
-            raise Exception(error_msg)
-        
-        if not articles:
-            logger.warning("Aucun article trouvé dans le répertoire data")
-        
-        task.progress = "Étape 1/2 : Enrichissement du scénario..."
-        logger.info("Démarrage de l'enrichissement")
-        
-        # Enrichissement
-        try:
-            enriched_scenario = enricher.enrich_scenario(scenario, articles)
-            logger.info("Enrichissement terminé")
-        except Exception as e:
-            error_msg = f"Erreur lors de l'enrichissement: {str(e)}"
-            logger.error(error_msg)
-            raise Exception(error_msg)
-        
-        task.progress = "Étape 1/2 : Génération des fichiers d'enrichissement..."
-        logger.info("Génération des fichiers de sortie d'enrichissement")
-        
-        # Génération des fichiers de sortie d'enrichissement
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
         # Créer le répertoire spécifique à cette tâche
         task_output_dir = Path(f"output/task_{task.task_id}")
         task_output_dir.mkdir(parents=True, exist_ok=True)
         
-        enrichment_results = {
-            "scenario_original": enriched_scenario["scenario_original"],
-            "enrichments": enriched_scenario["enrichments"],
-            "articles_used": enriched_scenario["articles_used"],
-            "statistics": {
-                "total_sequences": len([seq for day in scenario.days for seq in day.sequences]),
-                "enriched_sequences": sum(1 for day_enrich in enriched_scenario["enrichments"]["days"] 
-                                        for seq_enrich in day_enrich["sequences"] 
-                                        if seq_enrich["suggestions"]),
-                "total_novelties": sum(len(seq_enrich["suggestions"]) for day_enrich in enriched_scenario["enrichments"]["days"] 
-                                     for seq_enrich in day_enrich["sequences"] if seq_enrich["suggestions"]),
-                "articles_count": len(articles)
-            }
-        }
-        
-        # Sauvegarde JSON
-        json_output = task_output_dir / f"enriched_scenario_{timestamp}.json"
-        try:
-            with open(json_output, 'w', encoding='utf-8') as f:
-                json.dump(enriched_scenario, f, ensure_ascii=False, indent=2)
-            logger.info(f"Fichier JSON sauvé: {json_output}")
-        except Exception as e:
-            error_msg = f"Erreur lors de la sauvegarde JSON: {str(e)}"
-            logger.error(error_msg)
-            raise Exception(error_msg)
+        # Fichiers .md du dossier data pour les slides
+        md_files = list(data_path.glob("*.md"))
         
-        enrichment_files = {"json": str(json_output)}
+        progress = PipelineProgress(task, {"enrichment": "Enrichissement", "slides": "Slides"})
         
-        # Génération markdown si demandé
-        markdown_output = None
-        if task.request.output_format == "markdown":
-            markdown_output = task_output_dir / f"enriched_scenario_{timestamp}.md"
+        def enrichment_stage(_dependencies: Dict[str, Any]) -> tuple:
+            """Étape d'enrichissement: analyse des articles, enrichissement, fichiers de sortie."""
+            task_events.publish(task.task_id, "pipeline_stage", {"stage": "enrichment", "status": "started"})
+            progress.update("enrichment", "Analyse des articles scientifiques...")
+            logger.info("Démarrage de l'analyse des articles")
+            
+            # Initialisation de l'enrichisseur
             try:
-                enricher.export_enriched_markdown(enriched_scenario, str(markdown_output))
-                enrichment_files["markdown"] = str(markdown_output)
-                logger.info(f"Fichier Markdown sauvé: {markdown_output}")
+                from src.enrichment.scenario_enrichment import ScenarioEnrichment
+                
+                enricher = ScenarioEnrichment(progress_callback=enrichment_progress_publisher(task))
+                logger.info("Enrichisseur initialisé")
             except Exception as e:
-                error_msg = f"Erreur lors de la génération Markdown: {str(e)}"
+                error_msg = f"Erreur lors de l'initialisation de l'enrichisseur: {str(e)}"
+                logger.error(error_msg)
+                raise Exception(error_msg)
+            
+            # Analyse des articles
+            try:
+                articles = enricher.analyze_scientific_articles(str(data_path))
+                logger.info(f"Articles analysés: {len(articles)}")
+            except Exception as e:
+                error_msg = f"Erreur lors de l'analyse des articles: {str(e)}"
+                logger.error(error_msg)
+                raise Exception(error_msg)
+            
+            if not articles:
+                logger.warning("Aucun article trouvé dans le répertoire data")
+            
+            progress.update("enrichment", "Enrichissement du scénario...")
+            logger.info("Démarrage de l'enrichissement")
+            
+            # Enrichissement
+            try:
+                enriched_scenario = enricher.enrich_scenario(scenario, articles)
+                logger.info("Enrichissement terminé")
+            except Exception as e:
+                error_msg = f"Erreur lors de l'enrichissement: {str(e)}"
                 logger.error(error_msg)
                 raise Exception(error_msg)
-        
-        # ÉTAPE 2 : GÉNÉRATION DES SLIDES
-        task.progress = "Étape 2/2 : Génération des slides Marp..."
-        logger.info("Démarrage de la génération des slides")
-        
-        # Vérifier les fichiers .md dans le dossier data
-        md_files = list(data_path.glob("*.md"))
-        if not md_files:
-            logger.warning("Aucun fichier .md trouvé dans /data pour les slides")
-            generated_slides = []
-            slides_errors = []
-        else:
-            generated_slides = []
-            slides_errors = []
             
-            # Traitement de chaque fichier .md pour les slides
-            for i, md_file in enumerate(md_files, 1):
+            progress.update("enrichment", "Génération des fichiers d'enrichissement...")
+            logger.info("Génération des fichiers de sortie d'enrichissement")
+            
+            enrichment_results = {
+                "scenario_original": enriched_scenario["scenario_original"],
+                "enrichments": enriched_scenario["enrichments"],
+                "articles_used": enriched_scenario["articles_used"],
+                "statistics": {
+                    "total_sequences": len([seq for day in scenario.days for seq in day.sequences]),
+                    "enriched_sequences": sum(1 for day_enrich in enriched_scenario["enrichments"]["days"] 
+                                            for seq_enrich in day_enrich["sequences"] 
+                                            if seq_enrich["suggestions"]),
+                    "total_novelties": sum(len(seq_enrich["suggestions"]) for day_enrich in enriched_scenario["enrichments"]["days"] 
+                                         for seq_enrich in day_enrich["sequences"] if seq_enrich["suggestions"]),
+                    "articles_count": len(articles)
+                }
+            }
+            
+            # Sauvegarde JSON
+            json_output = task_output_dir / f"enriched_scenario_{timestamp}.json"
+            try:
+                with open(json_output, 'w', encoding='utf-8') as f:
+                    json.dump(enriched_scenario, f, ensure_ascii=False, indent=2)
+                logger.info(f"Fichier JSON sauvé: {json_output}")
+            except Exception as e:
+                error_msg = f"Erreur lors de la sauvegarde JSON: {str(e)}"
+                logger.error(error_msg)
+                raise Exception(error_msg)
+            
+            enrichment_files = {"json": str(json_output)}
+            
+            # Génération markdown si demandé
+            if task.request.output_format == "markdown":
+                markdown_output = task_output_dir / f"enriched_scenario_{timestamp}.md"
                 try:
-                    task.progress = f"Étape 2/2 : Génération slides {i}/{len(md_files)}: {md_file.name}"
-                    logger.info(f"Traitement de {md_file.name} pour les slides")
-                    
-                    # Extraction de l'ID du document depuis le nom du fichier
-                    doc_name = md_file.stem
-                    doc_id = doc_name.split('_')[-1] if '_' in doc_name else doc_name
-                    
-                    # Lecture du contenu Markdown
-                    with open(md_file, 'r', encoding='utf-8') as f:
-                        md_content = f.read()
-                    logger.info(f"Fichier {md_file.name} lu: {len(md_content)} caractères")
-                    
-                    # Génération des slides avec le processeur existant
-                    marp_content = generate_marp_slides_from_md(md_content)
-                    
-                    # Traitement du contenu retourné par l'IA
-                    if hasattr(marp_content, 'content'):
-                        markdown_content = marp_content.content
-                    else:
-                        markdown_content = str(marp_content)
-                    
-                    # Nettoyage du contenu
-                    if "```markdown" in markdown_content:
-                        markdown_content = markdown_content.split("```markdown", 1)[1]
-                    if "```" in markdown_content:
-                        markdown_content = markdown_content.split("```", 1)[0]
-                    
-                    markdown_content = markdown_content.strip()
-                    if markdown_content.startswith("---"):
-                        markdown_content = markdown_content.split("---", 1)[1].lstrip()
-                    
-                    # Diviser en slides
-                    slides = markdown_content.split("---")
-                    non_empty_slides = [slide.strip() for slide in slides if slide.strip()]
-                    
-                    # Construction du contenu final
-                    final_content = "---\nmarp: true\n---\n\n" + "\n\n---\n\n".join(non_empty_slides)
-                    
-                    # Nom du fichier de sortie: task_id + doc_id
-                    slides_filename = f"marp_{task.task_id}_{doc_id}.md"
-                    slides_path = task_output_dir / slides_filename
-                    
-                    # Sauvegarde des slides
-                    with open(slides_path, 'w', encoding='utf-8') as f:
-                        f.write(final_content)
-                    
-                    generated_slides.append({
-                        "source_file": str(md_file),
-                        "slides_file": str(slides_path),
-                        "slides_count": len(non_empty_slides),
-                        "document_id": doc_id
-                    })
-                    
-                    logger.info(f"Slides générées pour {md_file.name}: {slides_filename} ({len(non_empty_slides)} slides)")
-                    
+                    enricher.export_enriched_markdown(enriched_scenario, str(markdown_output))
+                    enrichment_files["markdown"] = str(markdown_output)
+                    logger.info(f"Fichier Markdown sauvé: {markdown_output}")
                 except Exception as e:
-                    error_info = {
-                        "source_file": str(md_file),
-                        "error": str(e),
-                        "error_type": type(e).__name__
-                    }
-                    slides_errors.append(error_info)
-                    logger.error(f"Erreur lors du traitement de {md_file.name}: {str(e)}")
+                    error_msg = f"Erreur lors de la génération Markdown: {str(e)}"
+                    logger.error(error_msg)
+                    raise Exception(error_msg)
+            
+            progress.update("enrichment", "Terminé")
+            task_events.publish(task.task_id, "pipeline_stage", {"stage": "enrichment", "status": "completed"})
+            return enrichment_results, enrichment_files
+        
+        def slides_stage(_dependencies: Dict[str, Any]) -> tuple:
+            """Étape de génération des slides Marp des fichiers du dossier data."""
+            task_events.publish(task.task_id, "pipeline_stage", {"stage": "slides", "status": "started"})
+            logger.info("Démarrage de la génération des slides")
+            if not md_files:
+                logger.warning("Aucun fichier .md trouvé dans /data pour les slides")
+                progress.update("slides", "Aucun document")
+                return [], []
+            
+            progress.update("slides", f"Génération des slides de {len(md_files)} documents...")
+            slides_results = generate_task_slides(task, md_files, task_output_dir, report_progress=progress.reporter("slides"))
+            task_events.publish(task.task_id, "pipeline_stage", {"stage": "slides", "status": "completed"})
+            return slides_results
+        
+        stage_results = run_pipeline([
+            Stage("enrichment", enrichment_stage),
+            Stage("slides", slides_stage)
+        ])
+        enrichment_results, enrichment_files = stage_results["enrichment"]
+        generated_slides, slides_errors = stage_results["slides"]
         
         task.progress = "Finalisation : Sauvegarde des métadonnées..."
         
@@ -817,10 +1035,10 @@ async def sync_airtable_articles(
     
     # Création de la tâche
     task = EnrichmentTask(task_id, request)
-    tasks_storage[task_id] = task
+    register_task(task)
     
     # Lancement de la tâche en arrière-plan
-    background_tasks.add_task(process_airtable_sync_task, task)
+    background_tasks.add_task(run_task, process_airtable_sync_task, task)
     
     return AirtableSyncResponse(
         task_id=task_id,
@@ -828,8 +1046,8 @@ async def sync_airtable_articles(
         message=f"Synchronisation Airtable lancée. Vérifiez l'avancement avec /tasks/{task_id}"
     )
 
-async def process_airtable_sync_task(task: EnrichmentTask):
-    """Traitement asynchrone de la synchronisation Airtable"""
+def process_airtable_sync_task(task: EnrichmentTask):
+    """Traitement en arrière-plan de la synchronisation Airtable"""
     try:
         logger.info(f"Démarrage de la synchronisation Airtable {task.task_id}")
         task.status = "running"
@@ -855,6 +1073,8 @@ async def process_airtable_sync_task(task: EnrichmentTask):
         
         # Initialisation du gestionnaire Airtable
         try:
+            from src.loaders.airtable_loader import AirtableArticleManager
+            
             manager = AirtableArticleManager(
                 api_key=airtable_api_key,
                 base_id=airtable_base_id
@@ -878,7 +1098,10 @@ async def process_airtable_sync_task(task: EnrichmentTask):
         
         # Synchronisation
         try:
-            sync_result = manager.sync_articles(task.request.data_directory)
+            sync_result = manager.sync_articles(
+                task.request.data_directory,
+                full=getattr(task.request, 'full_sync', False)
+            )
             logger.info(f"Synchronisation terminée: {sync_result}")
         except Exception as e:
             error_msg = f"Erreur lors de la synchronisation: {str(e)}"
@@ -907,10 +1130,7 @@ async def process_airtable_sync_task(task: EnrichmentTask):
         task.progress = f"Erreur: {str(e)}"
 
 @app.post("/enrich", response_model=EnrichmentResponse)
-async def enrich_scenario(
-    request: EnrichmentRequest,
-    background_tasks: BackgroundTasks
-):
+async def enrich_scenario(request: EnrichmentRequest):
     """
     Lance l'enrichissement d'un scénario pédagogique avec les articles du répertoire data
     """
@@ -919,10 +1139,9 @@ async def enrich_scenario(
     
     # Création de la tâche
     task = EnrichmentTask(task_id, request)
-    tasks_storage[task_id] = task
     
-    # Lancement du traitement en arrière-plan
-    background_tasks.add_task(process_enrichment_task, task)
+    # Mise en file d'attente du traitement
+    submit_task(task, process_enrichment_task)
     
     return EnrichmentResponse(
         task_id=task_id,
@@ -935,10 +1154,7 @@ async def get_task_status(task_id: str):
     """
     Récupère le statut d'une tâche d'enrichissement
     """
-    if task_id not in tasks_storage:
-        raise HTTPException(status_code=404, detail="Tâche non trouvée")
-    
-    task = tasks_storage[task_id]
+    task = get_task_or_404(task_id)
     
     return TaskStatus(
         task_id=task.task_id,
@@ -955,10 +1171,7 @@ async def get_task_logs(task_id: str):
     """
     Récupère les logs détaillés d'une tâche
     """
-    if task_id not in tasks_storage:
-        raise HTTPException(status_code=404, detail="Tâche non trouvée")
-    
-    task = tasks_storage[task_id]
+    task = get_task_or_404(task_id)
     
     detailed_info = {
         "task_id": task.task_id,
@@ -986,6 +1199,102 @@ async def get_task_logs(task_id: str):
     
     return detailed_info
 
+async def task_event_stream(task_id: str, last_event_id: int = 0):
+    """
+    Itère sur les événements d'une tâche (None = maintien de connexion).
+    
+    Si la tâche n'est pas suivie par le bus de ce processus, ses changements
+    d'état sont lus périodiquement dans le stockage, pendant au plus
+    TASK_EVENTS_POLL_MAX_IDLE_SECONDS sans changement.
+    """
+    if task_events.has_channel(task_id):
+        async for message in task_events.subscribe(task_id, last_event_id):
+            yield message
+        return
+    
+    event_id = 0
+    last_status = last_progress = None
+    last_change = time.monotonic()
+    while True:
+        data = await asyncio.to_thread(task_store.get, task_id)
+        if data is None:
+            return
+        
+        if data["status"] != last_status or data["progress"] != last_progress:
+            last_change = time.monotonic()
+        elif time.monotonic() - last_change > TASK_EVENTS_POLL_MAX_IDLE_SECONDS:
+            logger.warning(f"Flux d'événements de la tâche {task_id} fermé: aucun changement depuis "
+                           f"{TASK_EVENTS_POLL_MAX_IDLE_SECONDS}s")
+            return
+        
+        if data["status"] != last_status:
+            last_status = data["status"]
+            event_id += 1
+            yield {"id": event_id, "event": "status", "data": {"status": last_status}}
+        if data["progress"] != last_progress:
+            last_progress = data["progress"]
+            event_id += 1
+            yield {"id": event_id, "event": "progress", "data": {"message": last_progress}}
+        
+        if data["status"] in ("completed", "failed") and data.get("completed_at"):
+            event_id += 1
+            yield {"id": event_id, "event": END_EVENT, "data": {
+                field: data.get(field) for field in ("status", "progress", "result", "error", "completed_at")
+            }}
+            return
+        
+        await asyncio.sleep(TASK_EVENTS_POLL_SECONDS)
+
+def format_sse(message: Optional[Dict[str, Any]]) -> str:
+    """Formate un événement au format Server-Sent Events (commentaire si maintien de connexion)."""
+    if message is None:
+        return ": keep-alive\n\n"
+    data = json.dumps(message["data"], ensure_ascii=False, default=str)
+    return f"id: {message['id']}\nevent: {message['event']}\ndata: {data}\n\n"
+
+@app.get("/tasks/{task_id}/events")
+async def stream_task_events(task_id: str, last_event_id: Optional[str] = Header(None)):
+    """
+    Flux Server-Sent Events de l'avancement d'une tâche: changements de statut et
+    de progression, articles extraits, séquences enrichies, documents de slides
+    générés, puis un unique événement `end` portant le résultat final.
+    """
+    await asyncio.to_thread(get_task_or_404, task_id)
+    try:
+        start_after = int(last_event_id) if last_event_id else 0
+    except ValueError:
+        start_after = 0
+    
+    async def event_source():
+        async for message in task_event_stream(task_id, start_after):
+            yield format_sse(message)
+    
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.websocket("/tasks/{task_id}/ws")
+async def task_events_websocket(websocket: WebSocket, task_id: str):
+    """
+    Même flux d'événements que /tasks/{task_id}/events, via WebSocket (messages JSON).
+    """
+    await websocket.accept()
+    if await asyncio.to_thread(task_store.get, task_id) is None:
+        await websocket.close(code=4404, reason="Tâche non trouvée")
+        return
+    
+    try:
+        async for message in task_event_stream(task_id):
+            if message is not None:
+                await websocket.send_json(
+                    {"id": message["id"], "event": message["event"], "data": message["data"]}
+                )
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
+
 @app.get("/tasks")
 async def list_tasks():
     """
@@ -993,23 +1302,24 @@ async def list_tasks():
     """
     return [
         {
-            "task_id": task.task_id,
-            "status": task.status,
-            "created_at": task.created_at,
-            "completed_at": task.completed_at
+            "task_id": task["task_id"],
+            "status": task["status"],
+            "created_at": task["created_at"],
+            "completed_at": task["completed_at"]
         }
-        for task in tasks_storage.values()
+        for task in task_store.list()
     ]
 
 @app.get("/download/{task_id}")
-async def download_task_results(task_id: str):
+async def download_task_results(task_id: str, request: Request):
     """
-    Télécharge tous les fichiers résultats d'une tâche dans un fichier ZIP
-    """
-    if task_id not in tasks_storage:
-        raise HTTPException(status_code=404, detail="Tâche non trouvée")
+    Télécharge tous les fichiers résultats d'une tâche dans un fichier ZIP.
     
-    task = tasks_storage[task_id]
+    Au premier téléchargement, l'archive est envoyée au fur et à mesure de sa
+    construction et mise en cache; les suivants servent le fichier en cache
+    (ETag / If-None-Match, requêtes Range) tant que les résultats ne changent pas.
+    """
+    task = get_task_or_404(task_id)
     
     if task.status != "completed" or not task.result:
         raise HTTPException(status_code=400, detail="Tâche non terminée ou sans résultat")
@@ -1019,32 +1329,42 @@ async def download_task_results(task_id: str):
     if not task_output_dir.exists():
         raise HTTPException(status_code=404, detail="Dossier de résultats non trouvé")
     
-    # Créer un fichier ZIP temporaire
     zip_filename = f"task_{task_id}_results.zip"
-    zip_path = Path(f"output/{zip_filename}")
+    fingerprint = await asyncio.to_thread(directory_fingerprint, task_output_dir)
+    etag = f'"{fingerprint[:32]}"'
+    headers = {
+        "ETag": etag,
+        "Content-Disposition": f"attachment; filename={zip_filename}"
+    }
+    
+    if etag in [value.strip() for value in request.headers.get("if-none-match", "").split(",")]:
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    cache_path = archive_cache_path(Path(Config.DOWNLOAD_CACHE_DIR), task_id, fingerprint)
     
     try:
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            # Ajouter tous les fichiers du dossier de la tâche au ZIP
-            for file_path in task_output_dir.iterdir():
-                if file_path.is_file():
-                    zipf.write(file_path, file_path.name)
-                    logger.info(f"Ajouté au ZIP: {file_path.name}")
-        
-        logger.info(f"ZIP créé: {zip_path}")
-        
-        return FileResponse(
-            str(zip_path),
-            filename=zip_filename,
-            media_type='application/zip',
-            headers={"Content-Disposition": f"attachment; filename={zip_filename}"}
-        )
-        
+        # Une plage d'octets ne peut être servie que depuis l'archive complète
+        if not cache_path.exists() and request.headers.get("range"):
+            await asyncio.to_thread(build_task_archive, task_output_dir, cache_path, task_id)
+        
+        if cache_path.exists():
+            logger.info(f"ZIP servi depuis le cache: {cache_path}")
+            return FileResponse(
+                str(cache_path),
+                filename=zip_filename,
+                media_type='application/zip',
+                headers=headers
+            )
     except Exception as e:
         logger.error(f"Erreur lors de la création du ZIP: {str(e)}")
-        if zip_path.exists():
-            zip_path.unlink()  # Supprimer le fichier ZIP en cas d'erreur
         raise HTTPException(status_code=500, detail=f"Erreur lors de la création du fichier ZIP: {str(e)}")
+    
+    logger.info(f"ZIP construit en flux et mis en cache: {cache_path}")
+    return StreamingResponse(
+        stream_task_archive(task_output_dir, cache_path, task_id),
+        media_type='application/zip',
+        headers=headers
+    )
 
 @app.get("/health")
 async def health_check():
@@ -1057,6 +1377,42 @@ async def health_check():
         "version": "1.0.0"
     }
 
+def llm_cache_stats() -> Dict[str, Any]:
+    """Statistiques du cache LLM, sans importer langchain si aucun traitement n'a encore été lancé."""
+    if "src.llm.cache" not in sys.modules:
+        return {"enabled": bool(Config.LLM_CACHE_ENABLED), "hits": 0, "misses": 0}
+    return sys.modules["src.llm.cache"].get_llm_cache_stats()
+
+def llm_client_stats() -> Dict[str, Any]:
+    """Statistiques des clients LLM partagés et de leur pool de connexions HTTP."""
+    if "src.llm.clients" not in sys.modules:
+        return {"clients": [], "clients_created": 0, "clients_reused": 0}
+    return sys.modules["src.llm.clients"].get_llm_client_stats()
+
+def llm_rate_limit_stats() -> Dict[str, Any]:
+    """Métriques d'attente du limiteur de débit LLM partagé."""
+    if "src.llm.rate_limit" not in sys.modules:
+        return {
+            "requests_per_minute": Config.LLM_RATE_LIMIT_RPM,
+            "tokens_per_minute": Config.LLM_RATE_LIMIT_TPM,
+            "requests": 0
+        }
+    return sys.modules["src.llm.rate_limit"].get_llm_rate_limit_stats()
+
+@app.get("/metrics")
+async def get_metrics():
+    """
+    Compteurs internes de l'API (cache des réponses LLM, clients LLM partagés,
+    limiteur de débit LLM, planificateur des traitements)
+    """
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "llm_cache": llm_cache_stats(),
+        "llm_clients": llm_client_stats(),
+        "llm_rate_limit": llm_rate_limit_stats(),
+        "job_scheduler": job_scheduler.stats()
+    }
+
 @app.get("/")
 async def root():
     """
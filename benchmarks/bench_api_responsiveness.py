@@ -0,0 +1,118 @@
+"""
+Benchmark de réactivité de l'API pendant des enrichissements longs.
+
+Lance l'API dans un serveur uvicorn local, démarre plusieurs tâches /enrich dont
+les appels LLM sont simulés par des attentes bloquantes, puis mesure la latence
+de GET /health pendant leur exécution (p50, p95, p99, max).
+
+Usage:
+    python benchmarks/bench_api_responsiveness.py --jobs 4 --duration 10
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+# Aucun appel réseau réel: clé factice, cache et mode incrémental désactivés
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+os.environ["LLM_CACHE_ENABLED"] = "false"
+os.environ["INCREMENTAL_ENRICHMENT"] = "false"
+
+import httpx
+import uvicorn
+
+
+class SlowFakeLLM:
+    """Modèle simulé: chaque appel bloque le thread appelant pendant `delay` secondes."""
+
+    model_name = "slow-fake"
+
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    def invoke(self, messages, *args, **kwargs):
+        time.sleep(self.delay)
+
+        class Response:
+            content = "1: 0\nAUCUNE CONCLUSION"
+
+        return Response()
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latence de /health sous charge d'enrichissement")
+    parser.add_argument("--jobs", type=int, default=4, help="Nombre de tâches /enrich simultanées")
+    parser.add_argument("--duration", type=float, default=10.0, help="Durée de mesure en secondes")
+    parser.add_argument("--llm-delay", type=float, default=0.5, help="Durée simulée d'un appel LLM (s)")
+    parser.add_argument("--interval", type=float, default=0.02, help="Intervalle entre deux appels /health (s)")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    # Répertoire de travail isolé (les sorties des tâches ne polluent pas le dépôt)
+    workdir = Path(tempfile.mkdtemp(prefix="agrivision_bench_"))
+    shutil.copytree(ROOT_DIR / "input", workdir / "input")
+    shutil.copytree(ROOT_DIR / "data", workdir / "data")
+    os.chdir(workdir)
+
+    import api
+    import src.enrichment.scenario_enrichment as scenario_enrichment
+
+    # api.py importe ScenarioEnrichment à l'exécution des tâches: on remplace la classe du module
+    ScenarioEnrichment = scenario_enrichment.ScenarioEnrichment
+    scenario_enrichment.ScenarioEnrichment = lambda *a, **k: ScenarioEnrichment(llm=SlowFakeLLM(args.llm_delay), **k)
+
+    server = uvicorn.Server(uvicorn.Config(api.app, host="127.0.0.1", port=args.port, log_level="warning"))
+    server_thread = threading.Thread(target=server.run, daemon=True)
+    server_thread.start()
+    while not server.started:
+        time.sleep(0.05)
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    latencies = []
+
+    try:
+        with httpx.Client(base_url=base_url, timeout=60) as client:
+            task_ids = [client.post("/enrich", json={}).json()["task_id"] for _ in range(args.jobs)]
+            print(f"🚀 {len(task_ids)} tâches /enrich lancées (appel LLM simulé: {args.llm_delay}s)")
+
+            end_time = time.perf_counter() + args.duration
+            while time.perf_counter() < end_time:
+                start = time.perf_counter()
+                client.get("/health").raise_for_status()
+                latencies.append((time.perf_counter() - start) * 1000)
+                time.sleep(args.interval)
+
+            statuses = [client.get(f"/tasks/{task_id}").json()["status"] for task_id in task_ids]
+    finally:
+        server.should_exit = True
+        server_thread.join(timeout=10)
+        os.chdir(ROOT_DIR)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print("=" * 50)
+    print(f"Requêtes /health: {len(latencies)}")
+    print(f"p50: {statistics.median(latencies):.1f} ms")
+    print(f"p95: {percentile(latencies, 95):.1f} ms")
+    print(f"p99: {percentile(latencies, 99):.1f} ms")
+    print(f"max: {max(latencies):.1f} ms")
+    print(f"Statut des tâches à la fin de la mesure: {statuses}")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
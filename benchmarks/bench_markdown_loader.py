@@ -0,0 +1,80 @@
+"""
+Benchmark du chargement des articles markdown: mode "native" contre "unstructured".
+
+Génère un corpus synthétique de N articles à partir des fichiers de data/ (copies
+numérotées), puis mesure le temps de `MarkdownLoader.load_directory` pour chaque
+mode (débit en documents/s).
+
+Usage:
+    python benchmarks/bench_markdown_loader.py --articles 5000
+"""
+
+import argparse
+import contextlib
+import io
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from src.loaders.markdown_loader import LOADER_MODES, MarkdownLoader
+
+
+def build_corpus(source_dir: Path, target_dir: Path, count: int) -> int:
+    """Crée `count` articles dans target_dir en recopiant les fichiers de source_dir."""
+    sources = sorted(source_dir.glob("*.md"))
+    if not sources:
+        raise FileNotFoundError(f"Aucun fichier .md dans {source_dir}")
+    
+    for index in range(count):
+        source = sources[index % len(sources)]
+        shutil.copyfile(source, target_dir / f"{index:06d}_{source.name}")
+    return count
+
+
+def bench_mode(mode: str, corpus_dir: Path, count: int) -> None:
+    try:
+        loader = MarkdownLoader(mode=mode)
+        # Les messages de load_directory (un par fichier en échec) sont masqués
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            documents = loader.load_directory(str(corpus_dir), recursive=False)
+            elapsed = time.perf_counter() - start
+    except Exception as e:
+        print(f"{mode:>13}: indisponible ({type(e).__name__}: {e})")
+        return
+    
+    if not documents:
+        print(f"{mode:>13}: aucun document chargé en {elapsed:.2f}s (dépendances manquantes ?)")
+        return
+    
+    throughput = len(documents) / elapsed if elapsed else float("inf")
+    failures = f", {count - len(documents)} échecs" if len(documents) < count else ""
+    print(f"{mode:>13}: {len(documents)} documents en {elapsed:.2f}s ({throughput:.0f} documents/s{failures})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Débit de MarkdownLoader selon le mode de chargement")
+    parser.add_argument("--articles", type=int, default=2000, help="Nombre d'articles du corpus synthétique")
+    parser.add_argument("--source", default=str(ROOT_DIR / "data"), help="Répertoire des articles modèles")
+    parser.add_argument("--modes", nargs="+", default=list(LOADER_MODES), choices=LOADER_MODES,
+                        help="Modes à comparer")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory(prefix="agrivision_loader_bench_") as tmp:
+        corpus_dir = Path(tmp)
+        build_corpus(Path(args.source), corpus_dir, args.articles)
+        
+        print("=" * 50)
+        print(f"Corpus: {args.articles} articles")
+        for mode in args.modes:
+            bench_mode(mode, corpus_dir, args.articles)
+        print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Benchmark du démarrage à froid de l'API.
+
+1. Pour chaque module, mesure dans un processus Python neuf le temps d'import et
+   la mémoire résidente (RSS) ajoutée par l'import.
+2. Lance l'API avec uvicorn et mesure le délai jusqu'à la première réponse de
+   GET /health, ainsi que la RSS du serveur à cet instant.
+
+Avec --max-seconds, le script se termine en erreur si ce délai est dépassé (pour
+détecter une régression en CI).
+
+Usage:
+    python benchmarks/bench_startup.py --max-seconds 3
+"""
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+MODULES = [
+    "src.config",
+    "src.tasks",
+    "src.loaders.markdown_loader",
+    "src.loaders.word_loader",
+    "src.loaders.airtable_loader",
+    "src.llm.cache",
+    "src.enrichment.scenario_enrichment",
+    "src.processors.generate_md_for_marp",
+    "api",
+]
+
+# Exécuté dans un processus neuf pour chaque module
+IMPORT_PROBE = """
+import importlib, json, sys, time
+sys.path.insert(0, {root!r})
+
+def rss_kb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+before = rss_kb()
+start = time.perf_counter()
+importlib.import_module({module!r})
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "rss_kb": rss_kb() - before}}))
+"""
+
+
+def process_rss_mb(pid: int) -> float:
+    """RSS d'un processus en Mo (Linux, via /proc)."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+def measure_import(module: str, env: dict) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE.format(root=str(ROOT_DIR), module=module)],
+        cwd=ROOT_DIR, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        return {"error": result.stderr.strip().splitlines()[-1] if result.stderr else "erreur"}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_time_to_health(env: dict, timeout: float) -> dict:
+    port = free_port()
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            if server.poll() is not None:
+                return {"error": server.stderr.read().decode(errors="replace").strip()[-500:]}
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                    return {"seconds": time.perf_counter() - start, "rss_mb": process_rss_mb(server.pid)}
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.02)
+        return {"error": f"pas de réponse de /health après {timeout:.0f}s"}
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Temps d'import par module et délai jusqu'au premier /health")
+    parser.add_argument("--max-seconds", type=float, default=None,
+                        help="Échec si le premier /health répond après ce délai")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Délai maximum d'attente du serveur")
+    args = parser.parse_args()
+    
+    env = dict(os.environ)
+    env.setdefault("OPENAI_API_KEY", "benchmark")
+    
+    print("=" * 60)
+    print(f"{'Module':<40} {'Import':>8} {'RSS':>9}")
+    for module in MODULES:
+        result = measure_import(module, env)
+        if "error" in result:
+            print(f"{module:<40} erreur: {result['error']}")
+        else:
+            print(f"{module:<40} {result['seconds']:>7.2f}s {result['rss_kb'] / 1024:>7.1f}Mo")
+    
+    print("-" * 60)
+    health = measure_time_to_health(env, args.timeout)
+    if "error" in health:
+        print(f"Premier /health: erreur ({health['error']})")
+        sys.exit(1)
+    print(f"Premier /health: {health['seconds']:.2f}s (RSS serveur: {health['rss_mb']:.0f}Mo)")
+    print("=" * 60)
+    
+    if args.max_seconds is not None and health["seconds"] > args.max_seconds:
+        print(f"❌ Démarrage trop lent: {health['seconds']:.2f}s > {args.max_seconds:.2f}s")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,33 +1,78 @@
 """
 Script pour exporter une base Airtable complète avec structure et données.
-Génère un fichier JSON complet de la base et ses métadonnées.
+Génère un fichier JSON complet de la base et ses métadonnées, ou (export en flux)
+un fichier JSONL par table écrit page par page, éventuellement compressé avec
+zstandard, avec un point de reprise pour les grandes bases.
+
+Les requêtes passent par une session HTTP partagée (connexions keep-alive) et
+par un seau à jetons commun qui respecte la limite d'Airtable de 5 requêtes par
+seconde et par base: les tables sont exportées en parallèle, au plus près de
+cette limite, et les réponses 429 ou 5xx sont retentées avec attente exponentielle.
 """
 
 import os
 import json
+import tempfile
+import threading
 import requests
 import ssl
 ssl._create_default_https_context = ssl._create_unverified_context
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+
+from src.concurrency import TokenBucket, run_bounded
+from src.config import config
+from src.retry import create_retry_policy
 
 # Chargement des variables d'environnement
 load_dotenv()
 
+# Après une réponse 429, Airtable bloque la base pendant 30 secondes, sans en-tête
+# Retry-After: toutes les requêtes vers la base sont suspendues pendant ce délai
+AIRTABLE_RATE_LIMIT_LOCKOUT_SECONDS = 30
+
+# Compressions disponibles pour l'export en flux et extension des fichiers de table
+STREAM_COMPRESSIONS = {"none": ".jsonl", "zstd": ".jsonl.zst"}
+
+# Point de reprise de l'export en flux (dans le répertoire de l'export)
+CHECKPOINT_FILENAME = "checkpoint.json"
+
+
+def _write_json_atomic(path: Path, data: Dict[str, Any]) -> None:
+    """Écrit un fichier JSON atomiquement (fichier temporaire puis renommage)."""
+    fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
 class AirtableExporter:
     """
     Exporteur complet pour base Airtable incluant structure et données.
     """
     
-    def __init__(self, api_key: str, base_id: str):
+    def __init__(self,
+                 api_key: str,
+                 base_id: str,
+                 max_workers: Optional[int] = None,
+                 requests_per_second: Optional[float] = None):
         """
         Initialise l'exporteur Airtable.
         
         Args:
             api_key: Clé API Airtable
             base_id: ID de la base Airtable
+            max_workers: Nombre de tables exportées en parallèle
+                (utilise config.AIRTABLE_EXPORT_MAX_WORKERS si None)
+            requests_per_second: Débit maximum de requêtes vers la base
+                (utilise config.AIRTABLE_RATE_LIMIT_RPS si None)
         """
         self.api_key = api_key
         self.base_id = base_id
@@ -37,6 +82,58 @@ class AirtableExporter:
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json"
         }
+        self.max_workers = max_workers or config.AIRTABLE_EXPORT_MAX_WORKERS
+        self.requests_per_second = requests_per_second or config.AIRTABLE_RATE_LIMIT_RPS
+        
+        # Session partagée par toutes les tables: une connexion keep-alive par worker
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        
+        # Capacité d'un jeton: requêtes espacées régulièrement, sans rafale au-delà de la limite
+        self.rate_limiter = TokenBucket(self.requests_per_second * 60, capacity=1)
+        self.retry_policy = create_retry_policy()
+    
+    def _get(self, url: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Envoie une requête GET dans la limite de débit, en retentant les erreurs
+        transitoires (429, 5xx, erreurs de connexion).
+        
+        Une réponse 429 suspend le seau partagé pendant
+        AIRTABLE_RATE_LIMIT_LOCKOUT_SECONDS: la nouvelle tentative et les requêtes
+        des autres tables attendent la fin du blocage de la base.
+        
+        Args:
+            url: URL de l'API
+            params: Paramètres de la requête
+            
+        Returns:
+            Réponse JSON décodée
+        """
+        def send() -> Dict[str, Any]:
+            self.rate_limiter.acquire()
+            response = self.session.get(url, params=params, timeout=config.TIMEOUT_SECONDS)
+            if response.status_code == 429:
+                self.rate_limiter.pause(AIRTABLE_RATE_LIMIT_LOCKOUT_SECONDS)
+            response.raise_for_status()
+            return response.json()
+        
+        def on_retry(attempt: int, error: BaseException, delay: float) -> None:
+            status = getattr(getattr(error, "response", None), "status_code", None)
+            if status == 429:
+                # L'attente est imposée par la pause du seau partagé (voir send), pas par `delay`
+                print(f"⏳ Tentative {attempt} échouée (limite de débit Airtable), nouvelle tentative "
+                      f"à la fin du blocage de la base ({AIRTABLE_RATE_LIMIT_LOCKOUT_SECONDS}s)")
+            else:
+                print(f"⏳ Tentative {attempt} échouée ({error}), nouvelle tentative dans {delay:.1f}s")
+        
+        return self.retry_policy.call(send, on_retry=on_retry)
+    
+    def close(self) -> None:
+        """Ferme la session HTTP partagée."""
+        self.session.close()
     
     def get_base_schema(self) -> Dict[str, Any]:
         """
@@ -48,10 +145,7 @@ class AirtableExporter:
         url = f"{self.meta_base_url}/bases/{self.base_id}/tables"
         
         try:
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            
-            schema_data = response.json()
+            schema_data = self._get(url)
             print(f"✅ Schéma récupéré: {len(schema_data.get('tables', []))} tables trouvées")
             
             return schema_data
@@ -70,36 +164,45 @@ class AirtableExporter:
             
         Returns:
             Liste des enregistrements de la table
+            
+        Raises:
+            requests.exceptions.RequestException: Échec d'une page après les nouvelles tentatives
         """
-        url = f"{self.base_url}/{self.base_id}/{table_id}"
         all_records = []
-        offset = None
         
-        try:
-            while True:
-                params = {"pageSize": 100}
-                if offset:
-                    params["offset"] = offset
-                
-                response = requests.get(url, headers=self.headers, params=params)
-                response.raise_for_status()
-                
-                data = response.json()
-                records = data.get("records", [])
-                all_records.extend(records)
-                
-                print(f"📄 {table_name}: {len(records)} enregistrements récupérés (total: {len(all_records)})")
-                
-                offset = data.get("offset")
-                if not offset:
-                    break
+        for records, _ in self.iter_table_pages(table_id):
+            all_records.extend(records)
+            print(f"📄 {table_name}: {len(records)} enregistrements récupérés (total: {len(all_records)})")
+        
+        print(f"✅ Table '{table_name}' complètement exportée: {len(all_records)} enregistrements")
+        return all_records
+    
+    def iter_table_pages(self, table_id: str,
+                         offset: Optional[str] = None) -> Iterator[Tuple[List[Dict[str, Any]], Optional[str]]]:
+        """
+        Parcourt les pages d'enregistrements d'une table.
+        
+        Args:
+            table_id: ID de la table
+            offset: Offset Airtable de la page de départ (première page si None)
+            
+        Returns:
+            Itérateur de (enregistrements de la page, offset de la page suivante ou
+            None pour la dernière page)
+        """
+        url = f"{self.base_url}/{self.base_id}/{table_id}"
+        
+        while True:
+            params = {"pageSize": 100}
+            if offset:
+                params["offset"] = offset
             
-            print(f"✅ Table '{table_name}' complètement exportée: {len(all_records)} enregistrements")
-            return all_records
+            data = self._get(url, params=params)
+            offset = data.get("offset")
+            yield data.get("records", []), offset
             
-        except requests.exceptions.RequestException as e:
-            print(f"❌ Erreur lors de la récupération des données de '{table_name}': {e}")
-            return []
+            if not offset:
+                break
     
     def export_complete_base(self, output_dir: str = "export") -> str:
         """
@@ -136,19 +239,31 @@ class AirtableExporter:
             "tables_data": {}
         }
         
-        # Export des données pour chaque table
-        print("\n📊 Export des données des tables...")
+        # Export des données des tables, en parallèle sous la limite de débit de la base
         tables = schema.get("tables", [])
+        print(f"\n📊 Export des données des tables ({self.max_workers} en parallèle, "
+              f"{self.requests_per_second:g} requêtes/s max)...")
         
-        for table in tables:
+        def fetch_table(table: Dict[str, Any]) -> List[Dict[str, Any]]:
+            table_id = table.get("id")
+            return self.get_table_data(table_id, table.get("name", f"Table_{table_id}"))
+        
+        results = run_bounded(fetch_table, tables, self.max_workers)
+        
+        failed = []
+        for table, (_, error) in zip(tables, results):
+            if error is not None:
+                failed.append(table.get("name", table.get("id")))
+                print(f"❌ Erreur lors de l'export de '{table.get('name', table.get('id'))}': {error}")
+        
+        if failed:
+            print(f"\n❌ Export abandonné: {len(failed)} table(s) en échec ({', '.join(failed)})")
+            return ""
+        
+        for table, (table_records, _) in zip(tables, results):
             table_id = table.get("id")
             table_name = table.get("name", f"Table_{table_id}")
             
-            print(f"\n📋 Export de la table: {table_name}")
-            
-            # Récupération des données
-            table_records = self.get_table_data(table_id, table_name)
-            
             # Ajout à l'export avec métadonnées
             export_data["tables_data"][table_id] = {
                 "table_info": {
@@ -193,6 +308,210 @@ class AirtableExporter:
             print(f"❌ Erreur lors de la sauvegarde: {e}")
             return ""
     
+    def _load_checkpoint(self, export_path: Path, compression: str) -> Optional[Dict[str, Any]]:
+        """
+        Charge le point de reprise d'un export en flux interrompu.
+        
+        Returns:
+            Point de reprise, ou None s'il n'existe pas, est illisible, concerne un
+            export terminé ou une autre compression
+        """
+        path = export_path / CHECKPOINT_FILENAME
+        if not path.exists():
+            return None
+        
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Point de reprise illisible, export depuis le début: {e}")
+            return None
+        
+        if checkpoint.get("completed_at") or checkpoint.get("base_id") != self.base_id:
+            return None
+        if checkpoint.get("compression") != compression:
+            print("ℹ️ Point de reprise d'une autre compression, export depuis le début")
+            return None
+        return checkpoint
+    
+    def _stream_table(self,
+                      table: Dict[str, Any],
+                      export_path: Path,
+                      compressor: Optional[Any],
+                      checkpoint: Dict[str, Any],
+                      lock: threading.Lock) -> int:
+        """
+        Écrit les enregistrements d'une table en JSONL, page par page, en
+        enregistrant après chaque page l'offset suivant et la taille du fichier.
+        
+        Args:
+            table: Table du schéma
+            export_path: Répertoire de l'export
+            compressor: ZstdCompressor (une trame par page) ou None
+            checkpoint: Point de reprise partagé par les tables
+            lock: Verrou protégeant le point de reprise
+            
+        Returns:
+            Nombre d'enregistrements exportés de la table
+        """
+        table_id = table.get("id")
+        table_name = table.get("name", f"Table_{table_id}")
+        compression = "zstd" if compressor else "none"
+        file_path = export_path / f"{table_id}{STREAM_COMPRESSIONS[compression]}"
+        
+        with lock:
+            state = checkpoint["tables"].get(table_id)
+        if state and state["done"]:
+            print(f"⏭️ Table '{table_name}' déjà exportée: {state['records']} enregistrements")
+            return state["records"]
+        if not state or not state["offset"] or not file_path.exists():
+            state = {"offset": None, "records": 0, "bytes": 0, "done": False}
+            # Fichier laissé par un export précédent avec une autre compression
+            for other, suffix in STREAM_COMPRESSIONS.items():
+                if other != compression:
+                    (export_path / f"{table_id}{suffix}").unlink(missing_ok=True)
+        elif state["records"]:
+            print(f"🔁 Reprise de la table '{table_name}' après {state['records']} enregistrements")
+        
+        with open(file_path, 'r+b' if state["bytes"] else 'wb') as f:
+            # Supprime une page écrite après le dernier point de reprise
+            f.truncate(state["bytes"])
+            f.seek(state["bytes"])
+            
+            try:
+                pages = self.iter_table_pages(table_id, state["offset"])
+                for records, next_offset in pages:
+                    data = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records).encode('utf-8')
+                    if compressor is not None:
+                        data = compressor.compress(data)
+                    f.write(data)
+                    f.flush()
+                    
+                    state = {
+                        "offset": next_offset,
+                        "records": state["records"] + len(records),
+                        "bytes": f.tell(),
+                        "done": next_offset is None
+                    }
+                    with lock:
+                        checkpoint["tables"][table_id] = state
+                        _write_json_atomic(export_path / CHECKPOINT_FILENAME, checkpoint)
+                    print(f"📄 {table_name}: {len(records)} enregistrements écrits (total: {state['records']})")
+            
+            except requests.exceptions.HTTPError as e:
+                # Offset de reprise expiré (422): la table est exportée depuis le début
+                if state["offset"] and e.response is not None and e.response.status_code == 422:
+                    print(f"⚠️ Offset de reprise expiré pour '{table_name}', export de la table depuis le début")
+                    with lock:
+                        checkpoint["tables"].pop(table_id, None)
+                    return self._stream_table(table, export_path, compressor, checkpoint, lock)
+                raise
+        
+        print(f"✅ Table '{table_name}' complètement exportée: {state['records']} enregistrements")
+        return state["records"]
+    
+    def export_base_streaming(self,
+                              output_dir: str = "export",
+                              compression: Optional[str] = None,
+                              resume: bool = True) -> str:
+        """
+        Exporte la base en flux: un fichier JSONL par table, écrit page par page
+        (mémoire constante quelle que soit la taille de la base).
+        
+        Le répertoire d'export contient `schema.json`, un fichier `{table_id}.jsonl`
+        (`.jsonl.zst` avec compression) par table et `checkpoint.json`, qui mémorise
+        pour chaque table l'offset de la page suivante: un export interrompu reprend
+        là où il s'était arrêté.
+        
+        Args:
+            output_dir: Répertoire de sortie
+            compression: "none" ou "zstd" (utilise config.AIRTABLE_EXPORT_COMPRESSION si None)
+            resume: Reprendre l'export interrompu s'il existe
+            
+        Returns:
+            Chemin du répertoire d'export ("" en cas d'échec)
+        """
+        compression = (compression or config.AIRTABLE_EXPORT_COMPRESSION).lower()
+        if compression not in STREAM_COMPRESSIONS:
+            print(f"❌ Compression inconnue: {compression} (valeurs possibles: {', '.join(STREAM_COMPRESSIONS)})")
+            return ""
+        
+        compressor = None
+        if compression == "zstd":
+            try:
+                import zstandard
+            except ImportError:
+                print("❌ La compression zstd nécessite le paquet zstandard (pip install zstandard)")
+                return ""
+            compressor = zstandard.ZstdCompressor()
+        
+        print("🚀 Démarrage de l'export en flux de la base Airtable...")
+        
+        export_path = Path(output_dir) / f"airtable_export_{self.base_id}"
+        export_path.mkdir(parents=True, exist_ok=True)
+        
+        checkpoint = self._load_checkpoint(export_path, compression) if resume else None
+        if checkpoint is None:
+            checkpoint = {
+                "base_id": self.base_id,
+                "compression": compression,
+                "started_at": datetime.now().isoformat(),
+                "tables": {}
+            }
+        
+        print("\n📋 Récupération du schéma de la base...")
+        schema = self.get_base_schema()
+        
+        if not schema:
+            print("❌ Impossible de récupérer le schéma, arrêt de l'export")
+            return ""
+        
+        _write_json_atomic(export_path / "schema.json", schema)
+        
+        tables = schema.get("tables", [])
+        print(f"\n📊 Export des données des tables ({self.max_workers} en parallèle, "
+              f"{self.requests_per_second:g} requêtes/s max)...")
+        
+        lock = threading.Lock()
+        results = run_bounded(
+            lambda table: self._stream_table(table, export_path, compressor, checkpoint, lock),
+            tables,
+            self.max_workers
+        )
+        
+        failed = []
+        for table, (_, error) in zip(tables, results):
+            if error is not None:
+                failed.append(table.get("name", table.get("id")))
+                print(f"❌ Erreur lors de l'export de '{table.get('name', table.get('id'))}': {error}")
+        
+        if failed:
+            print(f"\n⚠️ Export incomplet ({len(failed)} tables en échec), relancez-le pour le reprendre")
+            return ""
+        
+        with lock:
+            checkpoint["completed_at"] = datetime.now().isoformat()
+            _write_json_atomic(export_path / CHECKPOINT_FILENAME, checkpoint)
+        
+        # Seules les tables du schéma courant comptent: le répertoire peut contenir
+        # les fichiers de tables supprimées depuis un export précédent
+        table_ids = [table.get("id") for table in tables]
+        total_records = sum(checkpoint["tables"][table_id]["records"] for table_id in table_ids)
+        total_size = sum(
+            (export_path / f"{table_id}{STREAM_COMPRESSIONS[compression]}").stat().st_size
+            for table_id in table_ids
+        ) / 1024 / 1024  # MB
+        
+        print("\n🎉 Export terminé avec succès!")
+        print("=" * 50)
+        print(f"📁 Répertoire: {export_path}")
+        print(f"📊 Tables exportées: {len(tables)}")
+        print(f"📄 Total enregistrements: {total_records}")
+        print(f"💾 Taille des fichiers: {total_size:.2f} MB ({compression})")
+        print("=" * 50)
+        
+        return str(export_path)
+    
     def export_schema_only(self, output_dir: str = "export") -> str:
         """
         Exporte uniquement le schéma de la base (structure sans données).
@@ -355,8 +674,9 @@ def main():
     print("2. Structure uniquement")
     print("3. Rapport de structure lisible")
     print("4. Tout exporter")
+    print("5. Export en flux (JSONL par table, reprise possible)")
     
-    choice = input("\nVotre choix (1-4): ").strip()
+    choice = input("\nVotre choix (1-5): ").strip()
     
     if choice == "1":
         exporter.export_complete_base()
@@ -369,8 +689,12 @@ def main():
         exporter.export_complete_base()
         exporter.export_schema_only()
         exporter.export_table_structure_readable()
+    elif choice == "5":
+        exporter.export_base_streaming()
     else:
         print("❌ Choix invalide")
+    
+    exporter.close()
 
 
 if __name__ == "__main__":
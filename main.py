@@ -52,7 +52,8 @@ class PedagogicalProcessor:
     def __init__(self, 
                  model_name: Optional[str] = None,
                  temperature: Optional[float] = None,
-                 output_dir: Optional[str] = None):
+                 output_dir: Optional[str] = None,
+                 max_workers: Optional[int] = None):
         """
         Initialise le processeur de scénarios pédagogiques.
         
@@ -60,6 +61,7 @@ class PedagogicalProcessor:
             model_name: Nom du modèle LLM à utiliser (utilise config par défaut si None)
             temperature: Température du modèle (utilise config par défaut si None) 
             output_dir: Répertoire de sortie pour les résultats (utilise config par défaut si None)
+            max_workers: Nombre de documents traités simultanément (utilise config par défaut si None)
         """
         # Configuration du logger
         self.logger = logging.getLogger(__name__)
@@ -72,6 +74,7 @@ class PedagogicalProcessor:
         )
         self.output_dir = Path(output_dir or config.OUTPUT_DIR)
         self.output_dir.mkdir(exist_ok=True)
+        self.max_workers = max_workers or config.LLM_MAX_CONCURRENCY
         
     def process_file(self, file_path: str) -> PedagogicalScenario:
         """
@@ -163,11 +166,12 @@ class PedagogicalProcessor:
             print("Aucun document trouvé à traiter.")
             return []
         
-        # Traitement des documents
-        print("Extraction des informations structurées...")
+        # Traitement des documents (en parallèle)
+        print(f"Extraction des informations structurées ({self.max_workers} documents en parallèle)...")
         scenarios = self.processor.batch_process_with_retry(
             documents, 
-            max_retries=config.MAX_RETRIES
+            max_retries=config.MAX_RETRIES,
+            max_workers=self.max_workers
         )
         
         return scenarios
@@ -354,6 +358,19 @@ def main():
         help="Ne pas traiter récursivement les sous-répertoires"
     )
     
+    parser.add_argument(
+        "--workers", "-w",
+        type=int,
+        default=config.LLM_MAX_CONCURRENCY,
+        help=f"Nombre de documents traités en parallèle (défaut: {config.LLM_MAX_CONCURRENCY})"
+    )
+    
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Contourner le cache persistant des réponses LLM"
+    )
+    
     parser.add_argument(
         "--show-config",
         action="store_true",
@@ -367,6 +384,13 @@ def main():
         config.print_config()
         return 0
     
+    if args.workers < 1:
+        print("Erreur: --workers doit être supérieur ou égal à 1.")
+        return 1
+    
+    if args.no_cache:
+        config.LLM_CACHE_ENABLED = False
+    
     # Validation de la configuration
     if not config.validate():
         print("\n💡 Conseil: Copiez .env.example vers .env et remplissez les valeurs")
@@ -377,7 +401,8 @@ def main():
         processor = PedagogicalProcessor(
             model_name=args.model,
             temperature=args.temperature,
-            output_dir=args.output_dir
+            output_dir=args.output_dir,
+            max_workers=args.workers
         )
         
         # Traitement
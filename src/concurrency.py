@@ -0,0 +1,183 @@
+"""
+Utilitaires de concurrence bornée pour les appels LLM et les entrées/sorties.
+"""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def run_bounded(func: Callable[[T], R],
+                items: Iterable[T],
+                max_workers: int) -> List[Tuple[Optional[R], Optional[BaseException]]]:
+    """
+    Applique une fonction à chaque élément avec au plus `max_workers` appels simultanés.
+
+    L'ordre des résultats est celui des éléments en entrée, et une exception levée
+    pour un élément n'interrompt pas le traitement des autres.
+
+    Args:
+        func: Fonction à appliquer à chaque élément
+        items: Éléments à traiter
+        max_workers: Nombre maximum d'appels en parallèle
+
+    Returns:
+        Liste de tuples (résultat, exception) dans l'ordre des éléments
+    """
+    items = list(items)
+
+    def _safe_call(item: T) -> Tuple[Optional[R], Optional[BaseException]]:
+        try:
+            return func(item), None
+        except Exception as e:
+            return None, e
+
+    if max_workers <= 1 or len(items) <= 1:
+        return [_safe_call(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(_safe_call, items))
+
+
+def iter_bounded(func: Callable[[T], R],
+                 items: Iterable[T],
+                 max_workers: int) -> Iterator[Tuple[T, Optional[R], Optional[BaseException]]]:
+    """
+    Applique une fonction à chaque élément et produit les résultats dès qu'ils sont prêts.
+    
+    Contrairement à `run_bounded`, les éléments sont consommés au fur et à mesure
+    (au plus 2 × `max_workers` traitements soumis à la fois) et les résultats sont
+    produits dans l'ordre de fin de traitement, ce qui permet aux étapes suivantes
+    de démarrer avant la fin du lot. Une exception levée pour un élément
+    n'interrompt pas le traitement des autres.
+    
+    Args:
+        func: Fonction à appliquer à chaque élément
+        items: Éléments à traiter (itérable paresseux accepté)
+        max_workers: Nombre maximum d'appels en parallèle
+        
+    Yields:
+        Tuples (élément, résultat, exception) dans l'ordre de fin de traitement
+    """
+    iterator = iter(items)
+    
+    if max_workers <= 1:
+        for item in iterator:
+            try:
+                yield item, func(item), None
+            except Exception as e:
+                yield item, None, e
+        return
+    
+    max_pending = 2 * max_workers
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {}
+        exhausted = False
+        
+        while True:
+            while not exhausted and len(pending) < max_pending:
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending[executor.submit(func, item)] = item
+            
+            if not pending:
+                return
+            
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                item = pending.pop(future)
+                error = future.exception()
+                if error is not None:
+                    yield item, None, error
+                else:
+                    yield item, future.result(), None
+
+
+class TokenBucket:
+    """
+    Seau à jetons thread-safe: `rate_per_minute` jetons par minute, au plus
+    `capacity` jetons accumulés.
+    
+    `acquire` bloque jusqu'à ce que les jetons soient disponibles: les appelants
+    sont mis en file plutôt que rejetés, et servis l'un après l'autre.
+    """
+    
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        """
+        Initialise un seau plein.
+        
+        Args:
+            rate_per_minute: Jetons ajoutés par minute
+            capacity: Nombre maximum de jetons accumulés (défaut: rate_per_minute)
+        """
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = float(capacity or rate_per_minute)
+        self._level = self.capacity
+        self._updated = time.monotonic()
+        # Condition notifiée lorsque des jetons sont rendus (voir `adjust`)
+        self._lock = threading.Condition()
+        # Sérialise les appelants en attente (le verrou d'état reste libre pendant l'attente)
+        self._queue_lock = threading.Lock()
+    
+    def _refill(self) -> None:
+        """Ajoute les jetons accumulés depuis la dernière mise à jour (sous self._lock)."""
+        now = time.monotonic()
+        self._level = min(self.capacity, self._level + (now - self._updated) * self.rate_per_second)
+        self._updated = now
+    
+    def acquire(self, amount: float = 1.0) -> float:
+        """
+        Prélève des jetons, en attendant qu'ils soient disponibles.
+        
+        Args:
+            amount: Nombre de jetons (ramené à la capacité du seau s'il la dépasse)
+            
+        Returns:
+            Temps d'attente en secondes
+        """
+        amount = min(amount, self.capacity)
+        start = time.monotonic()
+        
+        with self._queue_lock, self._lock:
+            while True:
+                self._refill()
+                if self._level >= amount:
+                    self._level -= amount
+                    return time.monotonic() - start
+                self._lock.wait((amount - self._level) / self.rate_per_second)
+    
+    def adjust(self, amount: float) -> None:
+        """
+        Corrige un prélèvement estimé: rend des jetons si `amount` est négatif, en
+        prélève davantage sinon (le niveau peut devenir négatif, ce qui retarde les
+        prochains appelants).
+        """
+        with self._lock:
+            self._refill()
+            self._level = min(self.capacity, self._level - amount)
+            if amount < 0:
+                self._lock.notify_all()
+    
+    def pause(self, seconds: float) -> None:
+        """
+        Suspend l'attribution de jetons pendant `seconds` secondes (ex: après une
+        réponse 429): le seau est vidé et son niveau rendu négatif d'autant, ce
+        qui fait attendre tous les appelants.
+        """
+        with self._lock:
+            self._refill()
+            self._level = min(self._level, -seconds * self.rate_per_second)
+    
+    @property
+    def available(self) -> float:
+        """Nombre de jetons actuellement disponibles."""
+        with self._lock:
+            self._refill()
+            return self._level
@@ -35,6 +35,12 @@ class Config:
     AIRTABLE_API_KEY: str = os.getenv("AIRTABLE_API_KEY", "")
     AIRTABLE_BASE_ID: str = os.getenv("AIRTABLE_BASE_ID", "")
     AIRTABLE_TABLE_NAME: str = os.getenv("AIRTABLE_TABLE_NAME", "Article")
+    AIRTABLE_INCREMENTAL_SYNC: bool = os.getenv("AIRTABLE_INCREMENTAL_SYNC", "true").lower() == "true"
+    AIRTABLE_SYNC_OVERLAP_SECONDS: int = int(os.getenv("AIRTABLE_SYNC_OVERLAP_SECONDS", "60"))
+    AIRTABLE_DELETION_CHECK_INTERVAL_SECONDS: int = int(os.getenv("AIRTABLE_DELETION_CHECK_INTERVAL_SECONDS", "3600"))
+    AIRTABLE_RATE_LIMIT_RPS: float = float(os.getenv("AIRTABLE_RATE_LIMIT_RPS", "5"))
+    AIRTABLE_EXPORT_MAX_WORKERS: int = int(os.getenv("AIRTABLE_EXPORT_MAX_WORKERS", "4"))
+    AIRTABLE_EXPORT_COMPRESSION: str = os.getenv("AIRTABLE_EXPORT_COMPRESSION", "none")
 
     
     # ==========================================================================
@@ -55,9 +61,54 @@ class Config:
     # TRAITEMENT
     # ==========================================================================
     MAX_RETRIES: int = int(os.getenv("MAX_RETRIES", "3"))
+    RETRY_BASE_DELAY_SECONDS: float = float(os.getenv("RETRY_BASE_DELAY_SECONDS", "1.0"))
+    RETRY_MAX_DELAY_SECONDS: float = float(os.getenv("RETRY_MAX_DELAY_SECONDS", "30.0"))
+    RETRY_AFTER_MAX_SECONDS: float = float(os.getenv("RETRY_AFTER_MAX_SECONDS", "120.0"))
     TIMEOUT_SECONDS: int = int(os.getenv("TIMEOUT_SECONDS", "120"))
     BATCH_SIZE: int = int(os.getenv("BATCH_SIZE", "10"))
     MARKDOWN_PATTERN: str = os.getenv("MARKDOWN_PATTERN", "*.md")
+    MARKDOWN_LOADER_MODE: str = os.getenv("MARKDOWN_LOADER_MODE", "unstructured")
+    LOADER_MAX_WORKERS: int = int(os.getenv("LOADER_MAX_WORKERS", "8"))
+    LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+    RELEVANCE_BATCH_SIZE: int = int(os.getenv("RELEVANCE_BATCH_SIZE", "20"))
+    PREFILTER_TOP_K: int = int(os.getenv("PREFILTER_TOP_K", "0"))
+    NOVELTY_PROMPT_MAX_TOKENS: int = int(os.getenv("NOVELTY_PROMPT_MAX_TOKENS", "1000"))
+    SCENARIO_CHUNK_MAX_TOKENS: int = int(os.getenv("SCENARIO_CHUNK_MAX_TOKENS", "6000"))
+    EMBEDDING_MODEL: str = os.getenv("EMBEDDING_MODEL", "hashing")
+    MARP_MAX_CONCURRENCY: int = int(os.getenv("MARP_MAX_CONCURRENCY", "4"))
+    INCREMENTAL_ENRICHMENT: bool = os.getenv("INCREMENTAL_ENRICHMENT", "true").lower() == "true"
+    ENRICHMENT_MANIFEST_DIR: str = os.getenv("ENRICHMENT_MANIFEST_DIR", os.path.join(OUTPUT_DIR, "manifests"))
+    
+    # ==========================================================================
+    # CACHE DES RÉPONSES LLM
+    # ==========================================================================
+    LLM_CACHE_ENABLED: bool = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+    LLM_CACHE_PATH: str = os.getenv("LLM_CACHE_PATH", "cache/llm_cache.sqlite")
+    LLM_CACHE_MAX_SIZE_MB: int = int(os.getenv("LLM_CACHE_MAX_SIZE_MB", "256"))
+    LLM_CACHE_TTL_SECONDS: int = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+    
+    # ==========================================================================
+    # CONNEXIONS HTTP VERS L'API LLM
+    # ==========================================================================
+    LLM_HTTP_MAX_CONNECTIONS: int = int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "20"))
+    LLM_HTTP_KEEPALIVE_CONNECTIONS: int = int(os.getenv("LLM_HTTP_KEEPALIVE_CONNECTIONS", "10"))
+    LLM_RATE_LIMIT_RPM: int = int(os.getenv("LLM_RATE_LIMIT_RPM", "500"))
+    LLM_RATE_LIMIT_TPM: int = int(os.getenv("LLM_RATE_LIMIT_TPM", "200000"))
+    
+    # ==========================================================================
+    # STOCKAGE DES TÂCHES DE L'API
+    # ==========================================================================
+    TASK_STORE_BACKEND: str = os.getenv("TASK_STORE_BACKEND", "sqlite")
+    TASK_STORE_PATH: str = os.getenv("TASK_STORE_PATH", "cache/tasks.sqlite")
+    TASK_TTL_SECONDS: int = int(os.getenv("TASK_TTL_SECONDS", str(7 * 24 * 3600)))
+    TASK_STORE_MAX_FINISHED: int = int(os.getenv("TASK_STORE_MAX_FINISHED", "1000"))
+    TASK_HEARTBEAT_SECONDS: float = float(os.getenv("TASK_HEARTBEAT_SECONDS", "15"))
+    TASK_LEASE_SECONDS: float = float(os.getenv("TASK_LEASE_SECONDS", "60"))
+    REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", "2"))
+    JOB_QUEUE_SIZE: int = int(os.getenv("JOB_QUEUE_SIZE", "10"))
+    API_PRELOAD_MODULES: bool = os.getenv("API_PRELOAD_MODULES", "false").lower() == "true"
+    DOWNLOAD_CACHE_DIR: str = os.getenv("DOWNLOAD_CACHE_DIR", os.path.join(OUTPUT_DIR, ".download_cache"))
     
     # ==========================================================================
     # LOGGING
@@ -101,9 +152,72 @@ class Config:
         if cls.MAX_RETRIES <= 0:
             errors.append("MAX_RETRIES doit être supérieur à 0")
         
+        if cls.RETRY_BASE_DELAY_SECONDS < 0 or cls.RETRY_MAX_DELAY_SECONDS < cls.RETRY_BASE_DELAY_SECONDS:
+            errors.append("RETRY_BASE_DELAY_SECONDS doit être positif et inférieur à RETRY_MAX_DELAY_SECONDS")
+        
+        if cls.RETRY_AFTER_MAX_SECONDS < 0:
+            errors.append("RETRY_AFTER_MAX_SECONDS doit être positif ou nul")
+        
         if cls.BATCH_SIZE <= 0:
             errors.append("BATCH_SIZE doit être supérieur à 0")
         
+        if cls.LLM_MAX_CONCURRENCY <= 0:
+            errors.append("LLM_MAX_CONCURRENCY doit être supérieur à 0")
+        
+        if cls.MARP_MAX_CONCURRENCY <= 0:
+            errors.append("MARP_MAX_CONCURRENCY doit être supérieur à 0")
+        
+        if cls.LLM_HTTP_MAX_CONNECTIONS <= 0:
+            errors.append("LLM_HTTP_MAX_CONNECTIONS doit être supérieur à 0")
+        
+        if cls.LLM_HTTP_KEEPALIVE_CONNECTIONS < 0:
+            errors.append("LLM_HTTP_KEEPALIVE_CONNECTIONS doit être positif ou nul")
+        
+        if cls.LLM_RATE_LIMIT_RPM < 0 or cls.LLM_RATE_LIMIT_TPM < 0:
+            errors.append("LLM_RATE_LIMIT_RPM et LLM_RATE_LIMIT_TPM doivent être positifs ou nuls")
+        
+        if cls.RELEVANCE_BATCH_SIZE < 0:
+            errors.append("RELEVANCE_BATCH_SIZE doit être positif ou nul")
+        
+        if cls.PREFILTER_TOP_K < 0:
+            errors.append("PREFILTER_TOP_K doit être positif ou nul")
+        
+        if cls.NOVELTY_PROMPT_MAX_TOKENS <= 0:
+            errors.append("NOVELTY_PROMPT_MAX_TOKENS doit être supérieur à 0")
+        
+        if cls.SCENARIO_CHUNK_MAX_TOKENS < 0:
+            errors.append("SCENARIO_CHUNK_MAX_TOKENS doit être positif ou nul")
+        
+        if cls.AIRTABLE_SYNC_OVERLAP_SECONDS < 0 or cls.AIRTABLE_DELETION_CHECK_INTERVAL_SECONDS < 0:
+            errors.append("AIRTABLE_SYNC_OVERLAP_SECONDS et AIRTABLE_DELETION_CHECK_INTERVAL_SECONDS doivent être positifs ou nuls")
+        
+        if cls.AIRTABLE_RATE_LIMIT_RPS <= 0 or cls.AIRTABLE_EXPORT_MAX_WORKERS <= 0:
+            errors.append("AIRTABLE_RATE_LIMIT_RPS et AIRTABLE_EXPORT_MAX_WORKERS doivent être supérieurs à 0")
+        
+        if cls.AIRTABLE_EXPORT_COMPRESSION.lower() not in ("none", "zstd"):
+            errors.append("AIRTABLE_EXPORT_COMPRESSION doit être 'none' ou 'zstd'")
+        
+        if cls.MARKDOWN_LOADER_MODE.lower() not in ("native", "unstructured"):
+            errors.append("MARKDOWN_LOADER_MODE doit être 'native' ou 'unstructured'")
+        
+        if cls.LOADER_MAX_WORKERS <= 0:
+            errors.append("LOADER_MAX_WORKERS doit être supérieur à 0")
+        
+        if cls.JOB_WORKERS <= 0:
+            errors.append("JOB_WORKERS doit être supérieur à 0")
+        
+        if cls.JOB_QUEUE_SIZE < 0:
+            errors.append("JOB_QUEUE_SIZE doit être positif ou nul")
+        
+        if cls.TASK_STORE_BACKEND.lower() not in ("sqlite", "memory", "redis"):
+            errors.append("TASK_STORE_BACKEND doit être 'sqlite', 'memory' ou 'redis'")
+        
+        if cls.TASK_HEARTBEAT_SECONDS <= 0:
+            errors.append("TASK_HEARTBEAT_SECONDS doit être supérieur à 0")
+        
+        if cls.TASK_LEASE_SECONDS <= cls.TASK_HEARTBEAT_SECONDS:
+            errors.append("TASK_LEASE_SECONDS doit être supérieur à TASK_HEARTBEAT_SECONDS")
+        
         if errors:
             print("❌ Erreurs de configuration:")
             for error in errors:
@@ -127,6 +241,13 @@ class Config:
         print(f"Max tentatives: {cls.MAX_RETRIES}")
         print(f"Timeout: {cls.TIMEOUT_SECONDS}s")
         print(f"Taille de batch: {cls.BATCH_SIZE}")
+        print(f"Appels LLM simultanés max: {cls.LLM_MAX_CONCURRENCY}")
+        print(f"Cache LLM: {cls.LLM_CACHE_PATH if cls.LLM_CACHE_ENABLED else 'désactivé'}")
+        print(f"Pool HTTP LLM (max / keep-alive): {cls.LLM_HTTP_MAX_CONNECTIONS} / {cls.LLM_HTTP_KEEPALIVE_CONNECTIONS}")
+        print(f"Limite de débit LLM (RPM / TPM): {cls.LLM_RATE_LIMIT_RPM or 'illimité'} / {cls.LLM_RATE_LIMIT_TPM or 'illimité'}")
+        print(f"Synchronisation Airtable: {'incrémentale' if cls.AIRTABLE_INCREMENTAL_SYNC else 'complète'}")
+        print(f"Stockage des tâches: {cls.TASK_STORE_BACKEND}")
+        print(f"Workers / file d'attente des traitements: {cls.JOB_WORKERS} / {cls.JOB_QUEUE_SIZE}")
         print(f"Niveau de log: {cls.LOG_LEVEL}")
         print(f"Mode debug: {cls.DEBUG_MODE}")
         print(f"API OpenAI configurée: {'✅' if cls.OPENAI_API_KEY else '❌'}")
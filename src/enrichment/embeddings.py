@@ -0,0 +1,163 @@
+"""
+Pré-filtrage vectoriel des couples (nouveauté, séquence) avant l'évaluation LLM.
+
+Tout objet exposant `embed_documents(texts) -> List[List[float]]` (interface
+`Embeddings` de LangChain) peut être utilisé comme embedder. `HashingEmbedder`
+fournit une implémentation locale et déterministe (TF-IDF haché) qui ne fait
+aucun appel réseau.
+"""
+
+import math
+import re
+import unicodedata
+import zlib
+from collections import Counter
+from typing import Any, List, Optional
+
+import numpy as np
+
+from ..config import config
+
+
+# Mots vides fréquents qui n'apportent rien à la similarité
+FRENCH_STOPWORDS = {
+    "a", "au", "aux", "avec", "ce", "ces", "cette", "dans", "de", "des", "du",
+    "elle", "en", "est", "et", "il", "ils", "la", "le", "les", "leur", "leurs",
+    "mais", "ou", "par", "pas", "plus", "pour", "qu", "que", "qui", "sa", "se",
+    "ses", "son", "sont", "sur", "un", "une", "l", "d", "s", "n", "c", "j",
+}
+
+
+class HashingEmbedder:
+    """
+    Embedder TF-IDF haché, local et déterministe.
+
+    Les termes sont projetés dans un espace de dimension fixe par hachage (CRC32),
+    pondérés par un TF logarithmique et par l'IDF calculé sur les textes d'un même
+    appel à `embed_documents`, puis normalisés (norme L2).
+    """
+
+    def __init__(self, n_features: int = 4096, use_bigrams: bool = True):
+        """
+        Initialise l'embedder.
+
+        Args:
+            n_features: Dimension des vecteurs produits
+            use_bigrams: Si True, ajoute les bigrammes de mots aux unigrammes
+        """
+        self.n_features = n_features
+        self.use_bigrams = use_bigrams
+
+    def _tokenize(self, text: str) -> List[str]:
+        """Découpe un texte en termes normalisés (minuscules, sans accents)."""
+        normalized = unicodedata.normalize("NFKD", text.lower())
+        normalized = "".join(c for c in normalized if not unicodedata.combining(c))
+        words = [w for w in re.findall(r"\w+", normalized) if w not in FRENCH_STOPWORDS and len(w) > 1]
+
+        terms = list(words)
+        if self.use_bigrams:
+            terms.extend(f"{w1} {w2}" for w1, w2 in zip(words, words[1:]))
+        return terms
+
+    def _bucket(self, term: str) -> int:
+        return zlib.crc32(term.encode("utf-8")) % self.n_features
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Calcule les vecteurs TF-IDF hachés d'une liste de textes.
+
+        Args:
+            texts: Textes à vectoriser
+
+        Returns:
+            Liste de vecteurs normalisés
+        """
+        term_counts = [Counter(self._tokenize(text)) for text in texts]
+
+        document_frequency = Counter()
+        for counts in term_counts:
+            document_frequency.update(counts.keys())
+
+        n_documents = len(texts)
+        matrix = np.zeros((n_documents, self.n_features), dtype=np.float32)
+
+        for row, counts in enumerate(term_counts):
+            for term, count in counts.items():
+                idf = math.log((1 + n_documents) / (1 + document_frequency[term])) + 1.0
+                matrix[row, self._bucket(term)] += (1.0 + math.log(count)) * idf
+
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (matrix / norms).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        """Calcule le vecteur d'un texte seul (IDF neutre)."""
+        return self.embed_documents([text])[0]
+
+
+def create_embedder(model: Optional[str] = None) -> Any:
+    """
+    Factory function pour créer l'embedder configuré.
+
+    Args:
+        model: "hashing" pour l'embedder local, sinon nom d'un modèle d'embeddings
+            OpenAI (utilise config.EMBEDDING_MODEL si None)
+
+    Returns:
+        Objet exposant `embed_documents`
+    """
+    model = model or config.EMBEDDING_MODEL
+    if model == "hashing":
+        return HashingEmbedder()
+
+    from langchain_openai import OpenAIEmbeddings
+
+    return OpenAIEmbeddings(
+        model=model,
+        openai_api_key=config.OPENAI_API_KEY,
+        openai_api_base=config.OPENAI_API_BASE
+    )
+
+
+def cosine_similarity_matrix(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """
+    Calcule la matrice de similarité cosinus entre deux ensembles de vecteurs.
+
+    Args:
+        left: Matrice (n, d)
+        right: Matrice (m, d)
+
+    Returns:
+        Matrice (n, m) des similarités
+    """
+    left = np.asarray(left, dtype=np.float32)
+    right = np.asarray(right, dtype=np.float32)
+
+    left_norms = np.linalg.norm(left, axis=1, keepdims=True)
+    right_norms = np.linalg.norm(right, axis=1, keepdims=True)
+    left_norms[left_norms == 0] = 1.0
+    right_norms[right_norms == 0] = 1.0
+
+    return (left / left_norms) @ (right / right_norms).T
+
+
+def top_k_indices(similarities: np.ndarray, k: int) -> List[List[int]]:
+    """
+    Retourne, pour chaque ligne, les indices des k colonnes les plus similaires.
+
+    Les indices sont renvoyés dans l'ordre croissant pour conserver l'ordre
+    d'origine des séquences.
+
+    Args:
+        similarities: Matrice (n, m) des similarités
+        k: Nombre de candidats à conserver par ligne
+
+    Returns:
+        Liste de n listes d'indices
+    """
+    n_columns = similarities.shape[1]
+    if k >= n_columns:
+        return [list(range(n_columns)) for _ in range(similarities.shape[0])]
+
+    candidates = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+    return [sorted(int(index) for index in row) for row in candidates]
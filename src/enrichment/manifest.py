@@ -0,0 +1,172 @@
+"""
+Manifeste d'enrichissement incrémental.
+
+Pour un scénario donné, le manifeste mémorise l'empreinte du contenu de chaque
+article ainsi que la nouveauté extraite et la séquence à laquelle elle a été
+assignée. Un enrichissement ultérieur du même scénario ne retraite que les
+articles nouveaux ou modifiés et réutilise les résultats des autres.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..models.pedagogical_scenario import PedagogicalScenario
+
+# À incrémenter lorsque les prompts d'extraction ou d'évaluation changent
+MANIFEST_VERSION = 2
+
+
+def hash_text(text: str) -> str:
+    """Empreinte SHA-256 d'un texte."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def hash_scenario(scenario: PedagogicalScenario) -> str:
+    """Empreinte SHA-256 du contenu d'un scénario."""
+    return hash_text(scenario.model_dump_json())
+
+
+class EnrichmentManifest:
+    """
+    Manifeste des articles déjà traités pour un scénario et une configuration donnés.
+    """
+
+    def __init__(self, path: Path, scenario_hash: str, settings: Dict[str, Any]):
+        """
+        Initialise un manifeste vide.
+
+        Args:
+            path: Chemin du fichier JSON du manifeste
+            scenario_hash: Empreinte du scénario enrichi
+            settings: Paramètres influençant les résultats (modèle, pré-filtrage...)
+        """
+        self.path = Path(path)
+        self.scenario_hash = scenario_hash
+        self.settings = dict(settings, version=MANIFEST_VERSION)
+        self.articles: Dict[str, Dict[str, Any]] = {}
+
+    @classmethod
+    def load(cls, manifest_dir: str, scenario: PedagogicalScenario,
+             settings: Dict[str, Any]) -> "EnrichmentManifest":
+        """
+        Charge le manifeste d'un scénario, ou en crée un vide.
+
+        Un manifeste produit avec d'autres paramètres (modèle, version des prompts...)
+        est ignoré.
+
+        Args:
+            manifest_dir: Répertoire des manifestes
+            scenario: Scénario à enrichir
+            settings: Paramètres courants de l'enrichissement
+
+        Returns:
+            Manifeste du scénario
+        """
+        scenario_hash = hash_scenario(scenario)
+        path = Path(manifest_dir) / f"enrichment_{scenario_hash[:16]}.json"
+        manifest = cls(path, scenario_hash, settings)
+
+        if not path.exists():
+            return manifest
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Manifeste illisible, enrichissement complet: {e}")
+            return manifest
+
+        if data.get("scenario_hash") == scenario_hash and data.get("settings") == manifest.settings:
+            manifest.articles = data.get("articles", {})
+        else:
+            print("ℹ️ Manifeste obsolète (scénario ou paramètres modifiés), enrichissement complet")
+
+        return manifest
+
+    def get_entry(self, article: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Retourne l'entrée d'un article si son contenu n'a pas changé."""
+        entry = self.articles.get(article["source"])
+        if entry and entry.get("content_hash") == hash_text(article["content"]):
+            return entry
+        return None
+
+    def pending_articles(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Retourne les articles nouveaux ou modifiés depuis le dernier enrichissement."""
+        return [article for article in articles if self.get_entry(article) is None]
+
+    def record(self, article: Dict[str, Any], novelty: Optional[str],
+               sequence_key: Optional[str], pertinence: float) -> None:
+        """
+        Enregistre le résultat du traitement d'un article.
+
+        Args:
+            article: Article traité
+            novelty: Nouveauté extraite (None si aucune conclusion)
+            sequence_key: Séquence assignée ("jour-séquence"), None si aucune
+            pertinence: Score de pertinence de l'assignation
+        """
+        self.articles[article["source"]] = {
+            "content_hash": hash_text(article["content"]),
+            "title": article["title"],
+            "novelty": novelty,
+            "sequence_key": sequence_key,
+            "pertinence": pertinence
+        }
+
+    def prune(self, articles: List[Dict[str, Any]]) -> int:
+        """
+        Supprime les articles qui ne font plus partie du corpus.
+
+        Returns:
+            Nombre d'articles supprimés du manifeste
+        """
+        sources = {article["source"] for article in articles}
+        removed = [source for source in self.articles if source not in sources]
+        for source in removed:
+            del self.articles[source]
+        return len(removed)
+
+    def assignments(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Retourne les nouveautés assignées à une séquence, dans l'ordre des articles.
+
+        Returns:
+            Liste de dictionnaires (sequence_key, nouveaute, article_title, article_source, pertinence)
+        """
+        results = []
+        for article in articles:
+            entry = self.get_entry(article)
+            if entry and entry.get("novelty") and entry.get("sequence_key"):
+                results.append({
+                    "sequence_key": entry["sequence_key"],
+                    "nouveaute": entry["novelty"],
+                    "article_title": article["title"],
+                    "article_source": article["source"],
+                    "pertinence": entry["pertinence"]
+                })
+        return results
+
+    def save(self) -> None:
+        """Sauvegarde atomiquement le manifeste (fichier temporaire puis renommage)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "scenario_hash": self.scenario_hash,
+            "settings": self.settings,
+            "updated_at": datetime.now().isoformat(),
+            "articles": self.articles
+        }
+
+        fd, tmp_path = tempfile.mkstemp(dir=str(self.path.parent), suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
@@ -0,0 +1,179 @@
+"""
+Construction des extraits d'articles envoyés au LLM, sous budget de tokens.
+
+Plutôt que de couper l'article à un nombre fixe de caractères, l'extrait:
+- retire l'en-tête de métadonnées ajouté par `AirtableArticleManager`;
+- découpe l'article en sections markdown et place d'abord les sections de
+  conclusions et de résultats, puis les autres dans leur ordre d'origine;
+- ajoute les sections tant que le budget de tokens (compté avec `tiktoken`) le
+  permet, en tronquant la première section qui dépasse.
+
+Si `tiktoken` ou son encodage n'est pas disponible, les tokens sont estimés à
+un token pour quatre caractères.
+"""
+
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..config import config
+
+
+# En-tête "# Article Airtable - ..." suivi des métadonnées et d'un séparateur ---
+AIRTABLE_HEADER_PATTERN = re.compile(r"\A\s*# Article Airtable - [^\n]*\n.*?^---[ \t]*\n", re.DOTALL | re.MULTILINE)
+
+HEADING_PATTERN = re.compile(r"^#{1,6}\s+(.*)$", re.MULTILINE)
+
+# Sections envoyées en priorité, dans cet ordre (titres de section, en minuscules)
+PRIORITY_SECTION_KEYWORDS = (
+    "conclusion", "résultat", "resultat", "découverte", "decouverte",
+    "recommandation", "levier"
+)
+
+# Caractères par token utilisés pour l'estimation sans tiktoken
+CHARS_PER_TOKEN = 4
+
+_encodings: Dict[str, Any] = {}
+_encodings_lock = threading.Lock()
+
+
+def _get_encoding(model: Optional[str]) -> Optional[Any]:
+    """Retourne l'encodage tiktoken du modèle (None si indisponible, mémorisé)."""
+    model = model or config.DEFAULT_MODEL
+    with _encodings_lock:
+        if model not in _encodings:
+            try:
+                import tiktoken
+
+                try:
+                    _encodings[model] = tiktoken.encoding_for_model(model)
+                except KeyError:
+                    _encodings[model] = tiktoken.get_encoding("cl100k_base")
+            except Exception:
+                # tiktoken absent ou encodage non téléchargeable: estimation par caractères
+                _encodings[model] = None
+        return _encodings[model]
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """
+    Compte les tokens d'un texte pour un modèle.
+
+    Args:
+        text: Texte à mesurer
+        model: Nom du modèle (utilise config.DEFAULT_MODEL si None)
+
+    Returns:
+        Nombre de tokens (estimé à len(text) / 4 sans tiktoken)
+    """
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: Optional[str] = None) -> str:
+    """Tronque un texte à au plus max_tokens tokens."""
+    if max_tokens <= 0:
+        return ""
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return text[:max_tokens * CHARS_PER_TOKEN]
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens])
+
+
+def strip_airtable_header(content: str) -> str:
+    """Retire l'en-tête de métadonnées ajouté aux articles synchronisés depuis Airtable."""
+    return AIRTABLE_HEADER_PATTERN.sub("", content, count=1).lstrip()
+
+
+def split_sections(content: str) -> List[Tuple[str, str]]:
+    """
+    Découpe un document markdown en sections.
+
+    Args:
+        content: Contenu markdown
+
+    Returns:
+        Liste de (titre de la section, texte complet de la section avec son titre);
+        le texte précédant le premier titre a un titre vide
+    """
+    sections = []
+    starts = [match.start() for match in HEADING_PATTERN.finditer(content)]
+
+    if not starts or starts[0] > 0:
+        preamble = content[:starts[0] if starts else len(content)].strip()
+        if preamble:
+            sections.append(("", preamble))
+
+    for index, start in enumerate(starts):
+        end = starts[index + 1] if index + 1 < len(starts) else len(content)
+        text = content[start:end].strip()
+        heading = HEADING_PATTERN.match(text).group(1).strip()
+        sections.append((heading, text))
+
+    return sections
+
+
+def section_priority(heading: str) -> int:
+    """
+    Rang d'envoi d'une section: position du premier mot-clé de PRIORITY_SECTION_KEYWORDS
+    présent dans son titre (conclusions d'abord), len(PRIORITY_SECTION_KEYWORDS) sinon.
+    """
+    heading = heading.lower()
+    for rank, keyword in enumerate(PRIORITY_SECTION_KEYWORDS):
+        if keyword in heading:
+            return rank
+    return len(PRIORITY_SECTION_KEYWORDS)
+
+
+def build_article_excerpt(content: str,
+                          max_tokens: Optional[int] = None,
+                          model: Optional[str] = None) -> Tuple[str, Dict[str, int]]:
+    """
+    Construit l'extrait d'un article à envoyer au LLM, dans la limite de max_tokens.
+
+    Args:
+        content: Contenu complet de l'article
+        max_tokens: Budget de tokens de l'extrait (utilise config.NOVELTY_PROMPT_MAX_TOKENS si None)
+        model: Modèle utilisé pour compter les tokens (utilise config.DEFAULT_MODEL si None)
+
+    Returns:
+        Tuple (extrait, statistiques) où les statistiques contiennent les tokens de
+        l'article complet, de l'extrait et les tokens économisés
+    """
+    max_tokens = max_tokens or config.NOVELTY_PROMPT_MAX_TOKENS
+    original_tokens = count_tokens(content, model)
+
+    sections = split_sections(strip_airtable_header(content))
+    # Tri stable: les sections non prioritaires gardent leur ordre d'origine
+    ordered = sorted(sections, key=lambda section: section_priority(section[0]))
+
+    parts = []
+    remaining = max_tokens
+    for _, text in ordered:
+        tokens = count_tokens(text, model)
+        if tokens <= remaining:
+            parts.append(text)
+            remaining -= tokens
+        else:
+            # Première section trop longue: on en garde le début et on s'arrête
+            truncated = truncate_to_tokens(text, remaining, model).strip()
+            if truncated:
+                parts.append(truncated)
+            break
+        # Séparateur entre sections
+        remaining -= 1
+        if remaining <= 0:
+            break
+
+    excerpt = "\n\n".join(parts)
+    excerpt_tokens = count_tokens(excerpt, model)
+    return excerpt, {
+        "original_tokens": original_tokens,
+        "prompt_tokens": excerpt_tokens,
+        "tokens_saved": max(original_tokens - excerpt_tokens, 0)
+    }
@@ -4,8 +4,11 @@ basées sur des articles scientifiques.
 """
 
 import json
-from typing import List, Dict, Any, Optional, Tuple
+import re
+import threading
+from typing import Callable, List, Dict, Any, Optional, Tuple
 from pathlib import Path
+import numpy as np
 from langchain_core.documents import Document
 from langchain_core.prompts import PromptTemplate
 from langchain_openai import ChatOpenAI
@@ -13,6 +16,12 @@ from langchain_openai import ChatOpenAI
 from ..models.pedagogical_scenario import PedagogicalScenario, PedagogicalDay, PedagogicalSequence
 from ..loaders.markdown_loader import MarkdownLoader
 from ..config import config
+from ..concurrency import run_bounded
+from ..retry import RetryPolicy, create_retry_policy
+from ..llm.clients import get_llm_client, prepare_llm
+from .embeddings import create_embedder, cosine_similarity_matrix, top_k_indices
+from .manifest import EnrichmentManifest
+from .prompt_builder import build_article_excerpt
 
 
 class ScenarioEnrichment:
@@ -21,25 +30,55 @@ class ScenarioEnrichment:
     basées sur des articles scientifiques.
     """
     
-    def __init__(self, llm: Optional[ChatOpenAI] = None):
+    def __init__(self, llm: Optional[ChatOpenAI] = None,
+                 max_concurrency: Optional[int] = None,
+                 relevance_batch_size: Optional[int] = None,
+                 embedder: Optional[Any] = None,
+                 prefilter_top_k: Optional[int] = None,
+                 manifest_dir: Optional[str] = None,
+                 prompt_max_tokens: Optional[int] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 progress_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None):
         """
         Initialise l'enrichisseur de scénarios.
         
         Args:
             llm: Modèle de langage à utiliser
+            max_concurrency: Nombre maximum d'appels LLM simultanés
+                (utilise config.LLM_MAX_CONCURRENCY si None)
+            relevance_batch_size: Nombre de séquences évaluées par appel LLM
+                (utilise config.RELEVANCE_BATCH_SIZE si None, 0 = un appel par séquence)
+            embedder: Objet exposant `embed_documents` pour le pré-filtrage vectoriel
+                (utilise l'embedder configuré par config.EMBEDDING_MODEL si None)
+            prefilter_top_k: Nombre de séquences candidates par nouveauté envoyées au LLM
+                (utilise config.PREFILTER_TOP_K si None, 0 = pas de pré-filtrage)
+            manifest_dir: Répertoire des manifestes d'enrichissement incrémental
+                (utilise config.ENRICHMENT_MANIFEST_DIR si None)
+            prompt_max_tokens: Budget de tokens de l'extrait d'article envoyé pour
+                l'extraction des nouveautés (utilise config.NOVELTY_PROMPT_MAX_TOKENS si None)
+            retry_policy: Politique de nouvelles tentatives des appels LLM en cas d'erreur
+                transitoire (429, timeout, 5xx); utilise create_retry_policy() si None
+            progress_callback: Fonction appelée avec (type d'événement, données) à chaque
+                étape, article extrait, nouveauté évaluée et séquence enrichie
         """
         if llm is None:
-            model_config = config.get_model_config()
-            self.llm = ChatOpenAI(
-                model=model_config["model"],
-                temperature=0.3,  # Température plus basse pour plus de précision
-                max_tokens=model_config["max_tokens"],
-                openai_api_key=config.OPENAI_API_KEY,
-                openai_api_base=config.OPENAI_API_BASE
-            )
+            # Modèle partagé du processus (température plus basse pour plus de précision)
+            self.llm = get_llm_client(temperature=0.3)
         else:
-            self.llm = llm
+            self.llm = prepare_llm(llm)
         
+        self.max_concurrency = max_concurrency or config.LLM_MAX_CONCURRENCY
+        self.relevance_batch_size = (
+            config.RELEVANCE_BATCH_SIZE if relevance_batch_size is None else relevance_batch_size
+        )
+        self.prefilter_top_k = config.PREFILTER_TOP_K if prefilter_top_k is None else prefilter_top_k
+        self.embedder = embedder or create_embedder()
+        self.manifest_dir = manifest_dir or config.ENRICHMENT_MANIFEST_DIR
+        self.prompt_max_tokens = prompt_max_tokens or config.NOVELTY_PROMPT_MAX_TOKENS
+        self.retry_policy = retry_policy or create_retry_policy()
+        self.prompt_token_stats = {"articles": 0, "original_tokens": 0, "prompt_tokens": 0, "tokens_saved": 0}
+        self.progress_callback = progress_callback
+        self._progress_lock = threading.Lock()
         self.loader = MarkdownLoader()
         
         # Template pour analyser les articles scientifiques
@@ -76,6 +115,25 @@ Si aucune nouveauté pertinente: répondre simplement "PERTINENCE: 1"
 """
         )
     
+    def _invoke_llm(self, prompt: str) -> Any:
+        """Envoie un prompt utilisateur au LLM, en retentant les erreurs transitoires."""
+        return self.retry_policy.call(
+            self.llm.invoke,
+            [{"role": "user", "content": prompt}],
+            on_retry=lambda attempt, error, delay: print(
+                f"⏳ Appel LLM en échec (tentative {attempt}: {error}), nouvel essai dans {delay:.1f}s"
+            )
+        )
+    
+    def _notify(self, event: str, **data: Any) -> None:
+        """Transmet un événement d'avancement au callback (les erreurs du callback sont ignorées)."""
+        if self.progress_callback is None:
+            return
+        try:
+            self.progress_callback(event, data)
+        except Exception as e:
+            print(f"⚠️ Erreur dans le callback d'avancement: {e}")
+    
     def analyze_scientific_articles(self, data_directory: str) -> List[Dict[str, Any]]:
         """
         Analyse tous les articles scientifiques du répertoire data.
@@ -92,8 +150,9 @@ Si aucune nouveauté pertinente: répondre simplement "PERTINENCE: 1"
         
         articles = []
         
-        # Chargement des documents
-        documents = self.loader.load_directory(
+        # Chargement des documents en parallèle: chaque article est analysé dès
+        # que son fichier est lu
+        documents = self.loader.iter_directory(
             str(data_path),
             pattern="*.md",
             recursive=True
@@ -109,16 +168,25 @@ Si aucune nouveauté pertinente: répondre simplement "PERTINENCE: 1"
             }
             articles.append(article_info)
         
+        # Ordre stable (les fichiers sont chargés dans leur ordre de fin de lecture)
+        articles.sort(key=lambda article: article["source"])
+        
         print(f"📚 {len(articles)} articles scientifiques analysés")
         return articles
     
-    def enrich_scenario(self, scenario: PedagogicalScenario, articles: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def enrich_scenario(self, scenario: PedagogicalScenario, articles: List[Dict[str, Any]],
+                        incremental: Optional[bool] = None) -> Dict[str, Any]:
         """
         Enrichit un scénario pédagogique avec des suggestions basées sur les articles.
         
+        En mode incrémental, seuls les articles nouveaux ou modifiés depuis le dernier
+        enrichissement du même scénario sont extraits et évalués; les résultats des
+        autres articles sont repris du manifeste (voir `EnrichmentManifest`).
+        
         Args:
             scenario: Scénario pédagogique à enrichir
             articles: Liste des articles scientifiques analysés
+            incremental: Active le mode incrémental (utilise config.INCREMENTAL_ENRICHMENT si None)
             
         Returns:
             Scénario enrichi avec suggestions
@@ -133,18 +201,28 @@ Si aucune nouveauté pertinente: répondre simplement "PERTINENCE: 1"
         }
         
         # Suggestions globales pour le scénario complet
+        self._notify("stage", stage="global_suggestions")
         global_suggestions = self._get_global_suggestions(scenario, articles)
         enriched_scenario["enrichments"]["global_suggestions"] = global_suggestions
         
-        # Extraire toutes les nouveautés scientifiques des articles
-        print("🔬 Extraction des nouveautés scientifiques...")
-        all_novelties = self._extract_all_novelties(articles)
-        print(f"📋 {len(all_novelties)} nouveautés extraites")
+        if incremental is None:
+            incremental = config.INCREMENTAL_ENRICHMENT
         
-        # Distribuer chaque nouveauté à la séquence la plus pertinente
-        novelty_assignments = self._assign_novelties_to_sequences(scenario, all_novelties)
+        if incremental:
+            novelty_assignments = self._assign_novelties_incrementally(scenario, articles, enriched_scenario)
+        else:
+            # Extraire toutes les nouveautés scientifiques des articles
+            print("🔬 Extraction des nouveautés scientifiques...")
+            all_novelties = self._extract_all_novelties(articles)
+            print(f"📋 {len(all_novelties)} nouveautés extraites")
+            
+            # Distribuer chaque nouveauté à la séquence la plus pertinente
+            novelty_assignments = self._assign_novelties_to_sequences(scenario, all_novelties)
         
         # Enrichissement par jour
+        self._notify("stage", stage="sequences")
+        total_sequences = sum(len(day.sequences) for day in scenario.days)
+        done_sequences = 0
         for day in scenario.days:
             enriched_day = {
                 "day_number": day.day_number,
@@ -158,23 +236,119 @@ Si aucune nouveauté pertinente: répondre simplement "PERTINENCE: 1"
                 assigned_novelties = novelty_assignments.get(sequence_key, [])
                 enriched_sequence = self._create_enriched_sequence(sequence, assigned_novelties)
                 enriched_day["sequences"].append(enriched_sequence)
+                
+                done_sequences += 1
+                self._notify("sequence", done=done_sequences, total=total_sequences,
+                             sequence_key=sequence_key, novelties=len(assigned_novelties))
             
             enriched_scenario["enrichments"]["days"].append(enriched_day)
         
         return enriched_scenario
     
     def _extract_all_novelties(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Extrait toutes les nouveautés scientifiques de tous les articles."""
+        """
+        Extrait toutes les nouveautés scientifiques de tous les articles.
+        
+        Les articles sont traités en parallèle (au plus `max_concurrency` appels LLM
+        simultanés). L'ordre des nouveautés suit celui des articles et l'échec d'un
+        article n'affecte pas les autres.
+        """
         all_novelties = []
         
-        for article in articles:
+        for novelty, error in self._extract_novelties_by_article(articles):
+            if error is None and novelty:
+                all_novelties.append(novelty)
+                
+        return all_novelties
+    
+    def _extract_novelties_by_article(self, articles: List[Dict[str, Any]]) -> List[Tuple[Optional[Dict[str, Any]], Optional[BaseException]]]:
+        """Extrait en parallèle la nouveauté de chaque article: (nouveauté ou None, erreur ou None) par article."""
+        self._notify("stage", stage="extraction", articles=len(articles))
+        counter = {"done": 0}
+        
+        def extract(article: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            status = "error"
+            token_stats = {}
             try:
-                prompt = f"""
+                novelty = self._extract_article_novelty(article, token_stats)
+                status = "extracted" if novelty else "no_conclusion"
+                return novelty
+            finally:
+                with self._progress_lock:
+                    counter["done"] += 1
+                    self._notify("article", done=counter["done"], total=len(articles),
+                                 title=article["title"], status=status,
+                                 tokens_saved=token_stats.get("tokens_saved", 0))
+        
+        outcomes = run_bounded(extract, articles, self.max_concurrency)
+        
+        if articles:
+            stats = self.prompt_token_stats
+            print(f"✂️  Extraits d'articles: {stats['prompt_tokens']} tokens envoyés, "
+                  f"{stats['tokens_saved']} économisés sur {stats['original_tokens']}")
+        
+        for article, (_, error) in zip(articles, outcomes):
+            if error is not None:
+                print(f"Erreur lors de l'extraction des nouveautés de {article['title']}: {error}")
+        
+        return outcomes
+    
+    def _article_markdown(self, article: Dict[str, Any]) -> str:
+        """
+        Texte markdown brut d'un article, avec ses titres et son en-tête Airtable.
+        
+        En mode unstructured (par défaut), le contenu chargé a perdu ces marqueurs:
+        le fichier source est relu directement. À défaut (fichier introuvable),
+        le contenu chargé est utilisé.
+        """
+        if self.loader.mode == "native":
+            return article["content"]
+        try:
+            return self.loader.read_raw(article["source"]) or article["content"]
+        except (OSError, UnicodeDecodeError):
+            return article["content"]
+    
+    def _build_article_excerpt(self, article: Dict[str, Any]) -> Tuple[str, Dict[str, int]]:
+        """
+        Construit l'extrait de l'article envoyé au LLM (sections de conclusions et de
+        résultats d'abord, sans l'en-tête Airtable, dans la limite de `prompt_max_tokens`)
+        et comptabilise les tokens économisés.
+        """
+        excerpt, stats = build_article_excerpt(
+            self._article_markdown(article),
+            self.prompt_max_tokens,
+            getattr(self.llm, "model_name", None)
+        )
+        
+        with self._progress_lock:
+            self.prompt_token_stats["articles"] += 1
+            for key in ("original_tokens", "prompt_tokens", "tokens_saved"):
+                self.prompt_token_stats[key] += stats[key]
+        
+        if config.DEBUG_MODE:
+            print(f"✂️  {article['title']}: {stats['prompt_tokens']}/{stats['original_tokens']} tokens "
+                  f"({stats['tokens_saved']} économisés)")
+        return excerpt, stats
+    
+    def _extract_article_novelty(self, article: Dict[str, Any],
+                                 token_stats: Optional[Dict[str, int]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Extrait la conclusion principale d'un article (None si aucune conclusion).
+        
+        Args:
+            article: Article analysé
+            token_stats: Dictionnaire complété avec les statistiques de tokens de l'extrait
+        """
+        excerpt, stats = self._build_article_excerpt(article)
+        if token_stats is not None:
+            token_stats.update(stats)
+        
+        prompt = f"""
 Analysez cet article scientifique et identifiez LA CONCLUSION PRINCIPALE.
 
 ARTICLE SCIENTIFIQUE:
 Titre: {article['title']}
-Contenu: {article['content'][:4000]}
+Contenu: {excerpt}
 
 OBJECTIF:
 Extraire la conclusion principale de cet article - la découverte, innovation ou résultat le plus significatif.
@@ -200,36 +374,48 @@ Exemple de format: "L'étude démontre que [découverte principale] grâce à [m
 Si aucune conclusion claire, répondez: "AUCUNE CONCLUSION"
 """
 
-                response = self.llm.invoke([{"role": "user", "content": prompt}])
-                conclusion = response.content.strip()
-                
-                if "AUCUNE CONCLUSION" not in conclusion and conclusion:
-                    all_novelties.append({
-                        "nouveaute": conclusion,
-                        "article_title": article['title'],
-                        "article_source": article['source'],
-                        "article": article
-                    })
-                    print(f"📋 Conclusion extraite de {article['title']}: {conclusion[:80]}...")
-                                
-            except Exception as e:
-                print(f"Erreur lors de l'extraction des nouveautés de {article['title']}: {e}")
-                continue
-                
-        return all_novelties
+        response = self._invoke_llm(prompt)
+        conclusion = response.content.strip()
+        
+        if "AUCUNE CONCLUSION" in conclusion or not conclusion:
+            return None
+        
+        print(f"📋 Conclusion extraite de {article['title']}: {conclusion[:80]}...")
+        return {
+            "nouveaute": conclusion,
+            "article_title": article['title'],
+            "article_source": article['source'],
+            "article": article
+        }
+    
+    def _sequence_info(self, sequence: PedagogicalSequence) -> Dict[str, str]:
+        """Prépare les informations d'une séquence pour les prompts de pertinence."""
+        return {
+            "title": sequence.title or f"Séquence {sequence.sequence_number}",
+            "objectives": ", ".join(sequence.objectives) if sequence.objectives else "Non spécifiés",
+            "content": sequence.content,
+            "methods": ", ".join(sequence.pedagogical_methods),
+            "resources": ", ".join(sequence.resources_needed)
+        }
     
     def _analyze_sequence_relevance(self, sequence: PedagogicalSequence, nouveaute: str) -> float:
-        """Analyse la pertinence d'une nouveauté pour une séquence spécifique."""
+        """Analyse la pertinence d'une nouveauté pour une séquence spécifique (0.0 en cas d'erreur)."""
         try:
-            sequence_info = {
-                "title": sequence.title or f"Séquence {sequence.sequence_number}",
-                "objectives": ", ".join(sequence.objectives) if sequence.objectives else "Non spécifiés",
-                "content": sequence.content,
-                "methods": ", ".join(sequence.pedagogical_methods),
-                "resources": ", ".join(sequence.resources_needed)
-            }
-            
-            prompt = f"""
+            return self._request_sequence_relevance(sequence, nouveaute)
+        except Exception as e:
+            print(f"Erreur lors de l'évaluation de pertinence: {e}")
+            return 0.0
+    
+    def _request_sequence_relevance(self, sequence: PedagogicalSequence, nouveaute: str) -> float:
+        """
+        Demande au LLM la pertinence d'une nouveauté pour une séquence.
+        
+        Raises:
+            Exception: Erreur de l'appel LLM (après les nouvelles tentatives)
+        """
+        sequence_info = self._sequence_info(sequence)
+        
+        prompt = f"""
 Évaluez la pertinence de cette nouveauté scientifique pour cette séquence pédagogique précise.
 
 SÉQUENCE PÉDAGOGIQUE:
@@ -252,55 +438,289 @@ Donnez un score de pertinence de 0 à 5:
 Répondez UNIQUEMENT par un chiffre de 0 à 5.
 """
 
-            response = self.llm.invoke([{"role": "user", "content": prompt}])
-            score_text = response.content.strip()
+        response = self._invoke_llm(prompt)
+        score_text = response.content.strip()
+        
+        try:
+            return float(score_text)
+        except:
+            # Si le parsing échoue, essayer d'extraire le premier chiffre
+            match = re.search(r'[0-5]', score_text)
+            return float(match.group()) if match else 0.0
+    
+    def _analyze_sequences_relevance_batch(self, sequences: List[PedagogicalSequence], nouveaute: str) -> List[float]:
+        """
+        Évalue en un seul appel LLM la pertinence d'une nouveauté pour plusieurs séquences.
+        
+        Args:
+            sequences: Séquences à évaluer
+            nouveaute: Nouveauté scientifique
             
-            try:
-                return float(score_text)
-            except:
-                # Si le parsing échoue, essayer d'extraire le premier chiffre
-                import re
-                match = re.search(r'[0-5]', score_text)
-                return float(match.group()) if match else 0.0
-                
+        Returns:
+            Scores de 0 à 5 dans l'ordre des séquences (0.0 si absent de la réponse)
+            
+        Raises:
+            Exception: Erreur de l'appel LLM (après les nouvelles tentatives)
+        """
+        sequences_text = []
+        for index, sequence in enumerate(sequences, 1):
+            sequence_info = self._sequence_info(sequence)
+            sequences_text.append(
+                f"[{index}] Titre: {sequence_info['title']}\n"
+                f"    Objectifs: {sequence_info['objectives']}\n"
+                f"    Contenu: {sequence_info['content']}\n"
+                f"    Méthodes: {sequence_info['methods']}"
+            )
+        
+        prompt = f"""
+Évaluez la pertinence de cette nouveauté scientifique pour CHACUNE des séquences pédagogiques numérotées ci-dessous.
+
+NOUVEAUTÉ SCIENTIFIQUE:
+{nouveaute}
+
+SÉQUENCES PÉDAGOGIQUES:
+{chr(10).join(sequences_text)}
+
+Pour chaque séquence, donnez un score de pertinence de 0 à 5:
+- 5: Parfaitement aligné avec les objectifs et activités de cette séquence
+- 4: Très pertinent, peut enrichir significativement cette séquence
+- 3: Pertinent mais pas spécifiquement pour cette séquence
+- 2: Peu pertinent pour cette séquence précise
+- 1: Marginalement lié
+- 0: Non pertinent
+
+Évaluez chaque séquence indépendamment des autres.
+Répondez UNIQUEMENT avec une ligne par séquence au format "numéro: score", par exemple:
+SCORES:
+1: 0
+2: 4
+"""
+
+        response = self._invoke_llm(prompt)
+        return self._parse_batch_scores(response.content, len(sequences))
+    
+    def _parse_batch_scores(self, response_text: str, expected_count: int) -> List[float]:
+        """Parse une réponse "numéro: score" en vecteur de scores."""
+        scores = [0.0] * expected_count
+        
+        for line in response_text.split('\n'):
+            match = re.match(r'^\s*\[?(\d+)\]?\s*[:=\-]\s*([0-5](?:[.,]\d+)?)', line)
+            if not match:
+                continue
+            index = int(match.group(1)) - 1
+            if 0 <= index < expected_count:
+                scores[index] = min(5.0, float(match.group(2).replace(',', '.')))
+        
+        return scores
+    
+    def _score_novelty(self, nouveaute: str, sequences: List[PedagogicalSequence]) -> List[float]:
+        """
+        Calcule le vecteur de scores d'une nouveauté pour une liste de séquences.
+        
+        En mode lot (`relevance_batch_size` > 0), les séquences sont évaluées par
+        paquets d'au plus `relevance_batch_size` séquences par appel LLM.
+        Les erreurs d'appel LLM sont propagées, pour que la nouveauté ne soit pas
+        considérée comme évaluée.
+        """
+        if self.relevance_batch_size <= 0:
+            return [self._request_sequence_relevance(sequence, nouveaute) for sequence in sequences]
+        
+        scores = []
+        for start in range(0, len(sequences), self.relevance_batch_size):
+            chunk = sequences[start:start + self.relevance_batch_size]
+            scores.extend(self._analyze_sequences_relevance_batch(chunk, nouveaute))
+        return scores
+    
+    def _sequence_embedding_text(self, sequence: PedagogicalSequence) -> str:
+        """Texte représentant une séquence pour le pré-filtrage vectoriel."""
+        parts = [sequence.title or "", " ".join(sequence.objectives), sequence.content]
+        return "\n".join(part for part in parts if part)
+    
+    def _prefilter_candidates(self, all_novelties: List[Dict[str, Any]], sequences: List[PedagogicalSequence]) -> List[List[int]]:
+        """
+        Sélectionne, pour chaque nouveauté, les `prefilter_top_k` séquences les plus proches.
+        
+        Nouveautés et séquences sont vectorisées en un seul appel à l'embedder, puis
+        comparées par similarité cosinus.
+        
+        Returns:
+            Pour chaque nouveauté, les indices des séquences candidates
+        """
+        all_indices = list(range(len(sequences)))
+        if self.prefilter_top_k <= 0 or len(sequences) <= self.prefilter_top_k or not all_novelties:
+            return [all_indices for _ in all_novelties]
+        
+        try:
+            texts = [novelty["nouveaute"] for novelty in all_novelties]
+            texts += [self._sequence_embedding_text(sequence) for sequence in sequences]
+            vectors = np.asarray(self.embedder.embed_documents(texts), dtype=np.float32)
+            
+            similarities = cosine_similarity_matrix(vectors[:len(all_novelties)], vectors[len(all_novelties):])
+            candidates = top_k_indices(similarities, self.prefilter_top_k)
+            print(f"🧭 Pré-filtrage vectoriel: {self.prefilter_top_k}/{len(sequences)} séquences candidates par nouveauté")
+            return candidates
         except Exception as e:
-            print(f"Erreur lors de l'évaluation de pertinence: {e}")
-            return 0.0
+            print(f"⚠️ Pré-filtrage vectoriel indisponible, évaluation de toutes les séquences: {e}")
+            return [all_indices for _ in all_novelties]
     
-    def _assign_novelties_to_sequences(self, scenario: PedagogicalScenario, all_novelties: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
-        """Assigne chaque nouveauté à la séquence la plus pertinente."""
-        assignments = {}
+    def _compute_score_matrix(self, all_novelties: List[Dict[str, Any]], sequences: List[PedagogicalSequence]) -> List[Optional[List[float]]]:
+        """
+        Calcule la matrice des scores [nouveauté][séquence], les nouveautés étant traitées en parallèle.
         
-        for novelty in all_novelties:
-            best_sequence = None
+        Seules les séquences retenues par le pré-filtrage vectoriel sont évaluées par
+        le LLM; les autres reçoivent un score de 0. La ligne d'une nouveauté dont
+        l'évaluation a échoué vaut None (et non des scores nuls).
+        """
+        candidates = self._prefilter_candidates(all_novelties, sequences)
+        self._notify("stage", stage="scoring", novelties=len(all_novelties))
+        counter = {"done": 0}
+        
+        def score_candidates(item):
+            novelty, indices = item
+            try:
+                return self._score_novelty(novelty["nouveaute"], [sequences[index] for index in indices])
+            finally:
+                with self._progress_lock:
+                    counter["done"] += 1
+                    self._notify("novelty_scored", done=counter["done"], total=len(all_novelties),
+                                 article_title=novelty["article_title"])
+        
+        outcomes = run_bounded(score_candidates, list(zip(all_novelties, candidates)), self.max_concurrency)
+        
+        score_matrix = []
+        for novelty, indices, (scores, error) in zip(all_novelties, candidates, outcomes):
+            if error is not None:
+                print(f"Erreur lors de l'évaluation de pertinence de {novelty['article_title']}: {error}")
+                score_matrix.append(None)
+                continue
+            row = [0.0] * len(sequences)
+            for index, score in zip(indices, scores):
+                row[index] = score
+            score_matrix.append(row)
+        return score_matrix
+    
+    def _find_best_sequences(self, scenario: PedagogicalScenario, all_novelties: List[Dict[str, Any]]) -> List[Optional[Tuple[Optional[str], float]]]:
+        """
+        Détermine pour chaque nouveauté la séquence la plus pertinente (score >= 4.0).
+        
+        Returns:
+            Pour chaque nouveauté, (clé "jour-séquence" ou None, meilleur score),
+            ou None si son évaluation a échoué
+        """
+        sequence_keys = []
+        sequences = []
+        for day in scenario.days:
+            for sequence in day.sequences:
+                sequence_keys.append(f"{day.day_number}-{sequence.sequence_number}")
+                sequences.append(sequence)
+        
+        score_matrix = self._compute_score_matrix(all_novelties, sequences)
+        
+        best_sequences = []
+        for scores in score_matrix:
+            if scores is None:
+                best_sequences.append(None)
+                continue
+            
             best_score = 0
             best_key = None
             
             # Trouver la séquence avec le meilleur score de pertinence
-            for day in scenario.days:
-                for sequence in day.sequences:
-                    score = self._analyze_sequence_relevance(sequence, novelty["nouveaute"])
-                    sequence_key = f"{day.day_number}-{sequence.sequence_number}"
-                    
-                    if score >= 4.0 and score > best_score:
-                        best_score = score
-                        best_sequence = sequence
-                        best_key = sequence_key
+            for sequence_key, score in zip(sequence_keys, scores):
+                if score >= 4.0 and score > best_score:
+                    best_score = score
+                    best_key = sequence_key
             
-            # Assigner la nouveauté à la meilleure séquence
             if best_key:
-                if best_key not in assignments:
-                    assignments[best_key] = []
-                assignments[best_key].append({
-                    "nouveaute": novelty["nouveaute"],
-                    "article_title": novelty["article_title"],
-                    "article_source": novelty["article_source"],
-                    "pertinence": best_score
-                })
                 print(f"📍 Nouveauté assignée à la séquence {best_key} (score: {best_score:.1f})")
+            best_sequences.append((best_key, best_score))
         
+        return best_sequences
+    
+    def _group_assignments(self, assigned_novelties: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        """Regroupe les nouveautés assignées par clé de séquence."""
+        assignments = {}
+        for assigned in assigned_novelties:
+            assignments.setdefault(assigned["sequence_key"], []).append({
+                "nouveaute": assigned["nouveaute"],
+                "article_title": assigned["article_title"],
+                "article_source": assigned["article_source"],
+                "pertinence": assigned["pertinence"]
+            })
         return assignments
     
+    def _assign_novelties_to_sequences(self, scenario: PedagogicalScenario, all_novelties: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        """Assigne chaque nouveauté à la séquence la plus pertinente."""
+        best_sequences = self._find_best_sequences(scenario, all_novelties)
+        
+        return self._group_assignments([
+            {
+                "sequence_key": best[0],
+                "nouveaute": novelty["nouveaute"],
+                "article_title": novelty["article_title"],
+                "article_source": novelty["article_source"],
+                "pertinence": best[1]
+            }
+            for novelty, best in zip(all_novelties, best_sequences)
+            if best and best[0]
+        ])
+    
+    def _manifest_settings(self) -> Dict[str, Any]:
+        """Paramètres qui, s'ils changent, invalident le manifeste incrémental."""
+        return {
+            "model": getattr(self.llm, "model_name", type(self.llm).__name__),
+            "prefilter_top_k": self.prefilter_top_k,
+            "relevance_batch_size": self.relevance_batch_size,
+            "prompt_max_tokens": self.prompt_max_tokens,
+            "embedder": type(self.embedder).__name__
+        }
+    
+    def _assign_novelties_incrementally(self, scenario: PedagogicalScenario, articles: List[Dict[str, Any]],
+                                        enriched_scenario: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Extrait et assigne uniquement les nouveautés des articles nouveaux ou modifiés,
+        puis fusionne avec les résultats mémorisés dans le manifeste du scénario.
+        """
+        manifest = EnrichmentManifest.load(self.manifest_dir, scenario, self._manifest_settings())
+        pending_articles = manifest.pending_articles(articles)
+        removed_count = manifest.prune(articles)
+        
+        print(f"🔬 Extraction des nouveautés scientifiques: {len(pending_articles)} article(s) nouveau(x) "
+              f"ou modifié(s), {len(articles) - len(pending_articles)} repris du manifeste...")
+        outcomes = self._extract_novelties_by_article(pending_articles)
+        
+        new_novelties = [novelty for novelty, error in outcomes if error is None and novelty]
+        print(f"📋 {len(new_novelties)} nouveautés extraites")
+        best_by_source = {
+            novelty["article_source"]: best
+            for novelty, best in zip(new_novelties, self._find_best_sequences(scenario, new_novelties))
+        }
+        
+        for article, (novelty, error) in zip(pending_articles, outcomes):
+            if error is not None:
+                # Pas d'entrée: l'article sera retenté au prochain enrichissement
+                continue
+            best = best_by_source.get(article["source"], (None, 0)) if novelty else (None, 0)
+            if best is None:
+                # Évaluation de pertinence en échec: l'article sera retenté lui aussi
+                continue
+            best_key, best_score = best
+            manifest.record(article, novelty["nouveaute"] if novelty else None, best_key, best_score)
+        
+        try:
+            manifest.save()
+        except OSError as e:
+            print(f"⚠️ Impossible de sauvegarder le manifeste d'enrichissement: {e}")
+        
+        enriched_scenario["incremental"] = {
+            "manifest": str(manifest.path),
+            "processed_articles": len(pending_articles),
+            "reused_articles": len(articles) - len(pending_articles),
+            "removed_articles": removed_count
+        }
+        
+        return self._group_assignments(manifest.assignments(articles))
+    
     def _create_enriched_sequence(self, sequence: PedagogicalSequence, assigned_novelties: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Crée une séquence enrichie avec les nouveautés assignées."""
         enriched_sequence = {
@@ -445,7 +865,7 @@ SUGGESTIONS GLOBALES:
 """
         
         try:
-            response = self.llm.invoke([{"role": "user", "content": global_prompt}])
+            response = self._invoke_llm(global_prompt)
             response_text = response.content.strip()
             
             suggestions = []
@@ -628,6 +1048,8 @@ SUGGESTIONS GLOBALES:
         return str(output_file)
 
 
-def create_scenario_enrichment(llm: Optional[ChatOpenAI] = None) -> ScenarioEnrichment:
+def create_scenario_enrichment(llm: Optional[ChatOpenAI] = None,
+                               max_concurrency: Optional[int] = None,
+                               progress_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> ScenarioEnrichment:
     """Factory function pour créer un ScenarioEnrichment."""
-    return ScenarioEnrichment(llm=llm)
\ No newline at end of file
+    return ScenarioEnrichment(llm=llm, max_concurrency=max_concurrency, progress_callback=progress_callback)
\ No newline at end of file
@@ -0,0 +1,26 @@
+"""
+Infrastructure partagée pour les appels aux modèles de langage.
+"""
+
+from .cache import PersistentLLMCache, get_llm_cache, get_llm_cache_stats
+from .clients import (
+    LLMClientRegistry,
+    get_llm_client,
+    get_llm_client_registry,
+    get_llm_client_stats,
+    close_llm_clients,
+    prepare_llm
+)
+from .rate_limit import (
+    LLMRateLimiter,
+    ChatModelRateLimiter,
+    get_llm_rate_limiter,
+    get_llm_rate_limit_stats
+)
+
+__all__ = [
+    "PersistentLLMCache", "get_llm_cache", "get_llm_cache_stats",
+    "LLMClientRegistry", "get_llm_client", "get_llm_client_registry",
+    "get_llm_client_stats", "close_llm_clients", "prepare_llm",
+    "LLMRateLimiter", "ChatModelRateLimiter", "get_llm_rate_limiter", "get_llm_rate_limit_stats"
+]
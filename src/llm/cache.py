@@ -0,0 +1,218 @@
+"""
+Cache persistant des réponses LLM, adressé par le contenu de la requête.
+
+Le cache s'intègre au mécanisme de cache de LangChain (`BaseCache`): la clé est
+l'empreinte SHA-256 de la configuration du modèle (nom, température, etc.) et du
+prompt sérialisé. Les entrées sont stockées dans une base SQLite, avec expiration
+(TTL) et éviction LRU lorsque la taille totale dépasse la limite configurée.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+import warnings
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from langchain_core.caches import BaseCache, RETURN_VAL_TYPE
+from langchain_core.load import dumps, loads
+
+from ..config import config
+
+# `loads` est marqué "beta" par LangChain, l'avertissement est inutile ici
+warnings.filterwarnings("ignore", message="The function `loads` is in beta")
+
+
+class PersistentLLMCache(BaseCache):
+    """
+    Cache LLM sur disque (SQLite) avec éviction LRU par taille et TTL.
+    
+    Utilisable par plusieurs threads et plusieurs processus partageant le même fichier.
+    """
+    
+    def __init__(self,
+                 database_path: str,
+                 max_size_bytes: int = 256 * 1024 * 1024,
+                 ttl_seconds: int = 0):
+        """
+        Initialise le cache.
+        
+        Args:
+            database_path: Chemin du fichier SQLite
+            max_size_bytes: Taille totale maximale des réponses stockées
+            ttl_seconds: Durée de vie d'une entrée en secondes (0 = illimitée)
+        """
+        self.database_path = database_path
+        self.max_size_bytes = max_size_bytes
+        self.ttl_seconds = ttl_seconds
+        
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        
+        Path(database_path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(database_path, timeout=30, check_same_thread=False)
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache(accessed_at)"
+            )
+            self._connection.commit()
+    
+    @staticmethod
+    def make_key(prompt: str, llm_string: str) -> str:
+        """Calcule la clé d'une entrée à partir de la configuration du modèle et du prompt."""
+        return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+    
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        """Retourne les générations en cache, ou None (cache miss)."""
+        key = self.make_key(prompt, llm_string)
+        now = time.time()
+        
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            
+            if row is not None and self.ttl_seconds and now - row[1] > self.ttl_seconds:
+                self._connection.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._connection.commit()
+                row = None
+            
+            if row is None:
+                self.misses += 1
+                return None
+            
+            self._connection.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self._connection.commit()
+            self.hits += 1
+        
+        try:
+            return loads(row[0])
+        except Exception:
+            # Entrée illisible (version de LangChain différente...): traitée comme absente
+            return None
+    
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        """Enregistre les générations d'une requête puis applique l'éviction LRU."""
+        key = self.make_key(prompt, llm_string)
+        value = dumps(list(return_val))
+        size = len(value.encode("utf-8"))
+        now = time.time()
+        
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now)
+            )
+            self.writes += 1
+            self._evict()
+            self._connection.commit()
+    
+    def _evict(self) -> None:
+        """Supprime les entrées expirées puis les moins récemment utilisées au-delà de la taille maximale."""
+        if self.ttl_seconds:
+            cursor = self._connection.execute(
+                "DELETE FROM llm_cache WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+            )
+            self.evictions += max(cursor.rowcount, 0)
+        
+        total_size = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+        if total_size <= self.max_size_bytes:
+            return
+        
+        excess = total_size - self.max_size_bytes
+        freed = 0
+        keys = []
+        for key, size in self._connection.execute("SELECT key, size FROM llm_cache ORDER BY accessed_at ASC"):
+            keys.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        
+        self._connection.executemany("DELETE FROM llm_cache WHERE key = ?", keys)
+        self.evictions += len(keys)
+    
+    def clear(self, **kwargs: Any) -> None:
+        """Vide complètement le cache."""
+        with self._lock:
+            self._connection.execute("DELETE FROM llm_cache")
+            self._connection.commit()
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retourne les compteurs du cache.
+        
+        Returns:
+            Dictionnaire avec hits, misses, taux de succès, nombre et taille des entrées
+        """
+        with self._lock:
+            entries, size = self._connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+            ).fetchone()
+        
+        lookups = self.hits + self.misses
+        return {
+            "enabled": True,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "entries": entries,
+            "size_bytes": size,
+            "max_size_bytes": self.max_size_bytes,
+            "ttl_seconds": self.ttl_seconds
+        }
+
+
+_llm_cache: Optional[PersistentLLMCache] = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache(enabled: Optional[bool] = None) -> Union[PersistentLLMCache, bool]:
+    """
+    Retourne le cache LLM partagé du processus, à passer au paramètre `cache` des modèles.
+    
+    Args:
+        enabled: Force l'activation ou le contournement du cache
+            (utilise config.LLM_CACHE_ENABLED si None)
+    
+    Returns:
+        L'instance de cache, ou False pour contourner tout cache
+    """
+    global _llm_cache
+    
+    if enabled is None:
+        enabled = config.LLM_CACHE_ENABLED
+    if not enabled:
+        return False
+    
+    with _llm_cache_lock:
+        if _llm_cache is None:
+            _llm_cache = PersistentLLMCache(
+                database_path=config.LLM_CACHE_PATH,
+                max_size_bytes=config.LLM_CACHE_MAX_SIZE_MB * 1024 * 1024,
+                ttl_seconds=config.LLM_CACHE_TTL_SECONDS
+            )
+        return _llm_cache
+
+
+def get_llm_cache_stats() -> Dict[str, Any]:
+    """Retourne les statistiques du cache partagé (sans le créer s'il n'existe pas)."""
+    if _llm_cache is None:
+        return {"enabled": bool(config.LLM_CACHE_ENABLED), "hits": 0, "misses": 0}
+    return _llm_cache.stats()
@@ -0,0 +1,293 @@
+"""
+Registre partagé des clients LLM du processus.
+
+Chaque combinaison (modèle, température, URL de base) correspond à un unique
+`ChatOpenAI`, créé au premier usage puis réutilisé par toutes les tâches. Tous les
+clients partagent un même `httpx.Client`: son pool de connexions keep-alive évite
+de refaire la connexion TCP et la négociation TLS à chaque requête. Le transport
+HTTP fait passer chaque requête par le limiteur de débit partagé (`rate_limit.py`)
+et compte les requêtes et les connexions ouvertes, ce qui donne le taux de
+réutilisation des connexions.
+
+Un modèle fourni par l'appelant (paramètre `llm=` des processeurs) ne passe pas par
+ce transport: `prepare_llm` lui applique le limiteur de débit et le cache partagés.
+"""
+
+import json
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+from langchain_core.language_models import BaseChatModel
+from langchain_openai import ChatOpenAI
+
+from ..config import config
+from .cache import get_llm_cache
+from .rate_limit import ChatModelRateLimiter, LLMRateLimiter, estimate_request_tokens, get_llm_rate_limiter
+
+
+class InstrumentedTransport(httpx.HTTPTransport):
+    """
+    Transport HTTP qui applique le limiteur de débit avant chaque requête et compte
+    les requêtes envoyées et les nouvelles connexions ouvertes par le pool (une
+    requête sans nouvelle connexion en a réutilisé une).
+    """
+
+    def __init__(self, rate_limiter: Optional[LLMRateLimiter] = None, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.rate_limiter = rate_limiter
+        self._stats_lock = threading.Lock()
+        self.requests = 0
+        self.connections_opened = 0
+
+    def _trace(self, event_name: str, info: Dict[str, Any]) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            with self._stats_lock:
+                self.connections_opened += 1
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        estimated_tokens = 0
+        if self.rate_limiter is not None:
+            estimated_tokens = estimate_request_tokens(request.content)
+            self.rate_limiter.acquire(estimated_tokens)
+
+        with self._stats_lock:
+            self.requests += 1
+        request.extensions["trace"] = self._trace
+        response = super().handle_request(request)
+
+        if self.rate_limiter is not None:
+            self.rate_limiter.record_usage(estimated_tokens, self._used_tokens(request, response))
+        return response
+
+    @staticmethod
+    def _used_tokens(request: httpx.Request, response: httpx.Response) -> int:
+        """Tokens consommés d'après l'usage renvoyé par l'API (0 si inconnu, ex: réponse en streaming)."""
+        if response.status_code != 200 or b'"stream":true' in request.content.replace(b" ", b""):
+            return 0
+        try:
+            response.read()
+            return int(json.loads(response.content).get("usage", {}).get("total_tokens", 0))
+        except (ValueError, AttributeError, TypeError):
+            return 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Retourne les compteurs de requêtes et l'état du pool de connexions."""
+        connections = list(self._pool.connections)
+        with self._stats_lock:
+            requests, opened = self.requests, self.connections_opened
+        reused = max(requests - opened, 0)
+        return {
+            "requests": requests,
+            "connections_opened": opened,
+            "connections_reused": reused,
+            "reuse_rate": round(reused / requests, 3) if requests else 0.0,
+            "pool_size": len(connections),
+            "idle_connections": sum(1 for connection in connections if connection.is_idle())
+        }
+
+
+ClientKey = Tuple[str, float, str]
+
+
+class LLMClientRegistry:
+    """
+    Registre des modèles de chat, indexés par (modèle, température, URL de base),
+    partageant un même client HTTP.
+    """
+
+    def __init__(self,
+                 max_connections: Optional[int] = None,
+                 max_keepalive_connections: Optional[int] = None,
+                 timeout: Optional[float] = None):
+        """
+        Initialise le registre (le client HTTP est créé au premier modèle demandé).
+
+        Args:
+            max_connections: Taille maximale du pool de connexions
+                (utilise config.LLM_HTTP_MAX_CONNECTIONS si None)
+            max_keepalive_connections: Connexions inactives conservées ouvertes
+                (utilise config.LLM_HTTP_KEEPALIVE_CONNECTIONS si None)
+            timeout: Délai maximum d'une requête en secondes
+                (utilise config.TIMEOUT_SECONDS si None)
+        """
+        self.max_connections = max_connections or config.LLM_HTTP_MAX_CONNECTIONS
+        self.max_keepalive_connections = max_keepalive_connections or config.LLM_HTTP_KEEPALIVE_CONNECTIONS
+        self.timeout = timeout or config.TIMEOUT_SECONDS
+
+        self._lock = threading.Lock()
+        self._clients: Dict[ClientKey, ChatOpenAI] = {}
+        self._transport: Optional[InstrumentedTransport] = None
+        self._http_client: Optional[httpx.Client] = None
+        self.created = 0
+        self.reused = 0
+
+    def _get_http_client(self) -> httpx.Client:
+        """Crée le client HTTP partagé au premier appel (à appeler sous le verrou)."""
+        if self._http_client is None:
+            verify = (config.SSL_CERT_PATH or True) if config.VERIFY_SSL else False
+            self._transport = InstrumentedTransport(
+                rate_limiter=get_llm_rate_limiter(),
+                verify=verify,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections
+                )
+            )
+            self._http_client = httpx.Client(transport=self._transport, timeout=self.timeout)
+        return self._http_client
+
+    def get(self,
+            model: Optional[str] = None,
+            temperature: Optional[float] = None,
+            base_url: Optional[str] = None) -> ChatOpenAI:
+        """
+        Retourne le modèle de chat partagé pour cette configuration, en le créant si besoin.
+
+        Args:
+            model: Nom du modèle (utilise config.DEFAULT_MODEL si None)
+            temperature: Température (utilise config.DEFAULT_TEMPERATURE si None)
+            base_url: URL de base de l'API (utilise config.OPENAI_API_BASE si None)
+
+        Returns:
+            Instance de ChatOpenAI partagée
+        """
+        key = (
+            model or config.DEFAULT_MODEL,
+            config.DEFAULT_TEMPERATURE if temperature is None else temperature,
+            base_url or config.OPENAI_API_BASE
+        )
+
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self.reused += 1
+                return client
+
+            client = ChatOpenAI(
+                model=key[0],
+                temperature=key[1],
+                max_tokens=config.MAX_TOKENS,
+                timeout=self.timeout,
+                # Les nouvelles tentatives sont gérées par RetryPolicy (src/retry.py)
+                max_retries=0,
+                openai_api_key=config.OPENAI_API_KEY,
+                openai_api_base=key[2],
+                http_client=self._get_http_client(),
+                cache=get_llm_cache()
+            )
+            self._clients[key] = client
+            self.created += 1
+            return client
+
+    def owns(self, llm: Any) -> bool:
+        """Indique si le modèle a été créé par le registre."""
+        with self._lock:
+            return any(client is llm for client in self._clients.values())
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retourne les statistiques du registre et du pool de connexions HTTP.
+
+        Returns:
+            Dictionnaire avec le nombre de clients, leur réutilisation et l'état du pool
+        """
+        with self._lock:
+            stats = {
+                "clients": [
+                    {"model": model, "temperature": temperature, "base_url": base_url}
+                    for model, temperature, base_url in self._clients
+                ],
+                "clients_created": self.created,
+                "clients_reused": self.reused,
+                "max_connections": self.max_connections,
+                "max_keepalive_connections": self.max_keepalive_connections
+            }
+            transport = self._transport
+
+        if transport is not None:
+            stats.update(transport.stats())
+        return stats
+
+    def close(self) -> None:
+        """Ferme le client HTTP partagé et oublie les modèles créés."""
+        with self._lock:
+            if self._http_client is not None:
+                self._http_client.close()
+            self._clients.clear()
+            self._http_client = None
+            self._transport = None
+
+
+_registry: Optional[LLMClientRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_llm_client_registry() -> LLMClientRegistry:
+    """Retourne le registre partagé du processus."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = LLMClientRegistry()
+        return _registry
+
+
+def get_llm_client(model: Optional[str] = None,
+                   temperature: Optional[float] = None,
+                   base_url: Optional[str] = None) -> ChatOpenAI:
+    """
+    Retourne le modèle de chat partagé pour (modèle, température, URL de base).
+
+    Args:
+        model: Nom du modèle (utilise config.DEFAULT_MODEL si None)
+        temperature: Température (utilise config.DEFAULT_TEMPERATURE si None)
+        base_url: URL de base de l'API (utilise config.OPENAI_API_BASE si None)
+
+    Returns:
+        Instance de ChatOpenAI partagée
+    """
+    return get_llm_client_registry().get(model, temperature, base_url)
+
+
+def prepare_llm(llm: Any) -> Any:
+    """
+    Applique le limiteur de débit et le cache LLM partagés à un modèle fourni par
+    l'appelant.
+
+    Les modèles du registre les utilisent déjà et sont retournés tels quels, comme
+    les objets qui ne sont pas des modèles de chat LangChain (ex: modèles simulés).
+    Un `rate_limiter` ou un `cache` déjà définis sur le modèle sont conservés.
+
+    Args:
+        llm: Modèle de langage à utiliser
+
+    Returns:
+        Le même modèle
+    """
+    if not isinstance(llm, BaseChatModel) or get_llm_client_registry().owns(llm):
+        return llm
+
+    if llm.cache is None:
+        llm.cache = get_llm_cache()
+    if llm.rate_limiter is None:
+        rate_limiter = ChatModelRateLimiter(get_llm_rate_limiter())
+        llm.rate_limiter = rate_limiter
+        # Le callback estime les tokens de chaque appel pour `acquire`
+        if llm.callbacks is None or isinstance(llm.callbacks, list):
+            llm.callbacks = [*(llm.callbacks or []), rate_limiter]
+        else:
+            llm.callbacks.add_handler(rate_limiter)
+    return llm
+
+
+def get_llm_client_stats() -> Dict[str, Any]:
+    """Retourne les statistiques du registre partagé (sans le créer s'il n'existe pas)."""
+    if _registry is None:
+        return {"clients": [], "clients_created": 0, "clients_reused": 0}
+    return _registry.stats()
+
+
+def close_llm_clients() -> None:
+    """Ferme le client HTTP du registre partagé s'il a été créé."""
+    if _registry is not None:
+        _registry.close()
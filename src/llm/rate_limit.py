@@ -0,0 +1,250 @@
+"""
+Limiteur de débit partagé des appels LLM (requêtes et tokens par minute).
+
+Toutes les requêtes des modèles du registre (`clients.py`) passent par le même
+limiteur: un seau de requêtes par minute (RPM) et un seau de tokens par minute
+(TPM). Une requête qui dépasserait la limite attend que le seau se remplisse au
+lieu d'échouer avec une erreur 429 du fournisseur.
+
+Les tokens d'une requête sont estimés avant l'envoi (taille du prompt + `max_tokens`
+demandés), puis corrigés avec l'usage réel renvoyé par l'API.
+
+Les modèles fournis par l'appelant (paramètre `llm=`) ne passent pas par le
+transport du registre: `ChatModelRateLimiter` branche le même limiteur sur le
+mécanisme `rate_limiter` de LangChain (voir `clients.prepare_llm`).
+"""
+
+import asyncio
+import json
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from langchain_core.rate_limiters import BaseRateLimiter
+
+from ..concurrency import TokenBucket
+from ..config import config
+
+# Caractères par token pour l'estimation de la taille du prompt
+CHARS_PER_TOKEN = 4
+
+
+def estimate_request_tokens(body: bytes) -> int:
+    """
+    Estime les tokens consommés par une requête de chat: taille du prompt plus
+    le nombre maximum de tokens de réponse demandé.
+
+    Args:
+        body: Corps JSON de la requête
+
+    Returns:
+        Nombre de tokens estimé
+    """
+    try:
+        payload = json.loads(body or b"{}")
+    except ValueError:
+        return len(body) // CHARS_PER_TOKEN
+
+    prompt_chars = sum(len(str(message.get("content", ""))) for message in payload.get("messages", []))
+    completion_tokens = payload.get("max_completion_tokens") or payload.get("max_tokens") or 0
+    return prompt_chars // CHARS_PER_TOKEN + int(completion_tokens)
+
+
+class LLMRateLimiter:
+    """
+    Limiteur RPM / TPM avec mise en file des requêtes et métriques de temps d'attente.
+    """
+
+    def __init__(self,
+                 requests_per_minute: Optional[int] = None,
+                 tokens_per_minute: Optional[int] = None):
+        """
+        Initialise le limiteur.
+
+        Args:
+            requests_per_minute: Requêtes par minute (utilise config.LLM_RATE_LIMIT_RPM
+                si None, 0 = illimité)
+            tokens_per_minute: Tokens par minute (utilise config.LLM_RATE_LIMIT_TPM
+                si None, 0 = illimité)
+        """
+        self.requests_per_minute = (
+            config.LLM_RATE_LIMIT_RPM if requests_per_minute is None else requests_per_minute
+        )
+        self.tokens_per_minute = (
+            config.LLM_RATE_LIMIT_TPM if tokens_per_minute is None else tokens_per_minute
+        )
+        self._request_bucket = TokenBucket(self.requests_per_minute) if self.requests_per_minute else None
+        self._token_bucket = TokenBucket(self.tokens_per_minute) if self.tokens_per_minute else None
+
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.delayed_requests = 0
+        self.waiting = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.estimated_tokens = 0
+        self.used_tokens = 0
+
+    def acquire(self, estimated_tokens: int = 0) -> float:
+        """
+        Attend que la requête puisse être envoyée sans dépasser les limites.
+
+        Args:
+            estimated_tokens: Tokens réservés pour la requête
+
+        Returns:
+            Temps d'attente en secondes
+        """
+        with self._lock:
+            self.waiting += 1
+
+        waited = 0.0
+        try:
+            if self._request_bucket is not None:
+                waited += self._request_bucket.acquire(1)
+            if self._token_bucket is not None and estimated_tokens > 0:
+                waited += self._token_bucket.acquire(estimated_tokens)
+        finally:
+            with self._lock:
+                self.waiting -= 1
+                self.requests += 1
+                self.estimated_tokens += estimated_tokens
+                self.total_wait_seconds += waited
+                self.max_wait_seconds = max(self.max_wait_seconds, waited)
+                if waited > 0.001:
+                    self.delayed_requests += 1
+        return waited
+
+    def record_usage(self, estimated_tokens: int, used_tokens: int) -> None:
+        """
+        Corrige la réservation d'une requête avec les tokens réellement consommés.
+
+        Args:
+            estimated_tokens: Tokens réservés par `acquire`
+            used_tokens: Tokens réellement consommés (usage renvoyé par l'API)
+        """
+        with self._lock:
+            self.used_tokens += used_tokens
+        if self._token_bucket is not None:
+            self._token_bucket.adjust(used_tokens - min(estimated_tokens, self._token_bucket.capacity))
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retourne les limites et les métriques de temps d'attente.
+
+        Returns:
+            Dictionnaire avec les limites, les requêtes retardées et les temps d'attente
+        """
+        with self._lock:
+            return {
+                "requests_per_minute": self.requests_per_minute,
+                "tokens_per_minute": self.tokens_per_minute,
+                "requests": self.requests,
+                "delayed_requests": self.delayed_requests,
+                "waiting": self.waiting,
+                "total_wait_seconds": round(self.total_wait_seconds, 3),
+                "avg_wait_seconds": round(self.total_wait_seconds / self.requests, 3) if self.requests else 0.0,
+                "max_wait_seconds": round(self.max_wait_seconds, 3),
+                "estimated_tokens": self.estimated_tokens,
+                "used_tokens": self.used_tokens
+            }
+
+
+class ChatModelRateLimiter(BaseRateLimiter, BaseCallbackHandler):
+    """
+    Applique un LLMRateLimiter à un modèle de chat LangChain quelconque.
+    
+    LangChain appelle `acquire` après la consultation du cache (une réponse en cache
+    ne consomme rien), sans indiquer la taille de la requête: le callback de début
+    d'appel estime ses tokens, réservés par `acquire` dans le même thread, puis le
+    callback de fin corrige la réservation avec l'usage renvoyé par l'API.
+    """
+
+    # Appelé dans le thread de l'appel LLM (l'estimation y est mémorisée)
+    run_inline = True
+
+    def __init__(self, limiter: LLMRateLimiter):
+        """
+        Initialise l'adaptateur.
+
+        Args:
+            limiter: Limiteur partagé appliqué aux appels du modèle
+        """
+        self.limiter = limiter
+        self._pending = threading.local()
+        self._lock = threading.Lock()
+        self._reserved: Dict[UUID, int] = {}
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: List[List[Any]], *,
+                            run_id: UUID, **kwargs: Any) -> None:
+        prompt_chars = sum(len(str(message.content)) for batch in messages for message in batch)
+        params = kwargs.get("invocation_params") or {}
+        completion_tokens = params.get("max_completion_tokens") or params.get("max_tokens") or 0
+        self._pending.run_id = run_id
+        self._pending.tokens = prompt_chars // CHARS_PER_TOKEN + int(completion_tokens)
+
+    def _take_pending(self) -> Tuple[Optional[UUID], int]:
+        """Retourne (et oublie) l'appel en cours du thread et ses tokens estimés."""
+        run_id = getattr(self._pending, "run_id", None)
+        tokens = getattr(self._pending, "tokens", 0)
+        self._pending.run_id, self._pending.tokens = None, 0
+        return run_id, tokens
+
+    def _reserve(self, run_id: Optional[UUID], tokens: int) -> None:
+        if run_id is not None:
+            with self._lock:
+                self._reserved[run_id] = tokens
+
+    def acquire(self, *, blocking: bool = True) -> bool:
+        run_id, tokens = self._take_pending()
+        self.limiter.acquire(tokens)
+        self._reserve(run_id, tokens)
+        return True
+
+    async def aacquire(self, *, blocking: bool = True) -> bool:
+        run_id, tokens = self._take_pending()
+        await asyncio.to_thread(self.limiter.acquire, tokens)
+        self._reserve(run_id, tokens)
+        return True
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            reserved = self._reserved.pop(run_id, None)
+        if reserved is None:
+            # Réponse servie par le cache: aucune requête envoyée
+            return
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        used_tokens = int(usage.get("total_tokens") or 0)
+        # Usage inconnu (modèle sans compteur, streaming): l'estimation est conservée
+        if used_tokens:
+            self.limiter.record_usage(reserved, used_tokens)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            self._reserved.pop(run_id, None)
+
+
+_rate_limiter: Optional[LLMRateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_llm_rate_limiter() -> LLMRateLimiter:
+    """Retourne le limiteur partagé du processus."""
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = LLMRateLimiter()
+        return _rate_limiter
+
+
+def get_llm_rate_limit_stats() -> Dict[str, Any]:
+    """Retourne les métriques du limiteur partagé (sans le créer s'il n'existe pas)."""
+    if _rate_limiter is None:
+        return {
+            "requests_per_minute": config.LLM_RATE_LIMIT_RPM,
+            "tokens_per_minute": config.LLM_RATE_LIMIT_TPM,
+            "requests": 0
+        }
+    return _rate_limiter.stats()
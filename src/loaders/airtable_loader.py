@@ -1,16 +1,37 @@
 """
 Module pour récupérer des articles depuis Airtable
+
+La synchronisation est incrémentale: un état persisté dans le dossier data
+(`.airtable_sync_state.json`) mémorise le curseur de la dernière synchronisation
+et le fichier de chaque article. Les synchronisations suivantes ne demandent à
+Airtable que les enregistrements modifiés depuis ce curseur (formule sur
+`LAST_MODIFIED_TIME()`), et les articles supprimés sont détectés en comparant
+périodiquement les identifiants des enregistrements.
 """
 
+import hashlib
+import json
 import os
-from datetime import datetime
+import tempfile
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Set, Tuple
 from pyairtable import Api
 import logging
 
+from ..config import config
+
 logger = logging.getLogger(__name__)
 
+# Fichier d'état de la synchronisation incrémentale (dans le dossier data)
+SYNC_STATE_FILENAME = ".airtable_sync_state.json"
+
+# Champ léger demandé lors de la liste des identifiants (détection des suppressions)
+ID_SCAN_FIELD = "Date_article"
+
+# Enregistrements synchronisés: ceux dont le champ Support_cours est renseigné
+HAS_CONTENT_FORMULA = "NOT({Support_cours} = '')"
+
 class AirtableArticleManager:
     """
     Gestionnaire pour récupérer et sauvegarder des articles depuis Airtable
@@ -41,6 +62,39 @@ class AirtableArticleManager:
         
         logger.info(f"AirtableArticleManager initialisé pour la table '{self.table_name}'")
     
+    def _fetch(self, formula: Optional[str] = None) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """
+        Récupère les enregistrements correspondant à une formule (tous si None)
+
+        Returns:
+            Tuple (articles avec leurs métadonnées, identifiants des enregistrements
+            ignorés faute de contenu Support_cours)
+        """
+        records = self.table.all(formula=formula) if formula else self.table.all()
+
+        articles = []
+        skipped_ids = []
+        for record in records:
+            fields = record.get('fields', {})
+
+            # Extraire les champs nécessaires
+            article_data = {
+                'id': record.get('id'),
+                'date_article': fields.get('Date_article'),
+                'support_cours': fields.get('Support_cours'),
+                'created_time': record.get('createdTime'),
+                'raw_record': record
+            }
+
+            # Valider que les champs obligatoires sont présents
+            if article_data['support_cours']:
+                articles.append(article_data)
+            else:
+                skipped_ids.append(article_data['id'])
+                logger.warning(f"Article {article_data['id']} ignoré: pas de contenu Support_cours")
+
+        return articles, skipped_ids
+
     def fetch_articles(self) -> List[Dict[str, Any]]:
         """
         Récupère tous les articles depuis Airtable
@@ -50,149 +104,361 @@ class AirtableArticleManager:
         """
         try:
             logger.info("Récupération des articles depuis Airtable...")
-            
-            # Récupérer tous les enregistrements
-            records = self.table.all()
-            
-            articles = []
-            for record in records:
-                fields = record.get('fields', {})
-                
-                # Extraire les champs nécessaires
-                article_data = {
-                    'id': record.get('id'),
-                    'date_article': fields.get('Date_article'),
-                    'support_cours': fields.get('Support_cours'),
-                    'created_time': record.get('createdTime'),
-                    'raw_record': record
-                }
-                
-                # Valider que les champs obligatoires sont présents
-                if article_data['support_cours']:
-                    articles.append(article_data)
-                else:
-                    logger.warning(f"Article {article_data['id']} ignoré: pas de contenu Support_cours")
-            
+            articles, _ = self._fetch()
             logger.info(f"✅ {len(articles)} articles récupérés depuis Airtable")
             return articles
             
         except Exception as e:
             logger.error(f"❌ Erreur lors de la récupération des articles Airtable: {e}")
             raise
-    
-    def save_articles_to_data_folder(self, articles: List[Dict[str, Any]], data_folder: str = "data") -> List[str]:
+
+    def fetch_modified_articles(self, since: datetime) -> Tuple[List[Dict[str, Any]], List[str]]:
         """
-        Sauvegarde les articles dans le dossier data
+        Récupère les articles créés ou modifiés depuis une date
         
         Args:
-            articles: Liste des articles à sauvegarder
-            data_folder: Dossier de destination
+            since: Date (UTC) à partir de laquelle les modifications sont récupérées
             
         Returns:
-            Liste des chemins des fichiers créés
+            Tuple (articles modifiés, identifiants des enregistrements modifiés
+            dont le contenu Support_cours a été vidé)
         """
-        data_path = Path(data_folder)
-        data_path.mkdir(exist_ok=True)
+        cursor = since.astimezone(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+        formula = f"IS_AFTER(LAST_MODIFIED_TIME(), DATETIME_PARSE('{cursor}'))"
+        logger.info(f"Récupération des articles modifiés depuis {cursor}...")
+        articles, skipped_ids = self._fetch(formula)
+        logger.info(f"✅ {len(articles)} articles modifiés récupérés depuis Airtable")
+        return articles, skipped_ids
+
+    def fetch_article_ids(self) -> Set[str]:
+        """
+        Liste les identifiants des articles ayant un contenu, sans télécharger ce
+        contenu (un seul champ léger est demandé)
         
-        saved_files = []
+        Returns:
+            Ensemble des identifiants des enregistrements
+        """
+        records = self.table.all(formula=HAS_CONTENT_FORMULA, fields=[ID_SCAN_FIELD])
+        return {record['id'] for record in records}
+
+    @staticmethod
+    def article_filename(article: Dict[str, Any]) -> str:
+        """
+        Nom du fichier d'un article : date_id.md
         
-        for article in articles:
+        Args:
+            article: Article récupéré depuis Airtable
+            
+        Returns:
+            Nom du fichier
+        """
+        article_id = article['id']
+        date_article = article.get('date_article')
+        
+        # À défaut de date valide, date de création de l'enregistrement (stable d'une
+        # synchronisation à l'autre, contrairement à la date du jour)
+        created_date = (article.get('created_time') or '')[:10].replace('-', '')
+        fallback_date = created_date if len(created_date) == 8 and created_date.isdigit() else datetime.now().strftime('%Y%m%d')
+        
+        # Format du nom de fichier
+        if date_article:
+            # Parser la date si elle existe
             try:
-                # Générer le nom de fichier : date_id.md
-                article_id = article['id']
-                date_article = article.get('date_article')
-                
-                # Format du nom de fichier
-                if date_article:
-                    # Parser la date si elle existe
-                    try:
-                        if isinstance(date_article, str):
-                            # Essayer différents formats de date
-                            date_formats = ['%Y-%m-%d', '%Y-%m-%dT%H:%M:%S.%fZ', '%Y-%m-%d %H:%M:%S']
-                            parsed_date = None
-                            for fmt in date_formats:
-                                try:
-                                    parsed_date = datetime.strptime(date_article.split('T')[0], '%Y-%m-%d')
-                                    break
-                                except:
-                                    continue
-                            
-                            if parsed_date:
-                                date_str = parsed_date.strftime('%Y%m%d')
-                            else:
-                                date_str = date_article.replace('-', '').replace(':', '').replace(' ', '')[:8]
-                        else:
-                            date_str = datetime.now().strftime('%Y%m%d')
-                    except:
-                        date_str = datetime.now().strftime('%Y%m%d')
+                if isinstance(date_article, str):
+                    # Essayer différents formats de date
+                    date_formats = ['%Y-%m-%d', '%Y-%m-%dT%H:%M:%S.%fZ', '%Y-%m-%d %H:%M:%S']
+                    parsed_date = None
+                    for fmt in date_formats:
+                        try:
+                            parsed_date = datetime.strptime(date_article.split('T')[0], '%Y-%m-%d')
+                            break
+                        except:
+                            continue
+                    
+                    if parsed_date:
+                        date_str = parsed_date.strftime('%Y%m%d')
+                    else:
+                        date_str = date_article.replace('-', '').replace(':', '').replace(' ', '')[:8]
                 else:
-                    date_str = datetime.now().strftime('%Y%m%d')
-                
-                # Créer le nom de fichier
-                filename = f"{date_str}_{article_id}.md"
-                file_path = data_path / filename
-                
-                # Sauvegarder le contenu
-                content = article['support_cours']
-                
-                # Ajouter des métadonnées en en-tête
-                metadata_header = f"""# Article Airtable - {filename}
+                    date_str = fallback_date
+            except:
+                date_str = fallback_date
+        else:
+            date_str = fallback_date
+        
+        # Créer le nom de fichier
+        return f"{date_str}_{article_id}.md"
 
-**Date de l'article:** {date_article or 'Non spécifiée'}
-**ID Airtable:** {article_id}
-**Récupéré le:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+    def build_article_content(self, article: Dict[str, Any]) -> str:
+        """
+        Contenu du fichier d'un article: en-tête de métadonnées puis Support_cours
+        
+        L'en-tête ne dépend que de l'enregistrement (pas de la date de
+        synchronisation): un article inchangé produit un fichier identique.
+        
+        Args:
+            article: Article récupéré depuis Airtable
+            
+        Returns:
+            Contenu markdown du fichier
+        """
+        metadata_header = f"""# Article Airtable - {self.article_filename(article)}
+
+**Date de l'article:** {article.get('date_article') or 'Non spécifiée'}
+**ID Airtable:** {article['id']}
+**Créé le:** {article.get('created_time') or 'Non spécifié'}
 
 ---
 
 """
-                
-                full_content = metadata_header + content
-                
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(full_content)
-                
-                saved_files.append(str(file_path))
-                logger.info(f"📄 Article sauvé: {filename}")
+        return metadata_header + article['support_cours']
+
+    @staticmethod
+    def write_if_changed(file_path: Path, content: str) -> str:
+        """
+        Écrit un fichier seulement si son contenu change, atomiquement (fichier
+        temporaire dans le même dossier puis renommage): un lecteur concurrent voit
+        l'ancienne ou la nouvelle version, jamais un fichier partiellement écrit.
+        
+        Args:
+            file_path: Chemin du fichier
+            content: Contenu à écrire
+            
+        Returns:
+            "created", "updated" ou "unchanged"
+        """
+        data = content.encode('utf-8')
+        status = "created"
+        if file_path.exists():
+            with open(file_path, 'rb') as f:
+                existing_hash = hashlib.sha256(f.read()).hexdigest()
+            if existing_hash == hashlib.sha256(data).hexdigest():
+                return "unchanged"
+            status = "updated"
+
+        fd, tmp_path = tempfile.mkstemp(dir=str(file_path.parent), prefix=".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, file_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        return status
+
+    def materialize_articles(self, articles: List[Dict[str, Any]], data_folder: str = "data") -> Dict[str, List[str]]:
+        """
+        Écrit les fichiers des articles nouveaux ou modifiés dans le dossier data
+        
+        Args:
+            articles: Liste des articles à sauvegarder
+            data_folder: Dossier de destination
+            
+        Returns:
+            Chemins des fichiers par statut: "created", "updated", "unchanged"
+        """
+        data_path = Path(data_folder)
+        data_path.mkdir(exist_ok=True)
+        
+        results: Dict[str, List[str]] = {"created": [], "updated": [], "unchanged": []}
+        
+        for article in articles:
+            try:
+                filename = self.article_filename(article)
+                file_path = data_path / filename
+                status = self.write_if_changed(file_path, self.build_article_content(article))
+                results[status].append(str(file_path))
+                if status != "unchanged":
+                    logger.info(f"📄 Article sauvé: {filename}")
                 
             except Exception as e:
                 logger.error(f"❌ Erreur sauvegarde article {article.get('id', 'unknown')}: {e}")
                 continue
         
-        logger.info(f"✅ {len(saved_files)} articles sauvés dans {data_folder}/")
-        return saved_files
+        logger.info(
+            f"✅ Articles dans {data_folder}/: {len(results['created'])} créés, "
+            f"{len(results['updated'])} mis à jour, {len(results['unchanged'])} inchangés"
+        )
+        return results
+
+    def save_articles_to_data_folder(self, articles: List[Dict[str, Any]], data_folder: str = "data") -> List[str]:
+        """
+        Sauvegarde les articles dans le dossier data
+        
+        Args:
+            articles: Liste des articles à sauvegarder
+            data_folder: Dossier de destination
+            
+        Returns:
+            Liste des chemins des fichiers sauvegardés (écrits ou déjà à jour)
+        """
+        results = self.materialize_articles(articles, data_folder)
+        return results["created"] + results["updated"] + results["unchanged"]
     
-    def sync_articles(self, data_folder: str = "data") -> Dict[str, Any]:
+    def _state_path(self, data_folder: str) -> Path:
+        """Chemin du fichier d'état de la synchronisation incrémentale."""
+        return Path(data_folder) / SYNC_STATE_FILENAME
+
+    def load_sync_state(self, data_folder: str = "data") -> Optional[Dict[str, Any]]:
         """
-        Synchronise complètement les articles: récupère depuis Airtable et sauvegarde
+        Charge l'état de la dernière synchronisation du dossier
         
         Args:
             data_folder: Dossier de destination
             
+        Returns:
+            État (curseur, fichiers par article...), ou None s'il n'existe pas, est
+            illisible ou concerne une autre base ou table
+        """
+        path = self._state_path(data_folder)
+        if not path.exists():
+            return None
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ État de synchronisation illisible, synchronisation complète: {e}")
+            return None
+
+        if state.get("base_id") != self.base_id or state.get("table_name") != self.table_name:
+            logger.info("ℹ️ État de synchronisation d'une autre base ou table, synchronisation complète")
+            return None
+        return state
+
+    def save_sync_state(self, state: Dict[str, Any], data_folder: str = "data") -> None:
+        """Sauvegarde atomiquement l'état de synchronisation (fichier temporaire puis renommage)."""
+        path = self._state_path(data_folder)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(state, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def _deletion_check_due(self, state: Dict[str, Any], now: datetime) -> bool:
+        """Indique si les identifiants doivent être comparés pour détecter les suppressions."""
+        interval = config.AIRTABLE_DELETION_CHECK_INTERVAL_SECONDS
+        last_check = state.get("last_deletion_check")
+        if interval <= 0 or not last_check:
+            return True
+        return (now - datetime.fromisoformat(last_check)).total_seconds() >= interval
+
+    def sync_articles(self, data_folder: str = "data", full: bool = False) -> Dict[str, Any]:
+        """
+        Synchronise les articles: récupère depuis Airtable et sauvegarde
+        
+        Si un état de synchronisation existe (et que config.AIRTABLE_INCREMENTAL_SYNC
+        est activé), seuls les articles modifiés depuis la dernière synchronisation
+        sont récupérés. Les fichiers des articles supprimés d'Airtable (ou dont le
+        contenu a été vidé) sont supprimés du dossier.
+        
+        Args:
+            data_folder: Dossier de destination
+            full: Forcer une synchronisation complète
+            
         Returns:
             Résultats de la synchronisation
         """
         try:
             start_time = datetime.now()
+            sync_started = datetime.now(timezone.utc)
+
+            state = None
+            if config.AIRTABLE_INCREMENTAL_SYNC and not full:
+                state = self.load_sync_state(data_folder)
+
+            known_files: Dict[str, str] = dict(state.get("records", {})) if state else {}
+            incremental = bool(state and state.get("cursor"))
             
-            # Récupérer les articles
-            articles = self.fetch_articles()
+            if incremental:
+                # Marge de recouvrement pour les écarts d'horloge et les modifications en cours
+                since = datetime.fromisoformat(state["cursor"]) - timedelta(
+                    seconds=config.AIRTABLE_SYNC_OVERLAP_SECONDS
+                )
+                articles, emptied_ids = self.fetch_modified_articles(since)
+                removed_ids = set(emptied_ids)
+                if self._deletion_check_due(state, sync_started):
+                    current_ids = self.fetch_article_ids()
+                    removed_ids |= set(known_files) - current_ids
+                    last_deletion_check = sync_started.isoformat()
+                else:
+                    last_deletion_check = state.get("last_deletion_check")
+            else:
+                articles = self.fetch_articles()
+                removed_ids = set(known_files) - {article['id'] for article in articles}
+                last_deletion_check = sync_started.isoformat()
             
-            # Sauvegarder les articles
-            saved_files = self.save_articles_to_data_folder(articles, data_folder)
+            # Sauvegarder les articles nouveaux ou modifiés
+            written = self.materialize_articles(articles, data_folder)
+            saved_files = written["created"] + written["updated"]
+            saved_names = {Path(file_path).name for file_path in saved_files + written["unchanged"]}
+
+            # Fichiers obsolètes: articles supprimés ou renommés (date modifiée)
+            stale_files = []
+            for article in articles:
+                filename = self.article_filename(article)
+                if filename not in saved_names:
+                    continue
+                previous = known_files.get(article['id'])
+                if previous and previous != filename:
+                    stale_files.append(previous)
+                known_files[article['id']] = filename
+            for article_id in removed_ids:
+                filename = known_files.pop(article_id, None)
+                if filename:
+                    stale_files.append(filename)
+
+            deleted_files = []
+            for filename in stale_files:
+                file_path = Path(data_folder) / filename
+                if file_path.exists():
+                    file_path.unlink()
+                    deleted_files.append(str(file_path))
+                    logger.info(f"🗑️ Article supprimé: {filename}")
+
+            # Un article non sauvegardé sera récupéré à nouveau: le curseur n'avance pas
+            cursor = sync_started.isoformat()
+            if len(saved_names) < len(articles):
+                cursor = state.get("cursor") if state else None
+
+            self.save_sync_state({
+                "base_id": self.base_id,
+                "table_name": self.table_name,
+                "cursor": cursor,
+                "last_deletion_check": last_deletion_check,
+                "records": known_files
+            }, data_folder)
             
             end_time = datetime.now()
             duration = (end_time - start_time).total_seconds()
+            mode = "incremental" if incremental else "full"
             
             sync_result = {
                 "success": True,
+                "mode": mode,
                 "articles_count": len(articles),
-                "files_created": len(saved_files),
+                "files_created": len(written["created"]),
+                "files_updated": len(written["updated"]),
+                "files_unchanged": len(written["unchanged"]),
                 "saved_files": saved_files,
+                "articles_deleted": len(removed_ids),
+                "deleted_files": deleted_files,
+                "total_articles": len(known_files),
                 "duration_seconds": duration,
                 "sync_time": end_time.isoformat()
             }
             
-            logger.info(f"🔄 Synchronisation terminée: {len(articles)} articles en {duration:.2f}s")
+            logger.info(
+                f"🔄 Synchronisation {mode} terminée: {len(articles)} articles modifiés, "
+                f"{len(removed_ids)} supprimés en {duration:.2f}s"
+            )
             return sync_result
             
         except Exception as e:
@@ -202,6 +468,8 @@ class AirtableArticleManager:
                 "error": str(e),
                 "articles_count": 0,
                 "files_created": 0,
+                "files_updated": 0,
+                "files_unchanged": 0,
                 "saved_files": [],
                 "sync_time": datetime.now().isoformat()
             }
@@ -231,6 +499,11 @@ class AirtableArticleManager:
                 file_path.unlink()
                 removed_count += 1
         
+        # Les articles supprimés devront être récupérés à nouveau: synchronisation complète
+        state_path = self._state_path(data_folder)
+        if state_path.exists():
+            state_path.unlink()
+        
         if removed_count > 0:
             logger.info(f"🧹 {removed_count} anciens articles supprimés du dossier {data_folder}/")
 
@@ -1,13 +1,24 @@
 """
 Loader pour les fichiers markdown contenant des résumés d'articles scientifiques.
+
+Deux modes de chargement sont disponibles:
+- "unstructured" (par défaut): analyse via UnstructuredMarkdownLoader (dépendance
+  `unstructured`, importée uniquement dans ce mode);
+- "native" (sur option): lecture directe du fichier, beaucoup plus rapide. Le texte
+  markdown (titres compris) est conservé tel quel: le contenu transmis au LLM
+  diffère donc de celui du mode unstructured.
 """
 
 import os
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-from langchain_community.document_loaders import UnstructuredMarkdownLoader
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from langchain_core.documents import Document
 
+from ..config import config
+from ..concurrency import iter_bounded, run_bounded
+
+LOADER_MODES = ("native", "unstructured")
+
 
 class MarkdownLoader:
     """
@@ -15,14 +26,63 @@ class MarkdownLoader:
     contenant des résumés d'articles scientifiques.
     """
     
-    def __init__(self, encoding: str = "utf-8"):
+    def __init__(self, encoding: str = "utf-8", mode: Optional[str] = None):
         """
         Initialise le loader markdown.
         
         Args:
             encoding: Encodage des fichiers (par défaut utf-8)
+            mode: "native" ou "unstructured" (utilise config.MARKDOWN_LOADER_MODE si None)
         """
         self.encoding = encoding
+        self.mode = (mode or config.MARKDOWN_LOADER_MODE).lower()
+        
+        if self.mode not in LOADER_MODES:
+            raise ValueError(f"Mode de chargement markdown inconnu: {self.mode} (attendu: {', '.join(LOADER_MODES)})")
+    
+    def read_raw(self, file_path: str) -> str:
+        """
+        Lit le texte markdown brut d'un fichier, quel que soit le mode de chargement.
+        
+        Le mode unstructured retire les titres `#` et les séparateurs `---`: les
+        traitements qui s'appuient sur la structure du document (découpage en
+        sections) relisent le fichier avec cette méthode.
+        
+        Args:
+            file_path: Chemin vers le fichier markdown
+            
+        Returns:
+            Contenu du fichier, sans BOM ni espaces de début et de fin
+        """
+        with open(file_path, 'r', encoding=self.encoding, newline=None) as f:
+            content = f.read()
+        
+        # Suppression d'un éventuel BOM UTF-8
+        return content.lstrip("\ufeff").strip()
+    
+    def _load_native(self, path: Path) -> Document:
+        """Lit directement le fichier et conserve le markdown brut (titres, listes...)."""
+        content = self.read_raw(str(path))
+        if not content:
+            raise ValueError(f"Impossible de charger le contenu de {path}")
+        
+        return Document(page_content=content, metadata={"source": str(path)})
+    
+    def _load_unstructured(self, path: Path) -> Document:
+        """Charge le fichier via UnstructuredMarkdownLoader (import paresseux de `unstructured`)."""
+        from langchain_community.document_loaders import UnstructuredMarkdownLoader
+        
+        loader = UnstructuredMarkdownLoader(
+            file_path=str(path),
+            encoding=self.encoding
+        )
+        
+        documents = loader.load()
+        
+        if not documents:
+            raise ValueError(f"Impossible de charger le contenu de {path}")
+        
+        return documents[0]
         
     def load_file(self, file_path: str) -> Document:
         """
@@ -46,19 +106,12 @@ class MarkdownLoader:
         if path.suffix.lower() not in ['.md', '.markdown']:
             raise ValueError(f"Le fichier {file_path} n'est pas un fichier markdown")
         
-        # Utilisation du loader LangChain pour markdown
-        loader = UnstructuredMarkdownLoader(
-            file_path=str(path),
-            encoding=self.encoding
-        )
-        
-        documents = loader.load()
-        
-        if not documents:
-            raise ValueError(f"Impossible de charger le contenu de {file_path}")
+        if self.mode == "unstructured":
+            document = self._load_unstructured(path)
+        else:
+            document = self._load_native(path)
             
         # Ajouter des métadonnées au document
-        document = documents[0]
         document.metadata.update({
             "source_file": str(path.absolute()),
             "file_name": path.name,
@@ -68,16 +121,79 @@ class MarkdownLoader:
         
         return document
     
+    def _find_files(self, directory_path: str, pattern: str, recursive: bool) -> Iterator[Path]:
+        """Valide le répertoire et retourne un itérateur paresseux sur ses fichiers."""
+        path = Path(directory_path)
+        
+        if not path.exists():
+            raise FileNotFoundError(f"Le répertoire {directory_path} n'existe pas")
+            
+        if not path.is_dir():
+            raise ValueError(f"{directory_path} n'est pas un répertoire")
+        
+        return path.rglob(pattern) if recursive else path.glob(pattern)
+    
+    def _report_failures(self, failed_files: List[Tuple[str, str]]) -> None:
+        if failed_files:
+            print(f"Attention: {len(failed_files)} fichiers n'ont pas pu être chargés:")
+            for file_path, error in failed_files:
+                print(f"  - {file_path}: {error}")
+    
+    def iter_directory(self, directory_path: str,
+                       pattern: str = "*.md",
+                       recursive: bool = True,
+                       max_workers: Optional[int] = None,
+                       failed_files: Optional[List[Tuple[str, str]]] = None) -> Iterator[Document]:
+        """
+        Charge les fichiers markdown d'un répertoire en parallèle et produit chaque
+        document dès qu'il est chargé (ordre de fin de chargement).
+        
+        Les fichiers sont découverts au fur et à mesure: le traitement des premiers
+        documents peut commencer avant la fin du parcours du répertoire.
+        
+        Args:
+            directory_path: Chemin vers le répertoire
+            pattern: Pattern pour filtrer les fichiers (par défaut *.md)
+            recursive: Si True, parcourt les sous-répertoires
+            max_workers: Nombre de fichiers chargés simultanément
+                (utilise config.LOADER_MAX_WORKERS si None)
+            failed_files: Liste complétée avec les (fichier, erreur) en échec
+            
+        Yields:
+            Documents LangChain
+            
+        Raises:
+            FileNotFoundError: Si le répertoire n'existe pas
+        """
+        files = self._find_files(directory_path, pattern, recursive)
+        failures = [] if failed_files is None else failed_files
+        
+        for file_path, document, error in iter_bounded(
+            lambda file_path: self.load_file(str(file_path)),
+            files,
+            max_workers or config.LOADER_MAX_WORKERS
+        ):
+            if error is not None:
+                failures.append((str(file_path), str(error)))
+            else:
+                yield document
+        
+        self._report_failures(failures)
+    
     def load_directory(self, directory_path: str, 
                       pattern: str = "*.md",
-                      recursive: bool = True) -> List[Document]:
+                      recursive: bool = True,
+                      max_workers: Optional[int] = None) -> List[Document]:
         """
-        Charge tous les fichiers markdown d'un répertoire.
+        Charge tous les fichiers markdown d'un répertoire (en parallèle, résultats
+        dans l'ordre de parcours du répertoire).
         
         Args:
             directory_path: Chemin vers le répertoire
             pattern: Pattern pour filtrer les fichiers (par défaut *.md)
             recursive: Si True, parcourt les sous-répertoires
+            max_workers: Nombre de fichiers chargés simultanément
+                (utilise config.LOADER_MAX_WORKERS si None)
             
         Returns:
             Liste des documents LangChain
@@ -85,34 +201,23 @@ class MarkdownLoader:
         Raises:
             FileNotFoundError: Si le répertoire n'existe pas
         """
-        path = Path(directory_path)
-        
-        if not path.exists():
-            raise FileNotFoundError(f"Le répertoire {directory_path} n'existe pas")
-            
-        if not path.is_dir():
-            raise ValueError(f"{directory_path} n'est pas un répertoire")
-        
-        # Recherche des fichiers markdown
-        if recursive:
-            markdown_files = list(path.rglob(pattern))
-        else:
-            markdown_files = list(path.glob(pattern))
+        markdown_files = list(self._find_files(directory_path, pattern, recursive))
+        outcomes = run_bounded(
+            lambda file_path: self.load_file(str(file_path)),
+            markdown_files,
+            max_workers or config.LOADER_MAX_WORKERS
+        )
         
         documents = []
         failed_files = []
         
-        for file_path in markdown_files:
-            try:
-                document = self.load_file(str(file_path))
+        for file_path, (document, error) in zip(markdown_files, outcomes):
+            if error is not None:
+                failed_files.append((str(file_path), str(error)))
+            else:
                 documents.append(document)
-            except Exception as e:
-                failed_files.append((str(file_path), str(e)))
         
-        if failed_files:
-            print(f"Attention: {len(failed_files)} fichiers n'ont pas pu être chargés:")
-            for file_path, error in failed_files:
-                print(f"  - {file_path}: {error}")
+        self._report_failures(failed_files)
         
         print(f"Chargement terminé: {len(documents)} fichiers traités avec succès")
         return documents
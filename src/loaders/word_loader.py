@@ -4,11 +4,14 @@ Loader pour charger et traiter des documents Word (.docx) avec LangChain.
 
 import os
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from langchain_core.documents import Document
 import docx
 import logging
 
+from ..config import config
+from ..concurrency import iter_bounded, run_bounded
+
 
 class WordLoader:
     """
@@ -24,6 +27,8 @@ class WordLoader:
         Args:
             extract_tables: Si True, extrait le contenu des tableaux
             preserve_formatting: Si True, tente de préserver la mise en forme basique
+                (titres convertis en titres markdown `#`, utilisés pour découper
+                les documents longs)
         """
         self.extract_tables = extract_tables
         self.preserve_formatting = preserve_formatting
@@ -97,47 +102,96 @@ class WordLoader:
             self.logger.error(f"Erreur lors du chargement du fichier Word {file_path}: {e}")
             raise Exception(f"Impossible de charger le fichier Word: {str(e)}")
     
+    def _find_files(self, directory_path: str, pattern: str, recursive: bool) -> Iterator[Path]:
+        """Valide le répertoire et retourne un itérateur paresseux sur ses fichiers."""
+        directory = Path(directory_path)
+        
+        if not directory.exists():
+            raise FileNotFoundError(f"Répertoire non trouvé: {directory_path}")
+        
+        return directory.rglob(pattern) if recursive else directory.glob(pattern)
+    
+    def _report_failures(self, failed_files: List[Tuple[str, str]]) -> None:
+        if failed_files:
+            print(f"\n⚠️  {len(failed_files)} fichiers ont échoué:")
+            for file_path, error in failed_files:
+                print(f"  - {Path(file_path).name}: {error}")
+    
+    def iter_directory(self, directory_path: str,
+                       pattern: str = "*.docx",
+                       recursive: bool = True,
+                       max_workers: Optional[int] = None,
+                       failed_files: Optional[List[Tuple[str, str]]] = None) -> Iterator[Document]:
+        """
+        Charge les fichiers Word d'un répertoire en parallèle et produit chaque
+        document dès qu'il est chargé (ordre de fin de chargement).
+        
+        Args:
+            directory_path: Chemin vers le répertoire
+            pattern: Pattern pour filtrer les fichiers (défaut: "*.docx")
+            recursive: Si True, recherche récursivement dans les sous-répertoires
+            max_workers: Nombre de fichiers chargés simultanément
+                (utilise config.LOADER_MAX_WORKERS si None)
+            failed_files: Liste complétée avec les (fichier, erreur) en échec
+            
+        Yields:
+            Documents LangChain
+        """
+        files = self._find_files(directory_path, pattern, recursive)
+        failures = [] if failed_files is None else failed_files
+        
+        for file_path, docs, error in iter_bounded(
+            lambda file_path: self.load(str(file_path)),
+            files,
+            max_workers or config.LOADER_MAX_WORKERS
+        ):
+            if error is not None:
+                failures.append((str(file_path), str(error)))
+                print(f"❌ Erreur avec {file_path.name}: {error}")
+                continue
+            
+            print(f"✅ Fichier chargé: {file_path.name}")
+            yield from docs
+        
+        self._report_failures(failures)
+    
     def load_directory(self, directory_path: str, 
                       pattern: str = "*.docx",
-                      recursive: bool = True) -> List[Document]:
+                      recursive: bool = True,
+                      max_workers: Optional[int] = None) -> List[Document]:
         """
-        Charge tous les fichiers Word d'un répertoire.
+        Charge tous les fichiers Word d'un répertoire (en parallèle, résultats
+        dans l'ordre de parcours du répertoire).
         
         Args:
             directory_path: Chemin vers le répertoire
             pattern: Pattern pour filtrer les fichiers (défaut: "*.docx")
             recursive: Si True, recherche récursivement dans les sous-répertoires
+            max_workers: Nombre de fichiers chargés simultanément
+                (utilise config.LOADER_MAX_WORKERS si None)
             
         Returns:
             Liste de documents LangChain
         """
-        directory = Path(directory_path)
-        
-        if not directory.exists():
-            raise FileNotFoundError(f"Répertoire non trouvé: {directory_path}")
-        
-        # Recherche des fichiers
-        if recursive:
-            files = list(directory.rglob(pattern))
-        else:
-            files = list(directory.glob(pattern))
+        files = list(self._find_files(directory_path, pattern, recursive))
+        outcomes = run_bounded(
+            lambda file_path: self.load(str(file_path)),
+            files,
+            max_workers or config.LOADER_MAX_WORKERS
+        )
         
         documents = []
         failed_files = []
         
-        for file_path in files:
-            try:
-                docs = self.load(str(file_path))
+        for file_path, (docs, error) in zip(files, outcomes):
+            if error is not None:
+                failed_files.append((str(file_path), str(error)))
+                print(f"❌ Erreur avec {file_path.name}: {error}")
+            else:
                 documents.extend(docs)
                 print(f"✅ Fichier chargé: {file_path.name}")
-            except Exception as e:
-                failed_files.append((str(file_path), str(e)))
-                print(f"❌ Erreur avec {file_path.name}: {e}")
         
-        if failed_files:
-            print(f"\n⚠️  {len(failed_files)} fichiers ont échoué:")
-            for file_path, error in failed_files:
-                print(f"  - {Path(file_path).name}: {error}")
+        self._report_failures(failed_files)
         
         print(f"\n📊 Total: {len(documents)} documents chargés depuis {len(files)} fichiers")
         return documents
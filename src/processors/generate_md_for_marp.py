@@ -1,16 +1,19 @@
 import os
 from pathlib import Path
-from langchain_openai import ChatOpenAI
+from typing import List, Optional
 from langchain_core.prompts import PromptTemplate
 from ..config import config
+from ..concurrency import run_bounded
+from ..retry import create_retry_policy
 
-# Initialiser le modèle OpenAI avec la configuration centralisée
-llm = ChatOpenAI(
-    api_key=config.OPENAI_API_KEY,
-    model=config.DEFAULT_MODEL,
-    temperature=config.DEFAULT_TEMPERATURE,
-    max_tokens=config.MAX_TOKENS
-)
+def get_llm():
+    """
+    Retourne le modèle OpenAI de la génération de slides (modèle partagé du processus,
+    créé au premier appel avec la configuration centralisée).
+    """
+    from ..llm.clients import get_llm_client
+    
+    return get_llm_client()
 
 # Prompt pour générer des slides Marp
 MARPPROMPT = """
@@ -28,50 +31,86 @@ def generate_marp_slides_from_md(md_content: str) -> str:
     Utilise la configuration centralisée pour l'API et les paramètres du modèle.
     """
     prompt = PromptTemplate.from_template(MARPPROMPT)
-    chain = prompt | llm
-    marp_md = chain.invoke({"input_md": md_content})
+    chain = prompt | get_llm()
+    # Les erreurs transitoires (429, timeout, 5xx) sont retentées avec attente exponentielle
+    marp_md = create_retry_policy().call(chain.invoke, {"input_md": md_content})
     return marp_md
 
-def process_examples_folder(examples_folder: str, output_folder: str):
+def clean_marp_output(marp_md) -> List[str]:
+    """
+    Nettoie la réponse du modèle et la découpe en slides.
+    
+    Supprime les blocs de code markdown englobants et le séparateur initial, puis
+    filtre les slides vides.
+    
+    Args:
+        marp_md: Réponse du modèle (message LangChain ou texte)
+        
+    Returns:
+        Liste du contenu des slides non vides
+    """
+    markdown_content = marp_md.content if hasattr(marp_md, 'content') else str(marp_md)
+    
+    # Suppression des blocs de code markdown
+    if "```markdown" in markdown_content:
+        markdown_content = markdown_content.split("```markdown", 1)[1]
+    if "```" in markdown_content:
+        markdown_content = markdown_content.split("```", 1)[0]
+    
+    # Nettoyage du contenu
+    markdown = markdown_content.strip()
+    if markdown.startswith("---"):
+        markdown = markdown.split("---", 1)[1].lstrip()
+    
+    # Diviser en slides basé sur les séparateurs '---' et filtrer les slides vides
+    return [slide.strip() for slide in markdown.split("---") if slide.strip()]
+
+def render_marp_document(slides: List[str]) -> str:
+    """Assemble les slides en un document Marp (header Marp + séparateurs)."""
+    return "---\nmarp: true\n---\n\n" + "\n\n---\n\n".join(slides)
+
+def generate_marp_file(md_file: Path, out_file: Path) -> int:
+    """
+    Génère les slides Marp d'un fichier Markdown et les écrit dans out_file.
+    
+    Args:
+        md_file: Fichier Markdown source
+        out_file: Fichier de slides à écrire
+        
+    Returns:
+        Nombre de slides générées
+    """
+    with open(md_file, "r", encoding="utf-8") as f:
+        md_content = f.read()
+    
+    slides = clean_marp_output(generate_marp_slides_from_md(md_content))
+    
+    with open(out_file, "w", encoding="utf-8") as f:
+        f.write(render_marp_document(slides))
+    return len(slides)
+
+def process_examples_folder(examples_folder: str, output_folder: str, max_workers: Optional[int] = None):
     """
     Parcourt tous les fichiers .md du dossier examples, génère des slides Marp et les sauvegarde dans output_folder.
+    Les documents sont traités en parallèle (au plus max_workers, config.MARP_MAX_CONCURRENCY par défaut).
     """
     examples_path = Path(examples_folder)
     output_path = Path(output_folder)
     output_path.mkdir(exist_ok=True)
-
-    for md_file in examples_path.glob("*.md"):
-        with md_file.open("r", encoding="utf-8") as f:
-            md_content = f.read()
-            marp_md = generate_marp_slides_from_md(md_content)
-            out_file = output_path / f"marp_{md_file.stem}.md"
-            with out_file.open("w", encoding="utf-8") as f:
-                markdown_content = marp_md.content if hasattr(marp_md, 'content') else str(marp_md)
-                
-                # Suppression des blocs de code markdown
-                if "```markdown" in markdown_content:
-                    markdown_content = markdown_content.split("```markdown", 1)[1]
-                if "```" in markdown_content:
-                    markdown_content = markdown_content.split("```", 1)[0]
-                
-                # Nettoyage du contenu
-                markdown = markdown_content.strip()
-                if markdown.startswith("---"):
-                    markdown = markdown.split("---", 1)[1].lstrip()
-                
-                # Diviser en slides basé sur les séparateurs '---'
-                slides = markdown.split("---")
-                
-                # Filtrer les slides vides (ne contenant que des espaces/lignes vides)
-                non_empty_slides = [slide.strip() for slide in slides if slide.strip()]
-                
-                # Ajout du header Marp
-                f.write("---\nmarp: true\n---\n\n")
-                
-                # Écrire les slides non vides avec séparateurs
-                f.write("\n\n---\n\n".join(non_empty_slides))
-                
-        print(f"Slides Marp générées : {out_file}")
+    
+    md_files = list(examples_path.glob("*.md"))
+    out_files = [output_path / f"marp_{md_file.stem}.md" for md_file in md_files]
+    results = run_bounded(
+        lambda paths: generate_marp_file(*paths),
+        zip(md_files, out_files),
+        max_workers or config.MARP_MAX_CONCURRENCY
+    )
+    
+    for md_file, out_file, (_, error) in zip(md_files, out_files, results):
+        if error:
+            print(f"❌ Erreur pour {md_file.name}: {error}")
+        else:
+            print(f"Slides Marp générées : {out_file}")
 
 if __name__ == "__main__":
     # Utiliser les répertoires de configuration centralisée
@@ -0,0 +1,189 @@
+"""
+Découpage des documents de formation longs et fusion des extractions partielles.
+
+Un programme de plusieurs semaines dépasse le contexte du modèle (ou son délai de
+réponse) s'il est envoyé en un seul prompt. Le document est découpé par journée
+(lignes "J1", "Jour 2", "Journée 3", "Day 4"...), à défaut par titre markdown, puis
+les blocs sont regroupés en extraits d'au plus `max_tokens` tokens. Chaque extrait
+est traité séparément et les scénarios partiels sont fusionnés en un seul, avec des
+jours renumérotés.
+
+Les titres markdown ne sont présents dans le texte d'un document Word que s'il a été
+chargé avec `WordLoader(preserve_formatting=True)` (comme dans `main.py`). Sans
+marqueur de journée ni titre, le document est découpé entre deux paragraphes:
+un extrait peut alors commencer au milieu d'une journée, ce que la fusion prend
+en compte.
+"""
+
+import re
+from typing import List, Optional, Tuple
+
+from ..enrichment.prompt_builder import count_tokens, split_sections
+from ..models.pedagogical_scenario import PedagogicalDay, PedagogicalScenario
+
+
+# Ligne courte marquant le début d'une journée: "# J1", "Jour 2", "**Journée 3**", "Day 4"
+DAY_MARKER_PATTERN = re.compile(
+    r"^[ \t]*(?:#{1,6}[ \t]*)?(?:\*\*)?[ \t]*(?:j|jour|journée|journee|day)[ \t]*\d+\b[^\n]{0,60}$",
+    re.IGNORECASE | re.MULTILINE
+)
+
+# Un extrait: (texte, True si l'extrait commence au milieu d'une journée)
+Chunk = Tuple[str, bool]
+
+
+def split_day_blocks(text: str) -> List[str]:
+    """
+    Découpe un document en blocs commençant chacun par un marqueur de journée
+    (le texte précédant le premier marqueur forme le premier bloc).
+
+    Args:
+        text: Contenu du document
+
+    Returns:
+        Liste de blocs (un seul bloc si le document ne contient pas au moins deux journées)
+    """
+    starts = [match.start() for match in DAY_MARKER_PATTERN.finditer(text)]
+    if len(starts) < 2:
+        return [text]
+
+    bounds = ([0] if starts[0] > 0 else []) + starts + [len(text)]
+    return [text[start:end] for start, end in zip(bounds, bounds[1:]) if text[start:end].strip()]
+
+
+def _split_oversized(text: str, max_tokens: int, model: Optional[str]) -> List[str]:
+    """Découpe un bloc trop long par titre markdown, puis par ligne, en parties d'au plus max_tokens."""
+    pieces = []
+    for _, section in split_sections(text):
+        if count_tokens(section, model) > max_tokens:
+            pieces.extend(line for line in section.splitlines() if line.strip())
+        else:
+            pieces.append(section)
+
+    parts = []
+    current, current_tokens = [], 0
+    for piece in pieces:
+        tokens = count_tokens(piece, model)
+        if current and current_tokens + tokens > max_tokens:
+            parts.append("\n".join(current))
+            current, current_tokens = [], 0
+        current.append(piece)
+        current_tokens += tokens
+
+    if current:
+        parts.append("\n".join(current))
+    return parts
+
+
+def split_document_into_chunks(text: str, max_tokens: int, model: Optional[str] = None) -> List[Chunk]:
+    """
+    Découpe un document de formation en extraits d'au plus max_tokens tokens,
+    en coupant de préférence entre deux journées.
+
+    Args:
+        text: Contenu du document
+        max_tokens: Budget de tokens d'un extrait
+        model: Modèle utilisé pour compter les tokens
+
+    Returns:
+        Liste de (texte de l'extrait, True si l'extrait commence au milieu d'une journée)
+    """
+    # Blocs élémentaires: (texte, poursuit la journée du bloc précédent)
+    blocks: List[Chunk] = []
+    day_blocks = split_day_blocks(text)
+    if len(day_blocks) == 1:
+        day_blocks = [section for _, section in split_sections(text)] or [text]
+
+    for block in day_blocks:
+        block = block.strip()
+        if count_tokens(block, model) <= max_tokens:
+            blocks.append((block, False))
+            continue
+        for index, part in enumerate(_split_oversized(block, max_tokens, model)):
+            blocks.append((part, index > 0))
+
+    # Regroupement glouton des blocs consécutifs
+    chunks: List[Chunk] = []
+    current, current_continues, current_tokens = "", False, 0
+    for block, continues in blocks:
+        tokens = count_tokens(block, model)
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append((current.strip(), current_continues))
+            current, current_continues, current_tokens = "", continues, 0
+        if not current:
+            current_continues = continues
+        current = f"{current}\n\n{block}" if current else block
+        current_tokens += tokens
+
+    if current.strip():
+        chunks.append((current.strip(), current_continues))
+    return chunks
+
+
+def _same_day(previous: PedagogicalDay, day: PedagogicalDay, continues: bool) -> bool:
+    """Indique si le premier jour d'un extrait prolonge le dernier jour de l'extrait précédent."""
+    for field in ("day_title", "day_date"):
+        previous_value = (getattr(previous, field) or "").strip().lower()
+        value = (getattr(day, field) or "").strip().lower()
+        if previous_value and value:
+            return previous_value == value
+    return continues
+
+
+def _unique(values: List[str]) -> List[str]:
+    """Supprime les doublons en conservant l'ordre."""
+    seen = set()
+    result = []
+    for value in values:
+        key = value.strip().lower()
+        if key and key not in seen:
+            seen.add(key)
+            result.append(value)
+    return result
+
+
+def merge_chunk_scenarios(parts: List[Tuple[PedagogicalScenario, bool]]) -> PedagogicalScenario:
+    """
+    Fusionne les scénarios extraits de chaque extrait, dans l'ordre du document.
+
+    Les jours sont concaténés et renumérotés à partir de 1; le premier jour d'un
+    extrait qui prolonge la journée précédente (même titre ou même date, ou extrait
+    coupé au milieu d'une journée) est fusionné avec celle-ci. Les informations
+    globales sont reprises du premier extrait qui les renseigne, les listes sont
+    réunies sans doublons et le score de confiance est le plus faible des extraits.
+
+    Args:
+        parts: Liste de (scénario partiel, True si l'extrait commence au milieu d'une journée)
+
+    Returns:
+        Scénario complet
+    """
+    days: List[PedagogicalDay] = []
+    for scenario, continues in parts:
+        for index, day in enumerate(scenario.days):
+            day = day.model_copy(deep=True)
+            if index == 0 and days and _same_day(days[-1], day, continues):
+                previous = days[-1]
+                previous.sequences.extend(day.sequences)
+                previous.daily_objectives = _unique(previous.daily_objectives + day.daily_objectives)
+                previous.day_title = previous.day_title or day.day_title
+                previous.day_date = previous.day_date or day.day_date
+            else:
+                days.append(day)
+
+    for day_number, day in enumerate(days, 1):
+        day.day_number = day_number
+        for sequence_number, sequence in enumerate(day.sequences, 1):
+            sequence.sequence_number = sequence_number
+
+    scenarios = [scenario for scenario, _ in parts]
+    confidences = [s.confidence_score for s in scenarios if s.confidence_score is not None]
+    return PedagogicalScenario(
+        scenario_title=next((s.scenario_title for s in scenarios if s.scenario_title), None),
+        target_audience=next((s.target_audience for s in scenarios if s.target_audience), None),
+        days=days,
+        global_objectives=_unique([o for s in scenarios for o in s.global_objectives]),
+        prerequisites=_unique([p for s in scenarios for p in s.prerequisites]),
+        global_resources=_unique([r for s in scenarios for r in s.global_resources]),
+        confidence_score=min(confidences) if confidences else None
+    )
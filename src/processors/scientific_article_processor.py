@@ -9,12 +9,25 @@ from langchain_core.documents import Document
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import PydanticOutputParser
 from langchain_core.language_models.base import BaseLanguageModel
-from langchain_openai import ChatOpenAI
 import logging
 
 from ..models.pedagogical_scenario import PedagogicalScenario, PedagogicalDay, PedagogicalSequence
 from ..config import config
-from ..config import config
+from ..llm.clients import get_llm_client, prepare_llm
+from ..concurrency import run_bounded
+from ..enrichment.prompt_builder import count_tokens
+from .scenario_chunking import merge_chunk_scenarios, split_document_into_chunks
+from ..retry import RetryPolicy, create_retry_policy, is_retryable_error
+
+
+# Contexte ajouté en tête du prompt lorsqu'un document long est traité par extraits
+CHUNK_PROMPT_PREFIX = """
+Le texte ci-dessous est l'extrait {chunk_index}/{chunk_count} d'un programme de formation plus long.
+Extrayez uniquement les jours et les séquences présents dans cet extrait, dans leur ordre
+d'apparition, en reprenant le titre du jour tel qu'il figure dans le texte (ex: "J2", "Jour 3").
+Renseignez les informations globales (titre, public, objectifs...) seulement si elles figurent
+dans l'extrait.
+"""
 
 
 class PedagogicalScenarioProcessor:
@@ -26,7 +39,8 @@ class PedagogicalScenarioProcessor:
     def __init__(self, 
                  llm: Optional[BaseLanguageModel] = None,
                  temperature: Optional[float] = None,
-                 model_name: Optional[str] = None):
+                 model_name: Optional[str] = None,
+                 chunk_max_tokens: Optional[int] = None):
         """
         Initialise le processeur de scénarios pédagogiques.
         
@@ -34,21 +48,14 @@ class PedagogicalScenarioProcessor:
             llm: Modèle de langage à utiliser (si None, utilise ChatOpenAI par défaut)
             temperature: Température pour le modèle (utilise config par défaut si None)
             model_name: Nom du modèle à utiliser (utilise config par défaut si None)
+            chunk_max_tokens: Taille au-delà de laquelle un document est traité par extraits
+                (utilise config.SCENARIO_CHUNK_MAX_TOKENS si None, 0 = jamais)
         """
         if llm is None:
-            # Configuration avec OpenAI en utilisant les variables d'environnement
-            model_config = config.get_model_config()
-            
-            self.llm = ChatOpenAI(
-                model=model_name or model_config["model"],
-                temperature=temperature or model_config["temperature"],
-                max_tokens=model_config["max_tokens"],
-                timeout=model_config["timeout"],
-                openai_api_key=config.OPENAI_API_KEY,
-                openai_api_base=config.OPENAI_API_BASE
-            )
+            # Modèle OpenAI partagé du processus, configuré par les variables d'environnement
+            self.llm = get_llm_client(model=model_name, temperature=temperature or None)
         else:
-            self.llm = llm
+            self.llm = prepare_llm(llm)
             
         # Parser pour convertir la sortie en objet Pydantic
         self.output_parser = PydanticOutputParser(pydantic_object=PedagogicalScenario)
@@ -58,6 +65,10 @@ class PedagogicalScenarioProcessor:
         
         # Chaîne de traitement LangChain
         self.chain = self.prompt_template | self.llm | self.output_parser
+        
+        self.chunk_max_tokens = (
+            config.SCENARIO_CHUNK_MAX_TOKENS if chunk_max_tokens is None else chunk_max_tokens
+        )
     
     def _create_prompt_template(self) -> PromptTemplate:
         """
@@ -125,12 +136,15 @@ RÉPONSE STRUCTURÉE :
             }
         )
     
-    def process_document(self, document: Document) -> PedagogicalScenario:
+    def process_document(self, document: Document,
+                         chunk_workers: Optional[int] = None) -> PedagogicalScenario:
         """
         Traite un document et extrait les informations structurées.
         
         Args:
             document: Document LangChain contenant le texte markdown
+            chunk_workers: Nombre d'extraits d'un document long traités simultanément
+                (utilise config.LLM_MAX_CONCURRENCY si None)
             
         Returns:
             Objet PedagogicalScenario avec les informations extraites
@@ -138,6 +152,9 @@ RÉPONSE STRUCTURÉE :
         Raises:
             Exception: Si le traitement échoue
         """
+        if self.chunk_max_tokens and count_tokens(document.page_content, self._model_name) > self.chunk_max_tokens:
+            return self.process_document_chunked(document, chunk_workers)
+        
         try:
             # Debug: afficher le prompt si demandé
             if config.SHOW_PROMPTS:
@@ -173,29 +190,110 @@ RÉPONSE STRUCTURÉE :
             if config.DEBUG_MODE:
                 import traceback
                 traceback.print_exc()
-            raise Exception(f"Erreur lors du traitement du document: {str(e)}")
+            raise Exception(f"Erreur lors du traitement du document: {str(e)}") from e
+    
+    @property
+    def _model_name(self) -> Optional[str]:
+        return getattr(self.llm, "model_name", None)
+    
+    def _create_chunk_chain(self):
+        """Chaîne d'extraction d'un extrait de document (prompt courant précédé du contexte de l'extrait)."""
+        chunk_template = PromptTemplate(
+            template=CHUNK_PROMPT_PREFIX + self.prompt_template.template,
+            input_variables=["text", "chunk_index", "chunk_count"],
+            partial_variables={
+                "format_instructions": self.output_parser.get_format_instructions()
+            }
+        )
+        return chunk_template | self.llm | self.output_parser
     
-    def process_documents(self, documents: List[Document]) -> List[PedagogicalScenario]:
+    def process_document_chunked(self, document: Document,
+                                 max_workers: Optional[int] = None) -> PedagogicalScenario:
         """
-        Traite une liste de documents.
+        Traite un document long par extraits (map-reduce).
+        
+        Le document est découpé par journée (à défaut par titre, puis par paragraphe)
+        en extraits d'au plus `chunk_max_tokens` tokens; les jours et séquences de
+        chaque extrait sont extraits en parallèle, puis fusionnés en un seul scénario
+        aux jours renumérotés. Les titres d'un document Word ne sont conservés que
+        s'il est chargé avec `WordLoader(preserve_formatting=True)`.
+        
+        Les erreurs ne sont pas retentées ici: `batch_process_with_retry` retente le
+        document entier.
+        
+        Args:
+            document: Document LangChain contenant le texte du programme
+            max_workers: Nombre d'extraits traités simultanément
+                (utilise config.LLM_MAX_CONCURRENCY si None)
+            
+        Returns:
+            Objet PedagogicalScenario fusionné
+            
+        Raises:
+            Exception: Si l'extraction d'un extrait échoue
+        """
+        chunks = split_document_into_chunks(
+            document.page_content,
+            self.chunk_max_tokens or config.SCENARIO_CHUNK_MAX_TOKENS,
+            self._model_name
+        )
+        print(f"📑 Document long découpé en {len(chunks)} extraits")
+        
+        chain = self._create_chunk_chain()
+        
+        def extract(indexed_chunk) -> PedagogicalScenario:
+            index, (text, _) = indexed_chunk
+            return chain.invoke({
+                "text": text,
+                "chunk_index": index + 1,
+                "chunk_count": len(chunks)
+            })
+        
+        outcomes = run_bounded(extract, enumerate(chunks), max_workers or config.LLM_MAX_CONCURRENCY)
+        
+        parts = []
+        for index, ((_, continues), (result, error)) in enumerate(zip(chunks, outcomes)):
+            if error is not None:
+                raise Exception(f"Erreur lors du traitement de l'extrait {index + 1}/{len(chunks)}: {error}") from error
+            parts.append((result, continues))
+        
+        scenario = merge_chunk_scenarios(parts)
+        print(f"🧩 {len(chunks)} extraits fusionnés: {scenario.get_total_days()} jours, "
+              f"{scenario.get_total_sequences()} séquences")
+        return scenario
+    
+    def process_documents(self, documents: List[Document],
+                          max_workers: Optional[int] = None) -> List[PedagogicalScenario]:
+        """
+        Traite une liste de documents en parallèle.
+        
+        Les extraits d'un document long sont alors traités l'un après l'autre: le
+        nombre d'appels LLM simultanés reste borné par max_workers.
         
         Args:
             documents: Liste de documents LangChain
+            max_workers: Nombre de documents traités simultanément
+                (utilise config.LLM_MAX_CONCURRENCY si None, 1 = séquentiel)
             
         Returns:
-            Liste d'objets PedagogicalScenario
+            Liste d'objets PedagogicalScenario, dans l'ordre des documents
         """
+        outcomes = run_bounded(
+            lambda document: self.process_document(document, chunk_workers=1),
+            documents,
+            max_workers or config.LLM_MAX_CONCURRENCY
+        )
+        
         results = []
         failed_documents = []
         
-        for i, document in enumerate(documents):
-            try:
-                result = self.process_document(document)
+        for i, (result, error) in enumerate(outcomes):
+            if error is not None:
+                failed_documents.append((i, str(error)))
+                print(f"Erreur lors du traitement du document {i+1}: {error}")
+            else:
                 results.append(result)
                 print(f"Document {i+1}/{len(documents)} traité avec succès")
-            except Exception as e:
-                failed_documents.append((i, str(e)))
-                print(f"Erreur lors du traitement du document {i+1}: {e}")
         
         if failed_documents:
             print(f"\nAttention: {len(failed_documents)} documents ont échoué:")
@@ -206,38 +304,58 @@ RÉPONSE STRUCTURÉE :
         return results
     
     def batch_process_with_retry(self, documents: List[Document], 
-                                max_retries: Optional[int] = None) -> List[PedagogicalScenario]:
+                                max_retries: Optional[int] = None,
+                                retry_policy: Optional[RetryPolicy] = None,
+                                max_workers: Optional[int] = None) -> List[PedagogicalScenario]:
         """
         Traite les documents par batch avec mécanisme de retry.
         
+        Les documents sont traités en parallèle (au plus max_workers à la fois) et les
+        résultats sont retournés dans l'ordre des documents. Seules les erreurs
+        transitoires (429, timeouts, 5xx) sont retentées, avec une attente exponentielle
+        plafonnée et du jitter (voir `RetryPolicy`); une erreur définitive (réponse
+        impossible à parser...) fait échouer le document immédiatement. Comme dans
+        `process_documents`, les extraits d'un document long sont traités l'un après
+        l'autre.
+        
         Args:
             documents: Liste de documents à traiter
             max_retries: Nombre maximum de tentatives par document
+            retry_policy: Politique de nouvelles tentatives (créée avec max_retries si None)
+            max_workers: Nombre de documents traités simultanément
+                (utilise config.LLM_MAX_CONCURRENCY si None, 1 = séquentiel)
             
         Returns:
             Liste d'objets PedagogicalScenario
         """
-        max_retries = max_retries or config.MAX_RETRIES
-        results = []
+        retry_policy = retry_policy or create_retry_policy(max_retries)
+        attempts = [1] * len(documents)
         
-        for i, document in enumerate(documents):
-            success = False
-            last_error = None
+        def process(index: int) -> PedagogicalScenario:
+            def on_retry(attempt: int, error: BaseException, delay: float) -> None:
+                attempts[index] = attempt + 1
+                print(f"Échec tentative {attempt} pour document {index+1} ({error}), retry dans {delay:.1f}s...")
             
-            for attempt in range(max_retries):
-                try:
-                    result = self.process_document(document)
-                    results.append(result)
-                    success = True
-                    print(f"Document {i+1}/{len(documents)} traité avec succès (tentative {attempt+1})")
-                    break
-                except Exception as e:
-                    last_error = e
-                    if attempt < max_retries - 1:
-                        print(f"Échec tentative {attempt+1} pour document {i+1}, retry...")
-                    
-            if not success:
-                print(f"Document {i+1} échoué après {max_retries} tentatives: {last_error}")
+            result = retry_policy.call(self.process_document, documents[index], chunk_workers=1, on_retry=on_retry)
+            print(f"Document {index+1}/{len(documents)} traité avec succès (tentative {attempts[index]})")
+            return result
+        
+        outcomes = run_bounded(process, range(len(documents)), max_workers or config.LLM_MAX_CONCURRENCY)
+        
+        results = []
+        failed_documents = []
+        
+        for i, (result, error) in enumerate(outcomes):
+            if error is None:
+                results.append(result)
+                continue
+            failed_documents.append(i)
+            reason = "après" if is_retryable_error(error) else "(erreur non retentée) après"
+            print(f"Document {i+1} échoué {reason} {attempts[i]} tentative(s): {error}")
+        
+        if failed_documents:
+            print(f"\nAttention: {len(failed_documents)} documents ont échoué: "
+                  f"{', '.join(str(i + 1) for i in failed_documents)}")
         
         return results
     
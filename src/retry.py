@@ -0,0 +1,216 @@
+"""
+Politique de nouvelles tentatives pour les appels réseau (LLM, API externes).
+
+Les erreurs sont classées en deux familles:
+- transitoires (429, 408, 5xx, délais dépassés, erreurs de connexion): l'appel est
+  retenté après une attente exponentielle plafonnée avec jitter, ou après le délai
+  indiqué par l'en-tête `Retry-After` s'il est plus long (plafonné à
+  `RETRY_AFTER_MAX_SECONDS`);
+- définitives (erreurs de parsing, requêtes invalides, 4xx...): l'erreur est
+  propagée immédiatement, sans consommer d'autres appels.
+"""
+
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Iterator, Optional, Tuple, Type, TypeVar
+
+from .config import config
+
+R = TypeVar("R")
+
+# Codes HTTP pour lesquels une nouvelle tentative a des chances de réussir
+RETRYABLE_STATUS_CODES = {408, 409, 425, 429, 500, 502, 503, 504}
+
+_transient_types: Optional[Tuple[Type[BaseException], ...]] = None
+
+
+def _transient_exception_types() -> Tuple[Type[BaseException], ...]:
+    """Types d'exceptions transitoires des bibliothèques réseau disponibles."""
+    global _transient_types
+    if _transient_types is None:
+        types = [TimeoutError, ConnectionError]
+        try:
+            import httpx
+            types.append(httpx.TransportError)
+        except ImportError:
+            pass
+        try:
+            import requests
+            types.extend([requests.exceptions.ConnectionError, requests.exceptions.Timeout])
+        except ImportError:
+            pass
+        try:
+            import openai
+            # APITimeoutError hérite d'APIConnectionError
+            types.append(openai.APIConnectionError)
+        except ImportError:
+            pass
+        _transient_types = tuple(types)
+    return _transient_types
+
+
+def _error_chain(error: BaseException) -> Iterator[BaseException]:
+    """Parcourt une exception et ses causes (`raise ... from`, exceptions englobées)."""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        yield error
+        error = error.__cause__ or error.__context__
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    """Code HTTP porté par une exception (attribut status_code ou réponse associée)."""
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """
+    Indique si une erreur est transitoire (429, timeouts, 5xx, erreurs de connexion).
+
+    Args:
+        error: Exception levée par l'appel (ses causes sont aussi examinées)
+
+    Returns:
+        True si l'appel peut être retenté
+    """
+    for cause in _error_chain(error):
+        status = _status_code(cause)
+        if status is not None:
+            return status in RETRYABLE_STATUS_CODES
+        if isinstance(cause, _transient_exception_types()):
+            return True
+    return False
+
+
+def get_retry_after(error: BaseException) -> Optional[float]:
+    """
+    Délai d'attente demandé par le serveur (en-têtes `retry-after-ms` ou `Retry-After`).
+
+    Args:
+        error: Exception levée par l'appel (ses causes sont aussi examinées)
+
+    Returns:
+        Délai en secondes, ou None si le serveur n'en indique pas
+    """
+    for cause in _error_chain(error):
+        headers = getattr(getattr(cause, "response", None), "headers", None)
+        if not headers:
+            continue
+
+        value = headers.get("retry-after-ms")
+        if value:
+            try:
+                return max(float(value) / 1000, 0.0)
+            except ValueError:
+                pass
+
+        value = headers.get("retry-after")
+        if value:
+            try:
+                return max(float(value), 0.0)
+            except ValueError:
+                try:
+                    return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+                except (TypeError, ValueError):
+                    pass
+    return None
+
+
+class RetryPolicy:
+    """
+    Nouvelles tentatives avec attente exponentielle plafonnée et jitter complet,
+    limitées aux erreurs transitoires.
+    """
+
+    def __init__(self,
+                 max_attempts: Optional[int] = None,
+                 base_delay: Optional[float] = None,
+                 max_delay: Optional[float] = None,
+                 max_retry_after: Optional[float] = None,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Initialise la politique.
+
+        Args:
+            max_attempts: Nombre total de tentatives (utilise config.MAX_RETRIES si None)
+            base_delay: Attente de base en secondes, doublée à chaque tentative
+                (utilise config.RETRY_BASE_DELAY_SECONDS si None)
+            max_delay: Plafond de l'attente exponentielle en secondes
+                (utilise config.RETRY_MAX_DELAY_SECONDS si None)
+            max_retry_after: Plafond du délai Retry-After demandé par le serveur en
+                secondes (utilise config.RETRY_AFTER_MAX_SECONDS si None)
+            sleep: Fonction d'attente (remplaçable pour les benchmarks)
+        """
+        self.max_attempts = max(1, max_attempts or config.MAX_RETRIES)
+        self.base_delay = config.RETRY_BASE_DELAY_SECONDS if base_delay is None else base_delay
+        self.max_delay = config.RETRY_MAX_DELAY_SECONDS if max_delay is None else max_delay
+        self.max_retry_after = config.RETRY_AFTER_MAX_SECONDS if max_retry_after is None else max_retry_after
+        self.sleep = sleep
+
+    def compute_delay(self, attempt: int, error: Optional[BaseException] = None) -> float:
+        """
+        Calcule l'attente avant la tentative suivante.
+
+        Args:
+            attempt: Numéro de la tentative qui vient d'échouer (à partir de 1)
+            error: Erreur de cette tentative (pour l'en-tête Retry-After)
+
+        Returns:
+            Attente en secondes: tirage uniforme dans [0, min(max_delay, base_delay × 2^(attempt-1))],
+            ou le délai Retry-After du serveur (plafonné à max_retry_after) s'il est plus long
+        """
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+        retry_after = get_retry_after(error) if error is not None else None
+        return max(backoff, min(retry_after or 0.0, self.max_retry_after))
+
+    def call(self,
+             func: Callable[..., R],
+             *args,
+             on_retry: Optional[Callable[[int, BaseException, float], None]] = None,
+             **kwargs) -> R:
+        """
+        Appelle une fonction en retentant les erreurs transitoires.
+
+        Args:
+            func: Fonction à appeler
+            *args: Arguments positionnels de la fonction
+            on_retry: Fonction appelée avec (tentative échouée, erreur, attente) avant
+                chaque nouvelle tentative
+            **kwargs: Arguments nommés de la fonction
+
+        Returns:
+            Résultat de la fonction
+
+        Raises:
+            Exception: La dernière erreur si elle est définitive ou si toutes les
+                tentatives ont échoué
+        """
+        attempt = 1
+        while True:
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                if attempt >= self.max_attempts or not is_retryable_error(e):
+                    raise
+                delay = self.compute_delay(attempt, e)
+                if on_retry is not None:
+                    on_retry(attempt, e, delay)
+                self.sleep(delay)
+                attempt += 1
+
+
+def create_retry_policy(max_attempts: Optional[int] = None) -> RetryPolicy:
+    """
+    Factory function pour créer une RetryPolicy configurée.
+
+    Args:
+        max_attempts: Nombre total de tentatives (utilise config.MAX_RETRIES si None)
+
+    Returns:
+        Instance de RetryPolicy
+    """
+    return RetryPolicy(max_attempts=max_attempts)
@@ -0,0 +1,16 @@
+"""
+Gestion des tâches de fond de l'API (persistance, planification, événements, archives).
+"""
+
+from .store import TaskStore, InMemoryTaskStore, SQLiteTaskStore, RedisTaskStore, create_task_store
+from .scheduler import JobScheduler, QueueFullError
+from .pipeline import Stage, run_pipeline
+from .events import TaskEventBus, END_EVENT
+from .archive import (directory_fingerprint, archive_cache_path, stream_task_archive, build_task_archive,
+                      prune_task_archives)
+
+__all__ = ["TaskStore", "InMemoryTaskStore", "SQLiteTaskStore", "RedisTaskStore", "create_task_store",
+           "JobScheduler", "QueueFullError", "Stage", "run_pipeline",
+           "TaskEventBus", "END_EVENT",
+           "directory_fingerprint", "archive_cache_path", "stream_task_archive", "build_task_archive",
+           "prune_task_archives"]
@@ -0,0 +1,190 @@
+"""
+Archives ZIP des résultats de tâches, produites en flux et mises en cache.
+
+L'archive est envoyée au client au fur et à mesure de sa construction et
+recopiée dans un fichier de cache. Le nom du fichier de cache contient
+l'empreinte du répertoire de la tâche (noms, tailles, dates de modification):
+toute modification des résultats produit une nouvelle empreinte et invalide
+l'archive précédente, qui est supprimée. Les archives des tâches supprimées du
+stockage sont supprimées par `prune_task_archives`.
+"""
+
+import hashlib
+import os
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+# Taille des blocs lus dans les fichiers et envoyés au client
+CHUNK_SIZE = 64 * 1024
+
+
+def list_archive_files(directory: Path) -> List[Path]:
+    """Fichiers (non récursifs) du répertoire de la tâche inclus dans l'archive, triés par nom."""
+    return sorted((path for path in Path(directory).iterdir() if path.is_file()), key=lambda path: path.name)
+
+
+def directory_fingerprint(directory: Path) -> str:
+    """
+    Empreinte du contenu d'un répertoire de résultats.
+    
+    Args:
+        directory: Répertoire de la tâche
+        
+    Returns:
+        Empreinte SHA-256 (hexadécimale) des noms, tailles et dates de modification
+    """
+    digest = hashlib.sha256()
+    for path in list_archive_files(directory):
+        stat = path.stat()
+        digest.update(f"{path.name}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def archive_cache_path(cache_dir: Path, task_id: str, fingerprint: str) -> Path:
+    """Chemin de l'archive en cache d'une tâche pour une empreinte donnée."""
+    return Path(cache_dir) / f"task_{task_id}_{fingerprint[:16]}.zip"
+
+
+class _ChunkBuffer:
+    """Flux en écriture seule (non positionnable) accumulant les octets produits par zipfile."""
+    
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+    
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+    
+    def tell(self) -> int:
+        return self._position
+    
+    def flush(self) -> None:
+        pass
+    
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _unlink_quietly(path: Path) -> None:
+    try:
+        path.unlink()
+    except OSError:
+        pass
+
+
+def remove_task_archives(cache_dir: Path, task_id: str, keep: Optional[Path] = None) -> None:
+    """
+    Supprime les archives en cache d'une tâche.
+    
+    Args:
+        cache_dir: Répertoire de cache des archives
+        task_id: ID de la tâche
+        keep: Archive à conserver (celle de l'empreinte courante)
+    """
+    for path in Path(cache_dir).glob(f"task_{task_id}_*.zip"):
+        if path != keep:
+            _unlink_quietly(path)
+
+
+def prune_task_archives(cache_dir: Path, task_ids: Iterable[str]) -> int:
+    """
+    Supprime les archives en cache des tâches qui ne sont plus dans le stockage.
+    
+    Args:
+        cache_dir: Répertoire de cache des archives
+        task_ids: IDs des tâches existantes
+        
+    Returns:
+        Nombre d'archives supprimées
+    """
+    known = set(task_ids)
+    removed = 0
+    for path in Path(cache_dir).glob("task_*_*.zip"):
+        # Nom: task_{task_id}_{empreinte sur 16 caractères}.zip
+        if path.stem[len("task_"):-17] not in known:
+            _unlink_quietly(path)
+            removed += 1
+    return removed
+
+
+def stream_task_archive(directory: Path, cache_path: Path, task_id: str) -> Iterator[bytes]:
+    """
+    Construit l'archive ZIP d'un répertoire en produisant ses octets par blocs.
+    
+    Les octets sont simultanément écrits dans un fichier temporaire, renommé en
+    `cache_path` une fois l'archive complète (un téléchargement interrompu ne
+    laisse pas d'archive partielle en cache).
+    
+    Args:
+        directory: Répertoire de la tâche
+        cache_path: Fichier de cache de l'archive
+        task_id: ID de la tâche (pour supprimer les archives obsolètes)
+        
+    Yields:
+        Blocs d'octets de l'archive
+    """
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    # Les archives des anciennes empreintes ne seront plus servies
+    remove_task_archives(cache_path.parent, task_id, keep=cache_path)
+    fd, tmp_path = tempfile.mkstemp(dir=str(cache_path.parent), suffix=".tmp")
+    completed = False
+    
+    try:
+        with os.fdopen(fd, "wb") as cache_file:
+            buffer = _ChunkBuffer()
+            
+            def flush_buffer() -> bytes:
+                data = buffer.drain()
+                if data:
+                    cache_file.write(data)
+                return data
+            
+            with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+                for path in list_archive_files(directory):
+                    # Date de modification du fichier conservée: l'archive est identique
+                    # tant que les fichiers ne changent pas (cohérent avec l'ETag)
+                    info = zipfile.ZipInfo.from_file(path, path.name)
+                    info.compress_type = zipfile.ZIP_DEFLATED
+                    force_zip64 = info.file_size >= zipfile.ZIP64_LIMIT
+                    with open(path, "rb") as source, archive.open(info, "w", force_zip64=force_zip64) as entry:
+                        while True:
+                            block = source.read(CHUNK_SIZE)
+                            if not block:
+                                break
+                            entry.write(block)
+                            data = flush_buffer()
+                            if data:
+                                yield data
+                    data = flush_buffer()
+                    if data:
+                        yield data
+            
+            # Répertoire central de l'archive, écrit à la fermeture
+            data = flush_buffer()
+            if data:
+                yield data
+        
+        os.replace(tmp_path, cache_path)
+        completed = True
+    finally:
+        if not completed and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+
+def build_task_archive(directory: Path, cache_path: Path, task_id: str) -> Path:
+    """
+    Construit entièrement l'archive en cache (si absente) et retourne son chemin.
+    
+    Utilisé lorsque le client demande une plage d'octets (Range) d'une archive
+    pas encore en cache.
+    """
+    if not cache_path.exists():
+        for _ in stream_task_archive(directory, cache_path, task_id):
+            pass
+    return cache_path
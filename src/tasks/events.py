@@ -0,0 +1,151 @@
+"""
+Diffusion en temps réel des événements d'avancement des tâches.
+
+Les traitements (exécutés dans des threads) publient des événements dans le bus;
+les clients SSE / WebSocket (boucle asyncio) s'y abonnent. Chaque tâche garde un
+historique borné de ses événements, rejoué aux abonnés arrivés en retard ou qui
+se reconnectent avec `Last-Event-ID`.
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, AsyncIterator, Deque, Dict, Optional, Set, Tuple
+
+# Événement publié une seule fois, à la fin d'une tâche, avec son résultat final
+END_EVENT = "end"
+
+
+class _Channel:
+    def __init__(self, history_size: int):
+        self.history: Deque[Dict[str, Any]] = deque(maxlen=history_size)
+        self.next_id = 1
+        self.closed = False
+        self.subscribers: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = set()
+
+
+class TaskEventBus:
+    """
+    Bus d'événements en mémoire (par processus), un canal par tâche.
+    """
+    
+    def __init__(self, history_size: int = 1000, max_channels: int = 500):
+        """
+        Initialise le bus.
+        
+        Args:
+            history_size: Nombre d'événements conservés par tâche
+            max_channels: Nombre de canaux conservés (les plus anciens terminés sont supprimés)
+        """
+        self.history_size = history_size
+        self.max_channels = max_channels
+        self._channels: "OrderedDict[str, _Channel]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def _get_or_create(self, task_id: str) -> _Channel:
+        """Retourne le canal d'une tâche, en le créant si besoin (appelé sous verrou)."""
+        channel = self._channels.get(task_id)
+        if channel is None:
+            channel = _Channel(self.history_size)
+            self._channels[task_id] = channel
+            if len(self._channels) > self.max_channels:
+                for old_id, old_channel in list(self._channels.items()):
+                    if old_channel.closed and not old_channel.subscribers:
+                        del self._channels[old_id]
+                        break
+        return channel
+    
+    def open(self, task_id: str) -> None:
+        """Crée le canal d'une tâche (avant la publication de son premier événement)."""
+        with self._lock:
+            self._get_or_create(task_id)
+    
+    def discard(self, task_id: str) -> None:
+        """Supprime le canal d'une tâche abandonnée avant son exécution (file pleine)."""
+        with self._lock:
+            self._channels.pop(task_id, None)
+    
+    def has_channel(self, task_id: str) -> bool:
+        with self._lock:
+            return task_id in self._channels
+    
+    def publish(self, task_id: str, event: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Publie un événement pour une tâche (appelable depuis n'importe quel thread).
+        
+        Args:
+            task_id: ID de la tâche
+            event: Type d'événement (status, progress, article, sequence, end...)
+            data: Données sérialisables en JSON
+            
+        Returns:
+            Événement publié (id, event, data, timestamp)
+        """
+        with self._lock:
+            channel = self._get_or_create(task_id)
+            if channel.closed:
+                return {}
+            
+            message = {"id": channel.next_id, "event": event, "data": data, "timestamp": time.time()}
+            channel.next_id += 1
+            channel.history.append(message)
+            if event == END_EVENT:
+                channel.closed = True
+            
+            subscribers = list(channel.subscribers)
+        
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, message)
+            except RuntimeError:
+                # Boucle d'événements fermée: l'abonné a disparu
+                pass
+        return message
+    
+    async def subscribe(self, task_id: str, last_event_id: int = 0,
+                        heartbeat_seconds: float = 15.0) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """
+        S'abonne aux événements d'une tâche.
+        
+        Les événements d'id supérieur à `last_event_id` encore en historique sont
+        d'abord rejoués. L'itération s'arrête après l'événement de fin. `None` est
+        produit après `heartbeat_seconds` sans événement (maintien de connexion).
+        
+        Args:
+            task_id: ID de la tâche
+            last_event_id: Dernier événement déjà reçu par le client
+            heartbeat_seconds: Délai entre deux signaux de maintien de connexion
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        subscriber = (loop, queue)
+        
+        with self._lock:
+            channel = self._get_or_create(task_id)
+            backlog = [message for message in channel.history if message["id"] > last_event_id]
+            closed = channel.closed
+            if not closed:
+                channel.subscribers.add(subscriber)
+        
+        try:
+            for message in backlog:
+                yield message
+                if message["event"] == END_EVENT:
+                    return
+            if closed:
+                return
+            
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                
+                yield message
+                if message["event"] == END_EVENT:
+                    return
+        finally:
+            with self._lock:
+                channel.subscribers.discard(subscriber)
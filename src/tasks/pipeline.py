@@ -0,0 +1,109 @@
+"""
+Exécution d'un petit graphe de dépendances (DAG) d'étapes de traitement.
+
+Les étapes dont toutes les dépendances sont terminées s'exécutent en parallèle
+dans des threads; une étape reçoit les résultats de ses dépendances.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+class Stage:
+    """
+    Étape d'un pipeline.
+    """
+    
+    def __init__(self, name: str, func: Callable[[Dict[str, Any]], Any],
+                 depends_on: Optional[Iterable[str]] = None):
+        """
+        Initialise l'étape.
+        
+        Args:
+            name: Nom unique de l'étape
+            func: Fonction appelée avec le dictionnaire {nom de dépendance: résultat}
+            depends_on: Noms des étapes à terminer avant celle-ci
+        """
+        self.name = name
+        self.func = func
+        self.depends_on = list(depends_on or [])
+
+
+def _check_stages(stages: List[Stage]) -> None:
+    """Vérifie l'unicité des noms, l'existence des dépendances et l'absence de cycle."""
+    names = [stage.name for stage in stages]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Noms d'étapes en double: {names}")
+    
+    by_name = {stage.name: stage for stage in stages}
+    for stage in stages:
+        unknown = [dependency for dependency in stage.depends_on if dependency not in by_name]
+        if unknown:
+            raise ValueError(f"Étape '{stage.name}': dépendances inconnues {unknown}")
+    
+    visited, in_progress = set(), set()
+    
+    def visit(name: str) -> None:
+        if name in visited:
+            return
+        if name in in_progress:
+            raise ValueError(f"Cycle de dépendances détecté autour de l'étape '{name}'")
+        in_progress.add(name)
+        for dependency in by_name[name].depends_on:
+            visit(dependency)
+        in_progress.discard(name)
+        visited.add(name)
+    
+    for name in names:
+        visit(name)
+
+
+def run_pipeline(stages: List[Stage], max_workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Exécute les étapes en respectant leurs dépendances, en parallèle lorsque possible.
+    
+    Si une étape échoue, les étapes qui en dépendent ne sont pas lancées; les
+    étapes indépendantes déjà en cours se terminent, puis l'exception de la
+    première étape en échec est relevée.
+    
+    Args:
+        stages: Étapes du pipeline
+        max_workers: Nombre maximum d'étapes simultanées (par défaut: toutes)
+        
+    Returns:
+        Dictionnaire {nom de l'étape: résultat}
+    """
+    _check_stages(stages)
+    
+    results: Dict[str, Any] = {}
+    errors: List[BaseException] = []
+    pending = {stage.name: stage for stage in stages}
+    running: Dict[Future, str] = {}
+    
+    with ThreadPoolExecutor(max_workers=max_workers or max(1, len(stages))) as executor:
+        while pending or running:
+            if not errors:
+                ready = [
+                    stage for stage in pending.values()
+                    if all(dependency in results for dependency in stage.depends_on)
+                ]
+                for stage in ready:
+                    del pending[stage.name]
+                    dependencies = {name: results[name] for name in stage.depends_on}
+                    running[executor.submit(stage.func, dependencies)] = stage.name
+            
+            if not running:
+                break
+            
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                error = future.exception()
+                if error is not None:
+                    errors.append(error)
+                else:
+                    results[name] = future.result()
+    
+    if errors:
+        raise errors[0]
+    return results
@@ -0,0 +1,177 @@
+"""
+File d'attente bornée et pool de workers pour les traitements longs de l'API.
+
+Chaque pipeline (enrichissement, génération de slides) déclenche de nombreux
+appels LLM: le planificateur limite le nombre de pipelines exécutées
+simultanément et refuse les nouvelles soumissions lorsque la file est pleine
+(contrôle d'admission), au lieu de lancer une tâche de fond par requête.
+"""
+
+import logging
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(Exception):
+    """Levée lorsque la file d'attente du planificateur est pleine."""
+
+
+class _Job:
+    def __init__(self, job_id: str, func: Callable[..., Any], args: tuple,
+                 on_queue_position: Optional[Callable[[int], None]]):
+        self.job_id = job_id
+        self.func = func
+        self.args = args
+        self.on_queue_position = on_queue_position
+
+
+class JobScheduler:
+    """
+    Planificateur à nombre de workers fixe et file d'attente bornée (par processus).
+    """
+    
+    def __init__(self, max_workers: int, max_queue_size: int):
+        """
+        Initialise le planificateur.
+        
+        Args:
+            max_workers: Nombre de traitements exécutés simultanément
+            max_queue_size: Nombre maximum de traitements en attente
+        """
+        self.max_workers = max(1, max_workers)
+        self.max_queue_size = max(0, max_queue_size)
+        
+        self._queue: Deque[_Job] = deque()
+        self._condition = threading.Condition()
+        self._workers: List[threading.Thread] = []
+        self._running: Dict[str, _Job] = {}
+        self._shutdown = False
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+    
+    def _start_workers(self) -> None:
+        """Démarre les workers au premier job soumis (appelé sous verrou)."""
+        if self._workers:
+            return
+        for index in range(self.max_workers):
+            worker = threading.Thread(target=self._worker_loop, name=f"job-worker-{index}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+    
+    def submit(self, job_id: str, func: Callable[..., Any], *args: Any,
+               on_queue_position: Optional[Callable[[int], None]] = None) -> int:
+        """
+        Ajoute un traitement à la file d'attente.
+        
+        Args:
+            job_id: Identifiant du traitement (ID de tâche)
+            func: Fonction à exécuter
+            *args: Arguments de la fonction
+            on_queue_position: Appelée avec la position (1 = prochain) à chaque
+                changement de position dans la file
+            
+        Returns:
+            Position dans la file d'attente (0 si un worker est libre)
+            
+        Raises:
+            QueueFullError: Si la file d'attente est pleine
+        """
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError("Le planificateur est arrêté")
+            
+            idle_workers = self.max_workers - len(self._running)
+            if len(self._queue) >= self.max_queue_size + max(0, idle_workers):
+                self._rejected += 1
+                raise QueueFullError(
+                    f"File d'attente pleine ({len(self._queue)} traitements en attente)"
+                )
+            
+            self._start_workers()
+            self._queue.append(_Job(job_id, func, args, on_queue_position))
+            position = max(0, len(self._queue) - max(0, idle_workers))
+            self._condition.notify()
+        
+        if position and on_queue_position:
+            on_queue_position(position)
+        return position
+    
+    def _worker_loop(self) -> None:
+        while True:
+            with self._condition:
+                while not self._queue and not self._shutdown:
+                    self._condition.wait()
+                if self._shutdown and not self._queue:
+                    return
+                
+                job = self._queue.popleft()
+                self._running[job.job_id] = job
+                waiting = list(self._queue)
+            
+            # Les traitements restants avancent d'une place
+            for position, waiting_job in enumerate(waiting, start=1):
+                if waiting_job.on_queue_position:
+                    try:
+                        waiting_job.on_queue_position(position)
+                    except Exception as e:
+                        logger.warning(f"Mise à jour de la position de {waiting_job.job_id} impossible: {e}")
+            
+            failed = False
+            try:
+                job.func(*job.args)
+            except Exception:
+                failed = True
+                logger.exception(f"Erreur non gérée dans le traitement {job.job_id}")
+            finally:
+                with self._condition:
+                    del self._running[job.job_id]
+                    if failed:
+                        self._failed += 1
+                    else:
+                        self._completed += 1
+    
+    def position(self, job_id: str) -> Optional[int]:
+        """
+        Retourne la position d'un traitement dans la file.
+        
+        Returns:
+            Position (1 = prochain), 0 si en cours d'exécution, None si inconnu
+        """
+        with self._condition:
+            if job_id in self._running:
+                return 0
+            for position, job in enumerate(self._queue, start=1):
+                if job.job_id == job_id:
+                    return position
+        return None
+    
+    def stats(self) -> Dict[str, Any]:
+        """Compteurs du planificateur (pour /metrics)."""
+        with self._condition:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue_size": self.max_queue_size,
+                "running": len(self._running),
+                "queued": len(self._queue),
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected
+            }
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Arrête le planificateur après l'exécution des traitements déjà en file.
+        
+        Args:
+            wait: Si True, attend la fin des workers
+        """
+        with self._condition:
+            self._shutdown = True
+            self._condition.notify_all()
+        if wait:
+            for worker in self._workers:
+                worker.join()
@@ -0,0 +1,309 @@
+"""
+Stockage des tâches de l'API.
+
+Les tâches sont stockées sous forme de dictionnaires sérialisables en JSON
+(voir `EnrichmentTask.to_dict` dans api.py). Le backend SQLite par défaut
+conserve les tâches après un redémarrage et permet à plusieurs workers uvicorn
+de servir /tasks/{task_id} de manière cohérente.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..config import config
+
+# Statuts des tâches terminées, éligibles à l'éviction
+FINISHED_STATUSES = ("completed", "failed")
+
+
+class TaskStore(ABC):
+    """
+    Interface commune des stockages de tâches.
+    """
+    
+    @abstractmethod
+    def save(self, task: Dict[str, Any]) -> None:
+        """Crée ou met à jour une tâche (clé: task["task_id"])."""
+    
+    @abstractmethod
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Retourne une tâche, ou None si elle n'existe pas."""
+    
+    @abstractmethod
+    def list(self) -> List[Dict[str, Any]]:
+        """Retourne toutes les tâches, de la plus ancienne à la plus récente."""
+    
+    @abstractmethod
+    def delete(self, task_id: str) -> None:
+        """Supprime une tâche."""
+    
+    @abstractmethod
+    def evict(self, ttl_seconds: int, max_finished: int) -> int:
+        """
+        Supprime les tâches terminées expirées ou en surnombre.
+        
+        Args:
+            ttl_seconds: Durée de conservation d'une tâche terminée (0 = illimitée)
+            max_finished: Nombre maximum de tâches terminées conservées (0 = illimité)
+            
+        Returns:
+            Nombre de tâches supprimées
+        """
+    
+    def fail_expired(self, error: str, lease_seconds: float) -> int:
+        """
+        Marque en échec les tâches "pending" ou "running" dont le bail a expiré.
+        
+        Le worker qui exécute une tâche (champ `owner`) renouvelle régulièrement son
+        champ `heartbeat_at`. Une tâche sans renouvellement depuis plus de
+        `lease_seconds` a été interrompue (worker arrêté ou redémarré). Les tâches
+        des workers vivants, qui partagent le stockage, ne sont pas touchées.
+        
+        Args:
+            error: Message d'erreur enregistré dans les tâches
+            lease_seconds: Durée du bail (délai maximum sans renouvellement)
+            
+        Returns:
+            Nombre de tâches marquées en échec
+        """
+        failed = 0
+        for task in self.list():
+            if task["status"] in FINISHED_STATUSES or not self._lease_expired(task, lease_seconds):
+                continue
+            # Relecture: la tâche a pu être renouvelée ou terminée entre-temps
+            task = self.get(task["task_id"])
+            if task is None or task["status"] in FINISHED_STATUSES or not self._lease_expired(task, lease_seconds):
+                continue
+            task.update(
+                status="failed",
+                error=error,
+                progress=f"Erreur: {error}",
+                completed_at=datetime.now().isoformat()
+            )
+            self.save(task)
+            failed += 1
+        return failed
+    
+    @staticmethod
+    def _lease_expired(task: Dict[str, Any], lease_seconds: float) -> bool:
+        heartbeat_at = task.get("heartbeat_at")
+        return not heartbeat_at or time.time() - heartbeat_at > lease_seconds
+
+
+class InMemoryTaskStore(TaskStore):
+    """
+    Stockage en mémoire (un seul processus, perdu au redémarrage).
+    """
+    
+    def __init__(self):
+        self._tasks: Dict[str, Dict[str, Any]] = {}
+        self._updated_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+    
+    def save(self, task: Dict[str, Any]) -> None:
+        with self._lock:
+            self._tasks[task["task_id"]] = task
+            self._updated_at[task["task_id"]] = time.time()
+    
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._tasks.get(task_id)
+    
+    def list(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return sorted(self._tasks.values(), key=lambda task: task["created_at"])
+    
+    def delete(self, task_id: str) -> None:
+        with self._lock:
+            self._tasks.pop(task_id, None)
+            self._updated_at.pop(task_id, None)
+    
+    def evict(self, ttl_seconds: int, max_finished: int) -> int:
+        with self._lock:
+            finished = sorted(
+                (task_id for task_id, task in self._tasks.items() if task["status"] in FINISHED_STATUSES),
+                key=lambda task_id: self._updated_at[task_id]
+            )
+            to_delete = set()
+            if ttl_seconds:
+                limit = time.time() - ttl_seconds
+                to_delete.update(task_id for task_id in finished if self._updated_at[task_id] < limit)
+            if max_finished and len(finished) > max_finished:
+                to_delete.update(finished[:len(finished) - max_finished])
+            
+            for task_id in to_delete:
+                del self._tasks[task_id]
+                del self._updated_at[task_id]
+            return len(to_delete)
+
+
+class SQLiteTaskStore(TaskStore):
+    """
+    Stockage SQLite, partagé entre les threads et les processus utilisant le même fichier.
+    """
+    
+    def __init__(self, database_path: str):
+        """
+        Initialise le stockage.
+        
+        Args:
+            database_path: Chemin du fichier SQLite
+        """
+        self.database_path = database_path
+        Path(database_path).parent.mkdir(parents=True, exist_ok=True)
+        
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(database_path, timeout=30, check_same_thread=False)
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS tasks (
+                    task_id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    updated_at REAL NOT NULL,
+                    data TEXT NOT NULL
+                )
+            """)
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_tasks_status_updated ON tasks(status, updated_at)"
+            )
+            self._connection.commit()
+    
+    def save(self, task: Dict[str, Any]) -> None:
+        data = json.dumps(task, ensure_ascii=False, default=str)
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO tasks (task_id, status, created_at, updated_at, data) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (task["task_id"], task["status"], task["created_at"], time.time(), data)
+            )
+            self._connection.commit()
+    
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT data FROM tasks WHERE task_id = ?", (task_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+    
+    def list(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._connection.execute("SELECT data FROM tasks ORDER BY created_at").fetchall()
+        return [json.loads(row[0]) for row in rows]
+    
+    def delete(self, task_id: str) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM tasks WHERE task_id = ?", (task_id,))
+            self._connection.commit()
+    
+    def evict(self, ttl_seconds: int, max_finished: int) -> int:
+        placeholders = ", ".join("?" for _ in FINISHED_STATUSES)
+        removed = 0
+        
+        with self._lock:
+            if ttl_seconds:
+                cursor = self._connection.execute(
+                    f"DELETE FROM tasks WHERE status IN ({placeholders}) AND updated_at < ?",
+                    (*FINISHED_STATUSES, time.time() - ttl_seconds)
+                )
+                removed += max(cursor.rowcount, 0)
+            
+            if max_finished:
+                cursor = self._connection.execute(
+                    f"""
+                    DELETE FROM tasks WHERE task_id IN (
+                        SELECT task_id FROM tasks WHERE status IN ({placeholders})
+                        ORDER BY updated_at DESC LIMIT -1 OFFSET ?
+                    )
+                    """,
+                    (*FINISHED_STATUSES, max_finished)
+                )
+                removed += max(cursor.rowcount, 0)
+            
+            self._connection.commit()
+        return removed
+
+
+class RedisTaskStore(TaskStore):
+    """
+    Stockage Redis (dépendance optionnelle `redis`), pour des workers sur plusieurs machines.
+    
+    Les tâches terminées reçoivent une expiration Redis égale au TTL configuré.
+    """
+    
+    def __init__(self, url: str, prefix: str = "agrivision:task:", ttl_seconds: int = 0):
+        """
+        Initialise le stockage.
+        
+        Args:
+            url: URL de connexion Redis (ex: redis://localhost:6379/0)
+            prefix: Préfixe des clés
+            ttl_seconds: Expiration des tâches terminées (0 = aucune)
+        """
+        import redis
+        
+        self._redis = redis.Redis.from_url(url, decode_responses=True)
+        self.prefix = prefix
+        self.ttl_seconds = ttl_seconds
+    
+    def save(self, task: Dict[str, Any]) -> None:
+        key = f"{self.prefix}{task['task_id']}"
+        data = json.dumps(task, ensure_ascii=False, default=str)
+        if self.ttl_seconds and task["status"] in FINISHED_STATUSES:
+            self._redis.set(key, data, ex=self.ttl_seconds)
+        else:
+            self._redis.set(key, data)
+    
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        data = self._redis.get(f"{self.prefix}{task_id}")
+        return json.loads(data) if data else None
+    
+    def list(self) -> List[Dict[str, Any]]:
+        tasks = []
+        for key in self._redis.scan_iter(match=f"{self.prefix}*"):
+            data = self._redis.get(key)
+            if data:
+                tasks.append(json.loads(data))
+        return sorted(tasks, key=lambda task: task["created_at"])
+    
+    def delete(self, task_id: str) -> None:
+        self._redis.delete(f"{self.prefix}{task_id}")
+    
+    def evict(self, ttl_seconds: int, max_finished: int) -> int:
+        # L'expiration est gérée par Redis; seule la limite en nombre est appliquée ici
+        if not max_finished:
+            return 0
+        finished = [task for task in self.list() if task["status"] in FINISHED_STATUSES]
+        excess = finished[:max(0, len(finished) - max_finished)]
+        for task in excess:
+            self.delete(task["task_id"])
+        return len(excess)
+
+
+def create_task_store(backend: Optional[str] = None) -> TaskStore:
+    """
+    Factory function pour créer le stockage de tâches configuré.
+    
+    Args:
+        backend: "sqlite", "memory" ou "redis" (utilise config.TASK_STORE_BACKEND si None)
+        
+    Returns:
+        Instance de TaskStore
+    """
+    backend = (backend or config.TASK_STORE_BACKEND).lower()
+    
+    if backend == "memory":
+        return InMemoryTaskStore()
+    if backend == "redis":
+        return RedisTaskStore(config.REDIS_URL, ttl_seconds=config.TASK_TTL_SECONDS)
+    if backend == "sqlite":
+        return SQLiteTaskStore(config.TASK_STORE_PATH)
+    
+    raise ValueError(f"Backend de stockage des tâches inconnu: {backend}")
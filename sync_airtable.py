@@ -9,10 +9,10 @@ from pathlib import Path
 import argparse
 import logging
 
-# Ajouter le répertoire src au path
-sys.path.append(str(Path(__file__).parent / "src"))
+# Ajouter la racine du projet au path
+sys.path.append(str(Path(__file__).parent))
 
-from loaders.airtable_loader import AirtableArticleManager
+from src.loaders.airtable_loader import AirtableArticleManager
 
 # Configuration des logs
 logging.basicConfig(
@@ -24,6 +24,7 @@ def main():
     parser = argparse.ArgumentParser(description="Synchroniser les articles depuis Airtable")
     parser.add_argument("--data-folder", default="data", help="Dossier de destination des articles")
     parser.add_argument("--clean", action="store_true", help="Nettoyer les anciens articles avant sync")
+    parser.add_argument("--full", action="store_true", help="Forcer une synchronisation complète (ignorer le curseur)")
     parser.add_argument("--api-key", help="Clé API Airtable (ou utiliser AIRTABLE_API_KEY)")
     parser.add_argument("--base-id", help="ID de la base Airtable (ou utiliser AIRTABLE_BASE_ID)")
     
@@ -44,17 +45,20 @@ def main():
         
         # Synchroniser les articles
         print("🔄 Synchronisation des articles...")
-        result = manager.sync_articles(args.data_folder)
+        result = manager.sync_articles(args.data_folder, full=args.full)
         
         if result["success"]:
             print(f"✅ Synchronisation réussie!")
+            print(f"   Mode: {result['mode']}")
             print(f"   Articles récupérés: {result['articles_count']}")
-            print(f"   Fichiers créés: {result['files_created']}")
+            print(f"   Fichiers créés / mis à jour / inchangés: "
+                  f"{result['files_created']} / {result['files_updated']} / {result['files_unchanged']}")
+            print(f"   Articles supprimés: {result['articles_deleted']}")
             print(f"   Durée: {result['duration_seconds']:.2f}s")
             print(f"   Dossier: {args.data_folder}/")
             
             if result["saved_files"]:
-                print("\n📄 Fichiers créés:")
+                print("\n📄 Fichiers écrits:")
                 for file_path in result["saved_files"]:
                     print(f"   - {Path(file_path).name}")
         else:
@@ -0,0 +1,61 @@
+"""
+Outils partagés des tests: modèle de langage simulé et enrichisseur configuré pour les tests.
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.models.pedagogical_scenario import PedagogicalSequence
+from src.retry import RetryPolicy
+
+
+def make_sequences(*contents):
+    """Séquences pédagogiques numérotées à partir de 1, une par contenu."""
+    return [PedagogicalSequence(sequence_number=number, title=f"Séquence {number}", content=content,
+                                start_time="09:00", end_time="10:00")
+            for number, content in enumerate(contents, 1)]
+
+
+class ScriptedLLM:
+    """
+    Modèle de langage simulé: `respond(prompt)` fournit la réponse (ou lève une
+    erreur), et le nombre maximum d'appels simultanés est mesuré.
+    """
+
+    def __init__(self, respond, delay=0.0):
+        self.respond = respond
+        self.delay = delay
+        self.prompts = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def invoke(self, messages, *args, **kwargs):
+        prompt = messages[0]["content"] if isinstance(messages, list) else str(messages)
+        with self._lock:
+            self.prompts.append(prompt)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            return SimpleNamespace(content=self.respond(prompt))
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+@pytest.fixture
+def make_enrichment(tmp_path):
+    """Construit un ScenarioEnrichment sans nouvelle tentative ni pré-filtrage par défaut."""
+    from src.enrichment.scenario_enrichment import ScenarioEnrichment
+
+    def make(llm, **kwargs):
+        kwargs.setdefault("manifest_dir", str(tmp_path / "manifests"))
+        kwargs.setdefault("retry_policy", RetryPolicy(max_attempts=1, sleep=lambda delay: None))
+        kwargs.setdefault("prefilter_top_k", 0)
+        return ScenarioEnrichment(llm=llm, **kwargs)
+
+    return make
@@ -0,0 +1,101 @@
+"""
+Tests de la synchronisation incrémentale des articles Airtable (src/loaders/airtable_loader.py).
+"""
+
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from src.config import config
+from src.loaders.airtable_loader import AirtableArticleManager
+
+
+class FakeTable:
+    """Table Airtable simulée: filtre les enregistrements sur LAST_MODIFIED_TIME()."""
+
+    def __init__(self):
+        self.records = {}
+        self.formulas = []
+
+    def put(self, record_id, content, date="2026-01-15"):
+        record = {"id": record_id, "createdTime": "2026-01-01T00:00:00.000Z",
+                  "fields": {"Date_article": date, "Support_cours": content}}
+        # Airtable date les modifications à la milliseconde
+        modified = datetime.now(timezone.utc)
+        self.records[record_id] = (record, modified.replace(microsecond=modified.microsecond // 1000 * 1000))
+
+    def all(self, formula=None, fields=None):
+        self.formulas.append(formula)
+        since = None
+        if formula and "LAST_MODIFIED_TIME" in formula:
+            since = datetime.fromisoformat(formula.split("'")[1].replace("Z", "+00:00"))
+        return [record for record, modified in self.records.values() if since is None or modified > since]
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    monkeypatch.setattr(config, "AIRTABLE_INCREMENTAL_SYNC", True)
+    monkeypatch.setattr(config, "AIRTABLE_SYNC_OVERLAP_SECONDS", 0)
+    monkeypatch.setattr(config, "AIRTABLE_DELETION_CHECK_INTERVAL_SECONDS", 0)
+    manager = AirtableArticleManager(api_key="key", base_id="app123")
+    manager.table = FakeTable()
+    return manager
+
+
+def test_second_sync_only_fetches_modified_records(manager, tmp_path):
+    for index in range(5):
+        manager.table.put(f"rec{index}", f"contenu {index}")
+    first = manager.sync_articles(str(tmp_path))
+    time.sleep(0.01)
+    manager.table.put("rec2", "contenu modifié")
+
+    second = manager.sync_articles(str(tmp_path))
+
+    assert (first["mode"], first["articles_count"]) == ("full", 5)
+    assert (second["mode"], second["articles_count"], second["files_updated"]) == ("incremental", 1, 1)
+
+
+def test_cursor_is_held_back_when_an_article_fails_to_save(manager, tmp_path, monkeypatch):
+    manager.table.put("rec1", "contenu 1")
+    manager.table.put("rec2", "contenu 2")
+    manager.sync_articles(str(tmp_path))
+    cursor = manager.load_sync_state(str(tmp_path))["cursor"]
+
+    time.sleep(0.01)
+    manager.table.put("rec1", "contenu 1 modifié")
+    manager.table.put("rec2", "contenu 2 modifié")
+    write_if_changed = manager.write_if_changed
+
+    def failing_write(file_path, content):
+        if "contenu 2" in content:
+            raise OSError("disque plein")
+        return write_if_changed(file_path, content)
+
+    monkeypatch.setattr(manager, "write_if_changed", failing_write)
+    failed = manager.sync_articles(str(tmp_path))
+
+    assert failed["files_updated"] == 1
+    assert manager.load_sync_state(str(tmp_path))["cursor"] == cursor
+
+    # L'article non sauvegardé est récupéré à nouveau à la synchronisation suivante
+    monkeypatch.setattr(manager, "write_if_changed", write_if_changed)
+    retried = manager.sync_articles(str(tmp_path))
+
+    assert retried["articles_count"] == 2
+    assert retried["files_updated"] == 1
+    assert manager.load_sync_state(str(tmp_path))["cursor"] > cursor
+
+
+def test_deleted_record_removes_its_file(manager, tmp_path):
+    manager.table.put("rec1", "contenu 1")
+    manager.table.put("rec2", "contenu 2")
+    first = manager.sync_articles(str(tmp_path))
+    del manager.table.records["rec2"]
+
+    second = manager.sync_articles(str(tmp_path))
+
+    assert second["articles_deleted"] == 1
+    assert len(second["deleted_files"]) == 1
+    assert second["total_articles"] == 1
+    assert len(first["saved_files"]) == 2
@@ -0,0 +1,107 @@
+"""
+Tests des archives ZIP des résultats (src/tasks/archive.py) et de /download/{task_id}.
+"""
+
+import io
+import zipfile
+
+import pytest
+
+from src.config import Config
+from src.tasks.archive import (archive_cache_path, directory_fingerprint, prune_task_archives,
+                               stream_task_archive)
+from src.tasks.store import InMemoryTaskStore
+
+
+@pytest.fixture
+def task_dir(tmp_path):
+    directory = tmp_path / "output" / "task_t1"
+    directory.mkdir(parents=True)
+    (directory / "scenario.md").write_text("# Scénario enrichi\n" * 200, encoding="utf-8")
+    (directory / "slides.md").write_text("---\nmarp: true\n---\n", encoding="utf-8")
+    return directory
+
+
+def test_streamed_archive_is_cached_and_contains_every_file(task_dir, tmp_path):
+    cache_path = archive_cache_path(tmp_path / "cache", "t1", directory_fingerprint(task_dir))
+
+    streamed = b"".join(stream_task_archive(task_dir, cache_path, "t1"))
+
+    assert cache_path.read_bytes() == streamed
+    with zipfile.ZipFile(io.BytesIO(streamed)) as archive:
+        assert archive.namelist() == ["scenario.md", "slides.md"]
+        assert archive.read("slides.md") == (task_dir / "slides.md").read_bytes()
+
+
+def test_interrupted_stream_leaves_no_cached_archive(task_dir, tmp_path):
+    cache_path = archive_cache_path(tmp_path / "cache", "t1", directory_fingerprint(task_dir))
+
+    stream = stream_task_archive(task_dir, cache_path, "t1")
+    next(stream)
+    stream.close()
+
+    assert list((tmp_path / "cache").iterdir()) == []
+
+
+def test_modified_results_change_the_fingerprint(task_dir):
+    fingerprint = directory_fingerprint(task_dir)
+    (task_dir / "slides.md").write_text("---\nmarp: true\ntheme: gaia\n---\n", encoding="utf-8")
+
+    assert directory_fingerprint(task_dir) != fingerprint
+
+
+def test_prune_removes_archives_of_unknown_tasks(tmp_path):
+    for task_id in ("kept", "gone"):
+        archive_cache_path(tmp_path, task_id, "0" * 64).write_bytes(b"zip")
+
+    assert prune_task_archives(tmp_path, ["kept"]) == 1
+    assert [path.name for path in tmp_path.iterdir()] == [f"task_kept_{'0' * 16}.zip"]
+
+
+@pytest.fixture
+def client(task_dir, tmp_path, monkeypatch):
+    api = pytest.importorskip("api")
+    from fastapi.testclient import TestClient
+
+    store = InMemoryTaskStore()
+    store.save({"task_id": "t1", "status": "completed", "result": {"files": ["scenario.md"]},
+                "created_at": "2026-01-01T10:00:00", "request_type": "EnrichmentRequest",
+                "request": {"scenario_json": "input/scenario.json"}})
+    monkeypatch.setattr(api, "task_store", store)
+    monkeypatch.setattr(Config, "DOWNLOAD_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.chdir(tmp_path)
+    return TestClient(api.app)
+
+
+def test_download_serves_etag_conditional_and_range_requests(client, tmp_path):
+    first = client.get("/download/t1")
+    etag = first.headers["etag"]
+
+    assert first.status_code == 200
+    assert len(list((tmp_path / "cache").glob("task_t1_*.zip"))) == 1
+
+    not_modified = client.get("/download/t1", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+
+    partial = client.get("/download/t1", headers={"Range": "bytes=0-9"})
+    assert partial.status_code == 206
+    assert partial.content == first.content[:10]
+    assert partial.headers["etag"] == etag
+
+
+def test_range_request_builds_the_archive_before_serving(client, tmp_path):
+    partial = client.get("/download/t1", headers={"Range": "bytes=0-3"})
+
+    assert partial.status_code == 206
+    assert partial.content == b"PK\x03\x04"
+
+
+def test_modified_results_replace_the_cached_archive(client, task_dir, tmp_path):
+    etag = client.get("/download/t1").headers["etag"]
+    (task_dir / "slides.md").write_text("---\nmarp: true\ntheme: gaia\n---\n", encoding="utf-8")
+
+    second = client.get("/download/t1", headers={"If-None-Match": etag})
+
+    assert second.status_code == 200
+    assert second.headers["etag"] != etag
+    assert len(list((tmp_path / "cache").glob("task_t1_*.zip"))) == 1
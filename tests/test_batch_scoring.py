@@ -0,0 +1,54 @@
+"""
+Tests de l'évaluation de pertinence par lots (une nouveauté, plusieurs séquences par appel LLM).
+"""
+
+import re
+
+import pytest
+
+from tests.conftest import ScriptedLLM, make_sequences
+
+
+@pytest.fixture
+def enrichment(make_enrichment):
+    return make_enrichment(ScriptedLLM(lambda prompt: ""))
+
+
+def test_parse_batch_scores_reads_numbered_lines(enrichment):
+    response = "SCORES:\n1: 0\n2: 4\n[3] = 2,5\n4 - 5"
+
+    assert enrichment._parse_batch_scores(response, 4) == [0.0, 4.0, 2.5, 5.0]
+
+
+def test_parse_batch_scores_ignores_unknown_and_missing_sequences(enrichment):
+    response = "Voici les scores:\n2: 3\n7: 5\nsans score\n"
+
+    assert enrichment._parse_batch_scores(response, 3) == [0.0, 3.0, 0.0]
+
+
+def test_parse_batch_scores_caps_scores_at_five(enrichment):
+    assert enrichment._parse_batch_scores("1: 5.8", 1) == [5.0]
+
+
+def test_score_novelty_scores_sequences_in_batches(make_enrichment):
+    def scores(prompt):
+        numbers = re.findall(r"^\[(\d+)\] Titre: Séquence (\d+)", prompt, re.MULTILINE)
+        return "\n".join(f"{index}: {int(number) % 6}" for index, number in numbers)
+
+    llm = ScriptedLLM(scores)
+    enrichment = make_enrichment(llm, relevance_batch_size=2)
+
+    result = enrichment._score_novelty("Nouveauté", make_sequences("a", "b", "c", "d", "e"))
+
+    assert result == [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert len(llm.prompts) == 3
+
+
+def test_score_novelty_propagates_llm_errors(make_enrichment):
+    def fail(prompt):
+        raise ConnectionError("API indisponible")
+
+    enrichment = make_enrichment(ScriptedLLM(fail), relevance_batch_size=4)
+
+    with pytest.raises(ConnectionError):
+        enrichment._score_novelty("Nouveauté", make_sequences("a", "b"))
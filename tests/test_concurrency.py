@@ -0,0 +1,62 @@
+"""
+Tests du seau à jetons (src/concurrency.py).
+"""
+
+import threading
+import time
+
+from src.concurrency import TokenBucket
+
+
+def test_full_bucket_serves_burst_without_waiting():
+    bucket = TokenBucket(rate_per_minute=60, capacity=5)
+    start = time.monotonic()
+    for _ in range(5):
+        bucket.acquire()
+    assert time.monotonic() - start < 0.1
+
+
+def test_acquire_paces_requests_at_the_configured_rate():
+    # 20 jetons par seconde, sans rafale: un appel toutes les 50 ms
+    bucket = TokenBucket(rate_per_minute=1200, capacity=1)
+    start = time.monotonic()
+    for _ in range(6):
+        bucket.acquire()
+    elapsed = time.monotonic() - start
+    assert 0.22 <= elapsed < 0.6
+
+
+def test_concurrent_callers_share_the_rate():
+    bucket = TokenBucket(rate_per_minute=1200, capacity=1)
+    start = time.monotonic()
+    threads = [threading.Thread(target=bucket.acquire) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert 0.22 <= time.monotonic() - start < 0.6
+
+
+def test_acquire_more_than_capacity_is_clamped():
+    bucket = TokenBucket(rate_per_minute=60, capacity=2)
+    assert bucket.acquire(10) < 0.1
+
+
+def test_adjust_returns_tokens_to_waiting_callers():
+    bucket = TokenBucket(rate_per_minute=60, capacity=10)
+    bucket.acquire(10)
+    waited = []
+    thread = threading.Thread(target=lambda: waited.append(bucket.acquire(5)))
+    thread.start()
+    time.sleep(0.05)
+    bucket.adjust(-5)
+    thread.join(timeout=2)
+    assert waited and waited[0] < 1.0
+
+
+def test_pause_delays_every_caller():
+    bucket = TokenBucket(rate_per_minute=6000, capacity=10)
+    bucket.pause(0.2)
+    start = time.monotonic()
+    bucket.acquire()
+    assert time.monotonic() - start >= 0.18
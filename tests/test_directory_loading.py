@@ -0,0 +1,113 @@
+"""
+Tests du chargement parallèle et en flux des répertoires (iter_directory des loaders).
+"""
+
+import threading
+import time
+
+import pytest
+
+from src.loaders.markdown_loader import MarkdownLoader
+
+
+@pytest.fixture
+def articles(tmp_path):
+    (tmp_path / "sous_dossier").mkdir()
+    for index in range(6):
+        folder = tmp_path / "sous_dossier" if index % 2 else tmp_path
+        (folder / f"article_{index}.md").write_text(f"# Article {index}\n\nContenu {index}.", encoding="utf-8")
+    return tmp_path
+
+
+def file_names(documents):
+    return sorted(document.metadata["file_name"] for document in documents)
+
+
+def test_iter_directory_yields_every_document(articles):
+    documents = MarkdownLoader(mode="native").iter_directory(str(articles), max_workers=3)
+
+    assert file_names(documents) == [f"article_{index}.md" for index in range(6)]
+
+
+def test_iter_directory_can_skip_subdirectories(articles):
+    documents = MarkdownLoader(mode="native").iter_directory(str(articles), recursive=False, max_workers=3)
+
+    assert file_names(documents) == ["article_0.md", "article_2.md", "article_4.md"]
+
+
+def test_failed_files_are_reported_without_stopping_the_others(articles):
+    (articles / "vide.md").write_text("", encoding="utf-8")
+    failed_files = []
+
+    documents = list(MarkdownLoader(mode="native").iter_directory(str(articles), max_workers=3,
+                                                                  failed_files=failed_files))
+
+    assert len(documents) == 6
+    assert [path.endswith("vide.md") for path, _ in failed_files] == [True]
+
+
+def test_documents_are_yielded_before_the_whole_directory_is_loaded(articles, monkeypatch):
+    loader = MarkdownLoader(mode="native")
+    release = threading.Event()
+    load_file = loader.load_file
+
+    def slow_first_article(file_path):
+        if file_path.endswith("article_0.md"):
+            assert release.wait(5)
+        return load_file(file_path)
+
+    monkeypatch.setattr(loader, "load_file", slow_first_article)
+    documents = loader.iter_directory(str(articles), max_workers=2)
+
+    # article_0 est bloqué: les autres documents arrivent quand même
+    first = next(documents)
+    release.set()
+    rest = list(documents)
+
+    assert first.metadata["file_name"] != "article_0.md"
+    assert file_names([first, *rest]) == [f"article_{index}.md" for index in range(6)]
+
+
+def test_loading_is_bounded_by_max_workers(articles, monkeypatch):
+    loader = MarkdownLoader(mode="native")
+    lock = threading.Lock()
+    counters = {"in_flight": 0, "max": 0}
+    load_file = loader.load_file
+
+    def counted(file_path):
+        with lock:
+            counters["in_flight"] += 1
+            counters["max"] = max(counters["max"], counters["in_flight"])
+        try:
+            time.sleep(0.02)
+            return load_file(file_path)
+        finally:
+            with lock:
+                counters["in_flight"] -= 1
+
+    monkeypatch.setattr(loader, "load_file", counted)
+    list(loader.iter_directory(str(articles), max_workers=2))
+
+    assert counters["max"] == 2
+
+
+def test_missing_directory_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        list(MarkdownLoader(mode="native").iter_directory(str(tmp_path / "absent")))
+
+
+def test_word_iter_directory_yields_loaded_documents(tmp_path):
+    docx = pytest.importorskip("docx")
+    from src.loaders.word_loader import WordLoader
+
+    for index in range(3):
+        document = docx.Document()
+        document.add_paragraph(f"Jour {index}: conduite des prairies")
+        document.save(str(tmp_path / f"programme_{index}.docx"))
+    (tmp_path / "corrompu.docx").write_bytes(b"pas un docx")
+    failed_files = []
+
+    documents = list(WordLoader().iter_directory(str(tmp_path), max_workers=2, failed_files=failed_files))
+
+    assert sorted("conduite des prairies" in document.page_content for document in documents) == [True] * 3
+    assert [path.endswith("corrompu.docx") for path, _ in failed_files] == [True]
@@ -0,0 +1,112 @@
+"""
+Tests du bus d'événements des tâches (src/tasks/events.py).
+"""
+
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from src.tasks.events import END_EVENT, TaskEventBus
+from src.tasks.scheduler import JobScheduler
+from src.tasks.store import InMemoryTaskStore
+
+
+async def collect(bus, task_id, last_event_id=0):
+    return [message async for message in bus.subscribe(task_id, last_event_id, heartbeat_seconds=5)]
+
+
+def test_late_subscriber_replays_history_until_end():
+    bus = TaskEventBus()
+    bus.open("t1")
+    bus.publish("t1", "status", {"status": "running"})
+    bus.publish("t1", "progress", {"message": "Étape 1"})
+    bus.publish("t1", END_EVENT, {"status": "completed"})
+
+    messages = asyncio.run(collect(bus, "t1"))
+
+    assert [message["event"] for message in messages] == ["status", "progress", END_EVENT]
+    assert [message["id"] for message in messages] == [1, 2, 3]
+
+
+def test_reconnection_resumes_after_last_event_id():
+    bus = TaskEventBus()
+    for index in range(3):
+        bus.publish("t1", "progress", {"message": f"Étape {index}"})
+    bus.publish("t1", END_EVENT, {"status": "completed"})
+
+    messages = asyncio.run(collect(bus, "t1", last_event_id=2))
+
+    assert [message["id"] for message in messages] == [3, 4]
+
+
+def test_events_published_from_a_thread_reach_live_subscribers():
+    bus = TaskEventBus()
+    bus.open("t1")
+
+    async def scenario():
+        subscription = asyncio.create_task(collect(bus, "t1"))
+        await asyncio.sleep(0.05)
+
+        def worker():
+            bus.publish("t1", "progress", {"message": "en cours"})
+            bus.publish("t1", END_EVENT, {"status": "completed"})
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+        return await asyncio.wait_for(subscription, 5)
+
+    assert [message["event"] for message in asyncio.run(scenario())] == ["progress", END_EVENT]
+
+
+def test_heartbeat_is_produced_while_idle():
+    bus = TaskEventBus()
+    bus.open("t1")
+
+    async def first_message():
+        subscription = bus.subscribe("t1", heartbeat_seconds=0.01)
+        try:
+            return await subscription.__anext__()
+        finally:
+            await subscription.aclose()
+
+    assert asyncio.run(first_message()) is None
+
+
+def test_nothing_is_published_after_the_end_event():
+    bus = TaskEventBus()
+    bus.publish("t1", END_EVENT, {"status": "failed"})
+
+    assert bus.publish("t1", "progress", {"message": "trop tard"}) == {}
+
+
+def test_closed_channels_are_evicted_beyond_max_channels():
+    bus = TaskEventBus(max_channels=2)
+    bus.publish("done", END_EVENT, {"status": "completed"})
+    bus.open("running")
+    bus.open("new")
+
+    assert not bus.has_channel("done")
+    assert bus.has_channel("running") and bus.has_channel("new")
+
+
+def test_rejected_submission_discards_its_channel(monkeypatch):
+    api = pytest.importorskip("api")
+    gate = threading.Event()
+    monkeypatch.setattr(api, "task_store", InMemoryTaskStore())
+    monkeypatch.setattr(api, "task_events", TaskEventBus())
+    monkeypatch.setattr(api, "job_scheduler", JobScheduler(max_workers=1, max_queue_size=0))
+
+    def make_task(task_id):
+        return api.EnrichmentTask(task_id, api.EnrichmentRequest(scenario_json="input/scenario.json"))
+
+    api.submit_task(make_task("accepted"), lambda task: gate.wait(5))
+    with pytest.raises(HTTPException):
+        api.submit_task(make_task("rejected"), lambda task: None)
+
+    assert api.task_events.has_channel("accepted")
+    assert not api.task_events.has_channel("rejected")
+    gate.set()
+    api.job_scheduler.shutdown()
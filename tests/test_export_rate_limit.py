@@ -0,0 +1,61 @@
+"""
+Tests du blocage de la base après une réponse 429 de l'export Airtable (export_airtable.py).
+"""
+
+import json
+import time
+
+import requests
+
+import export_airtable
+from export_airtable import AirtableExporter
+from src.retry import RetryPolicy
+
+
+def make_response(status_code, data=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(data or {}).encode()
+    response.url = "https://api.airtable.com/v0/app123/tblA"
+    return response
+
+
+class FakeSession:
+    """Session HTTP simulée renvoyant les réponses prévues, dans l'ordre."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.sent_at = []
+
+    def get(self, url, params=None, timeout=None):
+        self.sent_at.append(time.monotonic())
+        return self.responses.pop(0)
+
+
+def test_rate_limited_request_waits_for_the_base_lockout(monkeypatch, capsys):
+    monkeypatch.setattr(export_airtable, "AIRTABLE_RATE_LIMIT_LOCKOUT_SECONDS", 0.2)
+    exporter = AirtableExporter("key", "app123", requests_per_second=100)
+    exporter.session = FakeSession(make_response(429), make_response(200, {"records": []}))
+    exporter.retry_policy = RetryPolicy(max_attempts=2, sleep=lambda delay: None)
+
+    assert exporter._get("https://api.airtable.com/v0/app123/tblA") == {"records": []}
+
+    first, second = exporter.session.sent_at
+    assert second - first >= 0.18
+    assert "fin du blocage de la base (0.2s)" in capsys.readouterr().out
+
+
+def test_other_requests_also_wait_for_the_lockout(monkeypatch):
+    monkeypatch.setattr(export_airtable, "AIRTABLE_RATE_LIMIT_LOCKOUT_SECONDS", 0.2)
+    exporter = AirtableExporter("key", "app123", requests_per_second=100)
+    exporter.session = FakeSession(make_response(429), make_response(200, {"tables": []}))
+    exporter.retry_policy = RetryPolicy(max_attempts=1, sleep=lambda delay: None)
+
+    try:
+        exporter._get("https://api.airtable.com/v0/app123/tblA")
+    except requests.HTTPError:
+        pass
+    start = time.monotonic()
+    exporter._get("https://api.airtable.com/v0/meta/bases/app123/tables")
+
+    assert time.monotonic() - start >= 0.18
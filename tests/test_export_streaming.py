@@ -0,0 +1,114 @@
+"""
+Tests de l'export en flux reprenable (export_airtable.py).
+"""
+
+import json
+
+import pytest
+
+from export_airtable import CHECKPOINT_FILENAME, AirtableExporter
+
+PAGE_SIZE = 100
+TABLES = {"tblA": 250, "tblB": 120}
+
+
+def make_records(table_id):
+    return [{"id": f"{table_id}_rec{index}", "fields": {"Nom": f"Enregistrement {index}"}}
+            for index in range(TABLES[table_id])]
+
+
+class FakeBase:
+    """Pages d'enregistrements simulées, avec une panne optionnelle après N pages."""
+
+    def __init__(self):
+        self.calls = []
+        self.fail_after = {}
+
+    def schema(self):
+        return {"tables": [{"id": table_id, "name": table_id.upper()} for table_id in TABLES]}
+
+    def iter_table_pages(self, table_id, offset=None):
+        self.calls.append((table_id, offset))
+        records = make_records(table_id)
+        start = int(offset) if offset else 0
+        pages = 0
+        while True:
+            if self.fail_after.get(table_id) == pages:
+                raise ConnectionError("connexion perdue")
+            end = start + PAGE_SIZE
+            next_offset = str(end) if end < len(records) else None
+            yield records[start:end], next_offset
+            pages += 1
+            if next_offset is None:
+                break
+            start = end
+
+
+@pytest.fixture
+def base():
+    return FakeBase()
+
+
+def make_exporter(base):
+    exporter = AirtableExporter("key", "app123", max_workers=2, requests_per_second=100)
+    exporter.get_base_schema = base.schema
+    exporter.iter_table_pages = base.iter_table_pages
+    return exporter
+
+
+def read_ids(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line)["id"] for line in f]
+
+
+def test_export_writes_one_jsonl_file_per_table(base, tmp_path):
+    export_path = make_exporter(base).export_base_streaming(str(tmp_path), compression="none")
+
+    assert export_path
+    for table_id in TABLES:
+        assert read_ids(f"{export_path}/{table_id}.jsonl") == [record["id"] for record in make_records(table_id)]
+
+
+def test_resume_truncates_uncommitted_page_and_continues_from_offset(base, tmp_path):
+    base.fail_after["tblA"] = 2
+    assert make_exporter(base).export_base_streaming(str(tmp_path), compression="none") == ""
+
+    export_dir = tmp_path / "airtable_export_app123"
+    checkpoint = json.loads((export_dir / CHECKPOINT_FILENAME).read_text(encoding="utf-8"))
+    assert checkpoint["tables"]["tblA"]["offset"] == "200"
+    assert checkpoint["tables"]["tblB"]["done"]
+
+    # Page écrite après le dernier point de reprise (arrêt brutal avant son enregistrement)
+    with open(export_dir / "tblA.jsonl", "a", encoding="utf-8") as f:
+        f.write('{"id": "tblA_rec200"}\n{"id": "tblA_rec2')
+
+    base.fail_after.clear()
+    base.calls.clear()
+    export_path = make_exporter(base).export_base_streaming(str(tmp_path), compression="none")
+
+    assert export_path == str(export_dir)
+    assert base.calls == [("tblA", "200")]
+    assert read_ids(export_dir / "tblA.jsonl") == [record["id"] for record in make_records("tblA")]
+    checkpoint = json.loads((export_dir / CHECKPOINT_FILENAME).read_text(encoding="utf-8"))
+    assert checkpoint["completed_at"]
+    assert checkpoint["tables"]["tblA"]["records"] == TABLES["tblA"]
+
+
+def test_completed_export_is_not_resumed(base, tmp_path):
+    make_exporter(base).export_base_streaming(str(tmp_path), compression="none")
+    base.calls.clear()
+
+    make_exporter(base).export_base_streaming(str(tmp_path), compression="none")
+
+    assert sorted(table_id for table_id, _ in base.calls) == sorted(TABLES)
+
+
+def test_changing_compression_removes_stale_files(base, tmp_path):
+    pytest.importorskip("zstandard")
+    make_exporter(base).export_base_streaming(str(tmp_path), compression="zstd")
+
+    export_path = make_exporter(base).export_base_streaming(str(tmp_path), compression="none")
+
+    files = sorted(path.name for path in (tmp_path / "airtable_export_app123").iterdir())
+    assert export_path
+    assert files == [CHECKPOINT_FILENAME, "schema.json", "tblA.jsonl", "tblB.jsonl"]
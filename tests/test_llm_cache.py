@@ -0,0 +1,106 @@
+"""
+Tests du cache persistant des réponses LLM (src/llm/cache.py).
+"""
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.outputs import Generation
+
+from src.llm import cache as cache_module
+from src.llm import clients
+from src.llm.cache import PersistentLLMCache
+
+LLM_STRING = "model=test temperature=0"
+
+
+class FakeClock:
+    """Horloge contrôlée par le test à la place du module time."""
+
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+def make_cache(tmp_path, monkeypatch, **kwargs):
+    clock = FakeClock()
+    monkeypatch.setattr(cache_module, "time", clock)
+    return PersistentLLMCache(str(tmp_path / "llm_cache.sqlite"), **kwargs), clock
+
+
+def test_lookup_returns_stored_generations(tmp_path, monkeypatch):
+    cache, _ = make_cache(tmp_path, monkeypatch)
+    cache.update("prompt", LLM_STRING, [Generation(text="réponse")])
+
+    cached = cache.lookup("prompt", LLM_STRING)
+
+    assert [generation.text for generation in cached] == ["réponse"]
+    assert cache.stats()["hits"] == 1
+
+
+def test_key_depends_on_model_configuration(tmp_path, monkeypatch):
+    cache, _ = make_cache(tmp_path, monkeypatch)
+    cache.update("prompt", LLM_STRING, [Generation(text="réponse")])
+
+    assert cache.lookup("prompt", "model=test temperature=1") is None
+    assert cache.lookup("autre prompt", LLM_STRING) is None
+    assert cache.stats()["misses"] == 2
+
+
+def test_entry_expires_after_ttl(tmp_path, monkeypatch):
+    cache, clock = make_cache(tmp_path, monkeypatch, ttl_seconds=60)
+    cache.update("prompt", LLM_STRING, [Generation(text="réponse")])
+
+    clock.now += 30
+    assert cache.lookup("prompt", LLM_STRING) is not None
+
+    clock.now += 31
+    assert cache.lookup("prompt", LLM_STRING) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path, monkeypatch):
+    cache, clock = make_cache(tmp_path, monkeypatch)
+    cache.update("a", LLM_STRING, [Generation(text="x" * 100)])
+    entry_size = cache.stats()["size_bytes"]
+    cache.max_size_bytes = entry_size * 2
+
+    clock.now += 1
+    cache.update("b", LLM_STRING, [Generation(text="x" * 100)])
+    clock.now += 1
+    # "a" devient la plus récemment utilisée
+    assert cache.lookup("a", LLM_STRING) is not None
+    clock.now += 1
+    cache.update("c", LLM_STRING, [Generation(text="x" * 100)])
+
+    assert cache.lookup("b", LLM_STRING) is None
+    assert cache.lookup("a", LLM_STRING) is not None
+    assert cache.lookup("c", LLM_STRING) is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entries_persist_across_instances(tmp_path, monkeypatch):
+    cache, _ = make_cache(tmp_path, monkeypatch)
+    cache.update("prompt", LLM_STRING, [Generation(text="réponse")])
+
+    reopened = PersistentLLMCache(cache.database_path)
+
+    assert reopened.lookup("prompt", LLM_STRING)[0].text == "réponse"
+
+
+def test_injected_chat_model_uses_the_shared_cache(tmp_path, monkeypatch):
+    shared_cache = PersistentLLMCache(str(tmp_path / "shared.sqlite"))
+    monkeypatch.setattr(clients, "get_llm_cache", lambda: shared_cache)
+    model = clients.prepare_llm(FakeListChatModel(responses=["première", "seconde"]))
+
+    assert model.invoke("prompt").content == "première"
+    assert model.invoke("prompt").content == "première"
+    assert shared_cache.stats()["hits"] == 1
+
+
+def test_injected_chat_model_keeps_its_own_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(clients, "get_llm_cache", lambda: PersistentLLMCache(str(tmp_path / "shared.sqlite")))
+    model = clients.prepare_llm(FakeListChatModel(responses=["première", "seconde"], cache=False))
+
+    assert model.invoke("prompt").content == "première"
+    assert model.invoke("prompt").content == "seconde"
@@ -0,0 +1,89 @@
+"""
+Tests du manifeste d'enrichissement incrémental (src/enrichment/manifest.py).
+"""
+
+import json
+
+from src.enrichment.manifest import EnrichmentManifest
+from src.models.pedagogical_scenario import PedagogicalDay, PedagogicalScenario, PedagogicalSequence
+
+SETTINGS = {"model": "gpt-test", "prefilter_top_k": 0, "relevance_batch_size": 8}
+
+
+def make_scenario(title="Gestion des prairies"):
+    sequence = PedagogicalSequence(sequence_number=1, title="Sols", content="Analyse des sols",
+                                   start_time="09:00", end_time="10:30")
+    return PedagogicalScenario(scenario_title=title, days=[PedagogicalDay(day_number=1, sequences=[sequence])])
+
+
+def make_article(source, content):
+    return {"title": source.upper(), "source": source, "content": content}
+
+
+def save_manifest(tmp_path, scenario, articles, settings=SETTINGS):
+    manifest = EnrichmentManifest.load(str(tmp_path), scenario, settings)
+    for article in articles:
+        manifest.record(article, f"Nouveauté de {article['source']}", "1-1", 0.9)
+    manifest.save()
+    return manifest
+
+
+def test_reload_keeps_processed_articles(tmp_path):
+    scenario = make_scenario()
+    articles = [make_article("a.md", "contenu a"), make_article("b.md", "contenu b")]
+    save_manifest(tmp_path, scenario, articles)
+
+    manifest = EnrichmentManifest.load(str(tmp_path), scenario, SETTINGS)
+
+    assert manifest.pending_articles(articles) == []
+    assert [entry["article_source"] for entry in manifest.assignments(articles)] == ["a.md", "b.md"]
+
+
+def test_modified_or_new_article_is_pending(tmp_path):
+    scenario = make_scenario()
+    save_manifest(tmp_path, scenario, [make_article("a.md", "contenu a"), make_article("b.md", "contenu b")])
+
+    manifest = EnrichmentManifest.load(str(tmp_path), scenario, SETTINGS)
+    articles = [make_article("a.md", "contenu a"), make_article("b.md", "contenu b modifié"),
+                make_article("c.md", "contenu c")]
+
+    assert [article["source"] for article in manifest.pending_articles(articles)] == ["b.md", "c.md"]
+
+
+def test_changed_settings_invalidate_manifest(tmp_path):
+    scenario = make_scenario()
+    articles = [make_article("a.md", "contenu a")]
+    save_manifest(tmp_path, scenario, articles)
+
+    manifest = EnrichmentManifest.load(str(tmp_path), scenario, dict(SETTINGS, relevance_batch_size=1))
+
+    assert manifest.articles == {}
+    assert manifest.pending_articles(articles) == articles
+
+
+def test_changed_scenario_uses_another_manifest(tmp_path):
+    articles = [make_article("a.md", "contenu a")]
+    save_manifest(tmp_path, make_scenario(), articles)
+
+    manifest = EnrichmentManifest.load(str(tmp_path), make_scenario("Autre scénario"), SETTINGS)
+
+    assert manifest.pending_articles(articles) == articles
+
+
+def test_unreadable_manifest_starts_empty(tmp_path):
+    scenario = make_scenario()
+    manifest = save_manifest(tmp_path, scenario, [make_article("a.md", "contenu a")])
+    manifest.path.write_text("{ tronqué", encoding="utf-8")
+
+    assert EnrichmentManifest.load(str(tmp_path), scenario, SETTINGS).articles == {}
+
+
+def test_prune_removes_articles_missing_from_corpus(tmp_path):
+    scenario = make_scenario()
+    manifest = save_manifest(tmp_path, scenario, [make_article("a.md", "contenu a"), make_article("b.md", "contenu b")])
+
+    assert manifest.prune([make_article("a.md", "contenu a")]) == 1
+    manifest.save()
+
+    with open(manifest.path, encoding="utf-8") as f:
+        assert list(json.load(f)["articles"]) == ["a.md"]
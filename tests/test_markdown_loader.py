@@ -0,0 +1,71 @@
+"""
+Tests du chargement des fichiers markdown (src/loaders/markdown_loader.py).
+"""
+
+import pytest
+
+from src.loaders.markdown_loader import MarkdownLoader
+
+ARTICLE = """# Pâturage tournant dynamique
+
+## Résumé
+
+Étude sur trois saisons.
+
+## Conclusions
+
+- Rendement en hausse de 12 %
+"""
+
+
+def test_native_mode_keeps_markdown_structure(tmp_path):
+    path = tmp_path / "article.md"
+    path.write_text(ARTICLE, encoding="utf-8")
+
+    document = MarkdownLoader(mode="native").load_file(str(path))
+
+    assert document.page_content == ARTICLE.strip()
+    assert document.metadata["source"] == str(path)
+    assert document.metadata["file_name"] == "article.md"
+    assert document.metadata["file_size"] == path.stat().st_size
+    assert document.metadata["loader_type"] == "MarkdownLoader"
+
+
+def test_native_mode_removes_bom_and_normalizes_newlines(tmp_path):
+    path = tmp_path / "article.md"
+    path.write_bytes(("\ufeff" + ARTICLE.replace("\n", "\r\n")).encode("utf-8"))
+
+    document = MarkdownLoader(mode="native").load_file(str(path))
+
+    assert document.page_content == ARTICLE.strip()
+
+
+def test_native_mode_rejects_empty_files(tmp_path):
+    path = tmp_path / "vide.md"
+    path.write_text("  \n", encoding="utf-8")
+
+    with pytest.raises(ValueError, match="Impossible de charger"):
+        MarkdownLoader(mode="native").load_file(str(path))
+
+
+def test_load_file_validates_path_and_extension(tmp_path):
+    loader = MarkdownLoader(mode="native")
+    (tmp_path / "notes.txt").write_text(ARTICLE, encoding="utf-8")
+
+    with pytest.raises(FileNotFoundError):
+        loader.load_file(str(tmp_path / "absent.md"))
+    with pytest.raises(ValueError, match="pas un fichier markdown"):
+        loader.load_file(str(tmp_path / "notes.txt"))
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError, match="inconnu"):
+        MarkdownLoader(mode="pandoc")
+
+
+def test_mode_defaults_to_configuration(monkeypatch):
+    from src.config import config
+
+    monkeypatch.setattr(config, "MARKDOWN_LOADER_MODE", "Native")
+
+    assert MarkdownLoader().mode == "native"
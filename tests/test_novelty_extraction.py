@@ -0,0 +1,57 @@
+"""
+Tests de l'extraction concurrente des nouveautés (ScenarioEnrichment._extract_novelties_by_article).
+"""
+
+import re
+
+from tests.conftest import ScriptedLLM
+
+
+def make_articles(count):
+    return [{"title": f"Article {index}", "source": f"data/article_{index}.md",
+             "content": f"# Article {index}\n\n## Conclusions\n\nRésultat {index}."}
+            for index in range(count)]
+
+
+def conclusion_for(prompt):
+    title = re.search(r"Titre: (.*)", prompt).group(1)
+    if title == "Article 2":
+        raise ValueError("réponse illisible")
+    if title == "Article 3":
+        return "AUCUNE CONCLUSION"
+    return f"Conclusion de {title}"
+
+
+def test_articles_are_extracted_concurrently_within_the_bound(make_enrichment):
+    llm = ScriptedLLM(conclusion_for, delay=0.05)
+    enrichment = make_enrichment(llm, max_concurrency=3)
+
+    enrichment._extract_novelties_by_article(make_articles(9))
+
+    assert llm.max_in_flight == 3
+
+
+def test_outcomes_follow_article_order_and_isolate_failures(make_enrichment):
+    enrichment = make_enrichment(ScriptedLLM(conclusion_for, delay=0.01), max_concurrency=4)
+
+    outcomes = enrichment._extract_novelties_by_article(make_articles(5))
+
+    assert [novelty and novelty["nouveaute"] for novelty, _ in outcomes] == [
+        "Conclusion de Article 0", "Conclusion de Article 1", None, None, "Conclusion de Article 4"
+    ]
+    assert isinstance(outcomes[2][1], ValueError)
+    assert [error for _, error in outcomes if error is not None] == [outcomes[2][1]]
+
+
+def test_progress_events_count_every_article(make_enrichment):
+    events = []
+    enrichment = make_enrichment(ScriptedLLM(conclusion_for), max_concurrency=2,
+                                 progress_callback=lambda event, data: events.append((event, data)))
+
+    enrichment._extract_novelties_by_article(make_articles(4))
+
+    articles = [data for event, data in events if event == "article"]
+    assert sorted(data["done"] for data in articles) == [1, 2, 3, 4]
+    assert {data["title"]: data["status"] for data in articles} == {
+        "Article 0": "extracted", "Article 1": "extracted", "Article 2": "error", "Article 3": "no_conclusion"
+    }
@@ -0,0 +1,55 @@
+"""
+Tests de l'exécution du graphe d'étapes (src/tasks/pipeline.py).
+"""
+
+import threading
+
+import pytest
+
+from src.tasks.pipeline import Stage, run_pipeline
+
+
+def test_stages_receive_the_results_of_their_dependencies():
+    stages = [
+        Stage("sum", lambda deps: deps["a"] + deps["b"], depends_on=["a", "b"]),
+        Stage("a", lambda deps: 1),
+        Stage("b", lambda deps: 2),
+        Stage("double", lambda deps: deps["sum"] * 2, depends_on=["sum"]),
+    ]
+
+    assert run_pipeline(stages) == {"a": 1, "b": 2, "sum": 3, "double": 6}
+
+
+def test_independent_stages_run_in_parallel():
+    # Les deux étapes ne se terminent que si elles s'exécutent en même temps
+    barrier = threading.Barrier(2, timeout=5)
+    stages = [Stage("left", lambda deps: barrier.wait()), Stage("right", lambda deps: barrier.wait())]
+
+    assert sorted(run_pipeline(stages).values()) == [0, 1]
+
+
+def test_dependents_of_a_failed_stage_are_not_started():
+    started = []
+
+    def fail(deps):
+        raise RuntimeError("étape en échec")
+
+    stages = [
+        Stage("fail", fail),
+        Stage("independent", lambda deps: started.append("independent")),
+        Stage("dependent", lambda deps: started.append("dependent"), depends_on=["fail"]),
+    ]
+
+    with pytest.raises(RuntimeError, match="étape en échec"):
+        run_pipeline(stages)
+    assert started == ["independent"]
+
+
+@pytest.mark.parametrize("stages, message", [
+    ([Stage("a", len), Stage("a", len)], "en double"),
+    ([Stage("a", len, depends_on=["absente"])], "inconnues"),
+    ([Stage("a", len, depends_on=["b"]), Stage("b", len, depends_on=["a"])], "Cycle"),
+])
+def test_invalid_graphs_are_rejected_before_running(stages, message):
+    with pytest.raises(ValueError, match=message):
+        run_pipeline(stages)
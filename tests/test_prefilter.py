@@ -0,0 +1,63 @@
+"""
+Tests du pré-filtrage vectoriel des séquences candidates (ScenarioEnrichment._prefilter_candidates).
+"""
+
+from tests.conftest import ScriptedLLM, make_sequences
+
+# Vecteurs simulés: un axe par thème
+VECTORS = {"sol": [1.0, 0.0, 0.0], "eau": [0.0, 1.0, 0.0], "élevage": [0.0, 0.0, 1.0]}
+
+
+class ThemeEmbedder:
+    """Embedder simulé: vecteur du premier thème cité dans le texte."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def embed_documents(self, texts):
+        self.calls += 1
+        return [next((vector for theme, vector in VECTORS.items() if theme in text), [0.0, 0.0, 0.0])
+                for text in texts]
+
+
+class FailingEmbedder:
+    def embed_documents(self, texts):
+        raise RuntimeError("modèle d'embedding indisponible")
+
+
+def make_novelties(*texts):
+    return [{"nouveaute": text, "article_title": text} for text in texts]
+
+
+SEQUENCES = make_sequences("travail du sol", "irrigation et eau", "élevage bovin", "couverts et sol")
+
+
+def test_keeps_the_closest_sequences_in_original_order(make_enrichment):
+    embedder = ThemeEmbedder()
+    enrichment = make_enrichment(ScriptedLLM(lambda prompt: ""), embedder=embedder, prefilter_top_k=2)
+
+    candidates = enrichment._prefilter_candidates(make_novelties("carbone du sol", "gestion de l'eau"), SEQUENCES)
+
+    assert candidates[0] == [0, 3]
+    assert 1 in candidates[1] and len(candidates[1]) == 2
+    assert embedder.calls == 1
+
+
+def test_disabled_prefilter_keeps_every_sequence(make_enrichment):
+    embedder = ThemeEmbedder()
+    enrichment = make_enrichment(ScriptedLLM(lambda prompt: ""), embedder=embedder, prefilter_top_k=0)
+
+    assert enrichment._prefilter_candidates(make_novelties("sol"), SEQUENCES) == [[0, 1, 2, 3]]
+    assert embedder.calls == 0
+
+
+def test_top_k_larger_than_sequences_keeps_every_sequence(make_enrichment):
+    enrichment = make_enrichment(ScriptedLLM(lambda prompt: ""), embedder=ThemeEmbedder(), prefilter_top_k=10)
+
+    assert enrichment._prefilter_candidates(make_novelties("sol"), SEQUENCES) == [[0, 1, 2, 3]]
+
+
+def test_embedder_failure_falls_back_to_every_sequence(make_enrichment):
+    enrichment = make_enrichment(ScriptedLLM(lambda prompt: ""), embedder=FailingEmbedder(), prefilter_top_k=1)
+
+    assert enrichment._prefilter_candidates(make_novelties("sol", "eau"), SEQUENCES) == [[0, 1, 2, 3]] * 2
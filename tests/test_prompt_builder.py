@@ -0,0 +1,93 @@
+"""
+Tests de la construction des extraits d'articles sous budget de tokens
+(src/enrichment/prompt_builder.py).
+"""
+
+from langchain_core.documents import Document
+
+from src.config import config
+from src.enrichment.prompt_builder import (build_article_excerpt, count_tokens, section_priority,
+                                           split_sections, strip_airtable_header)
+from src.loaders.markdown_loader import MarkdownLoader
+from tests.conftest import ScriptedLLM
+
+HEADER = """# Article Airtable - 2026-01-15_rec123
+
+**Date de l'article:** 2026-01-15
+**ID Airtable:** rec123
+**Créé le:** 2026-01-01T00:00:00.000Z
+
+---
+
+"""
+
+BODY = """# Pâturage tournant dynamique
+
+Introduction générale sur les prairies.
+
+## Méthode
+
+Suivi de douze exploitations pendant trois saisons.
+
+## Résultats
+
+Hausse de 12 % de la production d'herbe.
+
+## Conclusions
+
+Le pâturage tournant améliore l'autonomie fourragère.
+"""
+
+
+def unstructured_text(markdown):
+    """Texte produit par le mode unstructured: ni titres `#`, ni séparateurs `---`."""
+    lines = [line.lstrip("#").strip() for line in markdown.splitlines() if line.strip() != "---"]
+    return "\n\n".join(line for line in lines if line)
+
+
+def test_airtable_header_is_removed():
+    assert strip_airtable_header(HEADER + BODY) == BODY.lstrip()
+    assert strip_airtable_header(BODY) == BODY.lstrip()
+
+
+def test_sections_keep_their_heading_and_preamble():
+    sections = split_sections("Préambule.\n\n# Titre\n\nTexte.\n\n## Conclusions\n\nFin.")
+
+    assert sections == [("", "Préambule."), ("Titre", "# Titre\n\nTexte."), ("Conclusions", "## Conclusions\n\nFin.")]
+
+
+def test_conclusions_come_first_then_results():
+    assert section_priority("Conclusions et perspectives") < section_priority("Principaux résultats")
+    assert section_priority("Résultats") < section_priority("Méthode")
+
+    excerpt, _ = build_article_excerpt(HEADER + BODY, max_tokens=1000)
+
+    assert excerpt.index("## Conclusions") < excerpt.index("## Résultats") < excerpt.index("## Méthode")
+    assert "ID Airtable" not in excerpt
+
+
+def test_budget_keeps_conclusions_and_reports_tokens_saved():
+    content = HEADER + BODY.replace("Suivi de douze", "Suivi détaillé. " * 400 + "Suivi de douze")
+
+    excerpt, stats = build_article_excerpt(content, max_tokens=60)
+
+    assert "autonomie fourragère" in excerpt
+    assert stats["prompt_tokens"] == count_tokens(excerpt) <= 60
+    assert stats["tokens_saved"] == stats["original_tokens"] - stats["prompt_tokens"] > 0
+
+
+def test_enrichment_reads_markdown_structure_in_unstructured_mode(tmp_path, monkeypatch, make_enrichment):
+    (tmp_path / "article.md").write_text(HEADER + BODY, encoding="utf-8")
+    monkeypatch.setattr(config, "MARKDOWN_LOADER_MODE", "unstructured")
+    # Le mode unstructured (par défaut) perd les titres: simulé sans dépendre de nltk
+    monkeypatch.setattr(MarkdownLoader, "_load_unstructured", lambda self, path: Document(
+        page_content=unstructured_text(path.read_text(encoding="utf-8")), metadata={"source": str(path)}))
+    enrichment = make_enrichment(ScriptedLLM(lambda prompt: "AUCUNE CONCLUSION"), prompt_max_tokens=1000)
+
+    articles = enrichment.analyze_scientific_articles(str(tmp_path))
+    excerpt, _ = enrichment._build_article_excerpt(articles[0])
+
+    assert enrichment.loader.mode == "unstructured"
+    assert "#" not in articles[0]["content"]
+    assert excerpt.startswith("## Conclusions")
+    assert "ID Airtable" not in excerpt
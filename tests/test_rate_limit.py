@@ -0,0 +1,62 @@
+"""
+Tests du limiteur de débit partagé des appels LLM (src/llm/rate_limit.py).
+"""
+
+import json
+import threading
+import time
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from src.llm import clients
+from src.llm.cache import PersistentLLMCache
+from src.llm.rate_limit import ChatModelRateLimiter, LLMRateLimiter, estimate_request_tokens
+
+
+def test_request_tokens_include_prompt_and_completion_budget():
+    body = json.dumps({"messages": [{"role": "user", "content": "x" * 400}], "max_tokens": 50}).encode()
+
+    assert estimate_request_tokens(body) == 150
+
+
+def test_requests_beyond_the_rpm_limit_are_queued_not_rejected():
+    # 1200 requêtes par minute: une requête toutes les 50 ms une fois la rafale consommée
+    limiter = LLMRateLimiter(requests_per_minute=1200, tokens_per_minute=0)
+    limiter._request_bucket.acquire(limiter._request_bucket.capacity)
+
+    threads = [threading.Thread(target=limiter.acquire) for _ in range(4)]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = limiter.stats()
+    assert time.monotonic() - start >= 0.15
+    assert (stats["requests"], stats["delayed_requests"], stats["waiting"]) == (4, 4, 0)
+    assert stats["max_wait_seconds"] >= stats["avg_wait_seconds"] > 0
+
+
+def test_actual_usage_corrects_the_token_reservation():
+    limiter = LLMRateLimiter(requests_per_minute=0, tokens_per_minute=6000)
+
+    limiter.acquire(500)
+    limiter.record_usage(500, 120)
+
+    assert limiter.stats()["used_tokens"] == 120
+    assert limiter._token_bucket.acquire(5880) < 0.1
+
+
+def test_injected_chat_model_calls_go_through_the_shared_limiter(tmp_path, monkeypatch):
+    limiter = LLMRateLimiter(requests_per_minute=6000, tokens_per_minute=0)
+    monkeypatch.setattr(clients, "get_llm_rate_limiter", lambda: limiter)
+    monkeypatch.setattr(clients, "get_llm_cache", lambda: PersistentLLMCache(str(tmp_path / "cache.sqlite")))
+    model = clients.prepare_llm(FakeListChatModel(responses=["première", "seconde"]))
+
+    model.invoke("prompt")
+    model.invoke("prompt")
+    model.invoke("autre prompt")
+
+    assert isinstance(model.rate_limiter, ChatModelRateLimiter)
+    # La réponse servie par le cache ne consomme pas de requête
+    assert limiter.stats()["requests"] == 2
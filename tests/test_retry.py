@@ -0,0 +1,129 @@
+"""
+Tests de la politique de nouvelles tentatives (src/retry.py).
+"""
+
+import time
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from src.retry import RetryPolicy, get_retry_after, is_retryable_error
+
+
+class FakeHTTPError(Exception):
+    """Erreur HTTP simulée portant une réponse (code et en-têtes)."""
+
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.response = SimpleNamespace(status_code=status_code, headers=headers or {})
+
+
+@pytest.mark.parametrize("status_code", [408, 429, 500, 502, 503, 504])
+def test_transient_status_codes_are_retryable(status_code):
+    assert is_retryable_error(FakeHTTPError(status_code))
+
+
+@pytest.mark.parametrize("status_code", [400, 401, 403, 404, 422])
+def test_client_errors_are_not_retryable(status_code):
+    assert not is_retryable_error(FakeHTTPError(status_code))
+
+
+def test_network_errors_are_retryable():
+    assert is_retryable_error(TimeoutError())
+    assert is_retryable_error(ConnectionError())
+
+
+def test_parsing_errors_are_not_retryable():
+    assert not is_retryable_error(ValueError("JSON invalide"))
+
+
+def test_wrapped_error_is_classified_by_its_cause():
+    try:
+        try:
+            raise FakeHTTPError(429)
+        except FakeHTTPError as e:
+            raise Exception("Erreur lors du traitement du document") from e
+    except Exception as wrapped:
+        assert is_retryable_error(wrapped)
+
+
+def test_retry_after_header_in_seconds():
+    assert get_retry_after(FakeHTTPError(429, {"retry-after": "7"})) == 7.0
+
+
+def test_retry_after_ms_header_takes_precedence():
+    error = FakeHTTPError(429, {"retry-after-ms": "1500", "retry-after": "7"})
+    assert get_retry_after(error) == 1.5
+
+
+def test_retry_after_http_date():
+    date = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    delay = get_retry_after(FakeHTTPError(503, {"retry-after": date}))
+    assert 25 <= delay <= 30
+
+
+def test_retry_after_missing_or_invalid():
+    assert get_retry_after(FakeHTTPError(429)) is None
+    assert get_retry_after(FakeHTTPError(429, {"retry-after": "bientôt"})) is None
+    assert get_retry_after(ValueError()) is None
+
+
+def test_compute_delay_is_capped_exponential_backoff():
+    policy = RetryPolicy(max_attempts=5, base_delay=1.0, max_delay=3.0)
+    for attempt in range(1, 6):
+        assert 0 <= policy.compute_delay(attempt) <= min(3.0, 2 ** (attempt - 1))
+
+
+def test_compute_delay_honours_retry_after():
+    policy = RetryPolicy(base_delay=0.0, max_retry_after=120.0)
+    assert policy.compute_delay(1, FakeHTTPError(429, {"retry-after": "20"})) == 20.0
+
+
+def test_compute_delay_caps_retry_after():
+    policy = RetryPolicy(base_delay=0.0, max_retry_after=60.0)
+    assert policy.compute_delay(1, FakeHTTPError(429, {"retry-after": "86400"})) == 60.0
+
+
+def test_call_retries_transient_errors_until_success():
+    sleeps = []
+    policy = RetryPolicy(max_attempts=3, base_delay=0.0, sleep=sleeps.append)
+    outcomes = [FakeHTTPError(503), FakeHTTPError(429), "ok"]
+
+    def flaky():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    retries = []
+    assert policy.call(flaky, on_retry=lambda attempt, error, delay: retries.append(attempt)) == "ok"
+    assert retries == [1, 2]
+    assert len(sleeps) == 2
+
+
+def test_call_raises_definitive_error_immediately():
+    calls = []
+    policy = RetryPolicy(max_attempts=5, base_delay=0.0, sleep=lambda delay: None)
+
+    def invalid():
+        calls.append(1)
+        raise FakeHTTPError(400)
+
+    with pytest.raises(FakeHTTPError):
+        policy.call(invalid)
+    assert len(calls) == 1
+
+
+def test_call_gives_up_after_max_attempts():
+    calls = []
+    policy = RetryPolicy(max_attempts=3, base_delay=0.0, sleep=lambda delay: None)
+
+    def unavailable():
+        calls.append(1)
+        raise FakeHTTPError(503)
+
+    with pytest.raises(FakeHTTPError):
+        policy.call(unavailable)
+    assert len(calls) == 3
@@ -0,0 +1,112 @@
+"""
+Tests du découpage des documents longs et de la fusion des extractions partielles
+(src/processors/scenario_chunking.py).
+"""
+
+import pytest
+
+from src.enrichment.prompt_builder import count_tokens
+from src.models.pedagogical_scenario import PedagogicalDay, PedagogicalScenario
+from src.processors.scenario_chunking import merge_chunk_scenarios, split_document_into_chunks
+from tests.conftest import make_sequences
+
+
+def paragraphs(prefix, count, words=40):
+    return [f"{prefix} paragraphe {index}: " + " ".join(["observation de la prairie"] * (words // 4))
+            for index in range(count)]
+
+
+def test_chunks_are_cut_between_days():
+    days = [f"Jour {day}\n\n" + "\n\n".join(paragraphs(f"J{day}", 3)) for day in range(1, 5)]
+    text = "Programme de formation\n\n" + "\n\n".join(days)
+    budget = count_tokens(days[0]) * 2 + 50
+
+    chunks = split_document_into_chunks(text, budget)
+
+    assert len(chunks) > 1
+    assert all(not continues for _, continues in chunks)
+    assert all(chunk.startswith("Jour") for chunk, _ in chunks[1:])
+    assert all(count_tokens(chunk) <= budget for chunk, _ in chunks)
+
+
+def test_long_document_without_day_markers_is_cut_between_paragraphs():
+    # Texte d'un document Word chargé sans preserve_formatting: ni journées, ni titres
+    lines = paragraphs("Module", 60)
+    text = "\n\n".join(lines)
+    budget = count_tokens(text) // 5
+
+    chunks = split_document_into_chunks(text, budget)
+
+    assert len(chunks) >= 5
+    assert all(count_tokens(chunk) <= budget for chunk, _ in chunks)
+    assert [continues for _, continues in chunks] == [False] + [True] * (len(chunks) - 1)
+    assert [line for chunk, _ in chunks for line in chunk.splitlines() if line.strip()] == lines
+
+
+def test_headings_are_used_when_there_are_no_day_markers():
+    sections = [f"# Module {index}\n\n" + "\n\n".join(paragraphs(f"M{index}", 3)) for index in range(4)]
+    budget = count_tokens(sections[0]) + 10
+
+    chunks = split_document_into_chunks("\n\n".join(sections), budget)
+
+    assert [chunk for chunk, _ in chunks] == sections
+
+
+def test_short_document_is_a_single_chunk():
+    assert split_document_into_chunks("Jour 1\n\nAccueil.\n\nJour 2\n\nVisite.", 1000) == [
+        ("Jour 1\n\nAccueil.\n\nJour 2\n\nVisite.", False)
+    ]
+
+
+def test_word_headings_are_kept_with_preserve_formatting(tmp_path):
+    docx = pytest.importorskip("docx")
+    from src.loaders.word_loader import WordLoader
+
+    document = docx.Document()
+    for index in range(3):
+        document.add_heading(f"Module {index}", level=1)
+        for paragraph in paragraphs(f"M{index}", 3):
+            document.add_paragraph(paragraph)
+    path = tmp_path / "programme.docx"
+    document.save(str(path))
+
+    plain = WordLoader().load(str(path))[0].page_content
+    formatted = WordLoader(preserve_formatting=True).load(str(path))[0].page_content
+    budget = count_tokens(formatted) // 3 + 10
+
+    assert "#" not in plain
+    assert [chunk.splitlines()[0] for chunk, _ in split_document_into_chunks(formatted, budget)] == [
+        "# Module 0", "# Module 1", "# Module 2"
+    ]
+
+
+def make_scenario(*days, **fields):
+    return PedagogicalScenario(days=[PedagogicalDay(day_number=9, day_title=title, sequences=make_sequences(*contents))
+                                     for title, contents in days], **fields)
+
+
+def test_merge_renumbers_days_and_joins_a_day_split_across_chunks():
+    first = make_scenario(("Accueil", ["Présentation"]), ("Prairies", ["Observation"]),
+                          scenario_title="Conduite des prairies", global_objectives=["Diagnostiquer"],
+                          confidence_score=0.9)
+    second = make_scenario(("Prairies", ["Mesure de l'herbe"]), ("Bilan", ["Synthèse"]),
+                           global_objectives=["diagnostiquer", "Planifier"], confidence_score=0.7)
+
+    scenario = merge_chunk_scenarios([(first, False), (second, True)])
+
+    assert [(day.day_number, day.day_title) for day in scenario.days] == [(1, "Accueil"), (2, "Prairies"), (3, "Bilan")]
+    assert [(s.sequence_number, s.content) for s in scenario.days[1].sequences] == [
+        (1, "Observation"), (2, "Mesure de l'herbe")
+    ]
+    assert scenario.scenario_title == "Conduite des prairies"
+    assert scenario.global_objectives == ["Diagnostiquer", "Planifier"]
+    assert scenario.confidence_score == 0.7
+
+
+def test_merge_keeps_distinct_days_apart():
+    first = make_scenario(("Jour 1", ["Accueil"]))
+    second = make_scenario(("Jour 2", ["Visite"]))
+
+    scenario = merge_chunk_scenarios([(first, False), (second, True)])
+
+    assert [day.day_title for day in scenario.days] == ["Jour 1", "Jour 2"]
@@ -0,0 +1,109 @@
+"""
+Tests du planificateur à file d'attente bornée (src/tasks/scheduler.py) et de
+son contrôle d'admission dans l'API (réponse 429).
+"""
+
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from src.tasks.scheduler import JobScheduler, QueueFullError
+from src.tasks.store import InMemoryTaskStore
+
+
+class Gate:
+    """Traitement bloqué jusqu'à l'ouverture de la barrière."""
+
+    def __init__(self):
+        self.opened = threading.Event()
+        self.started = threading.Semaphore(0)
+
+    def job(self, *args):
+        self.started.release()
+        assert self.opened.wait(5)
+
+
+@pytest.fixture
+def gate():
+    gate = Gate()
+    yield gate
+    gate.opened.set()
+
+
+def test_submissions_beyond_workers_and_queue_are_rejected(gate):
+    scheduler = JobScheduler(max_workers=2, max_queue_size=1)
+
+    assert scheduler.submit("a", gate.job) == 0
+    assert scheduler.submit("b", gate.job) == 0
+    assert scheduler.submit("c", gate.job) == 1
+    with pytest.raises(QueueFullError):
+        scheduler.submit("d", gate.job)
+
+    assert scheduler.stats()["rejected"] == 1
+    gate.opened.set()
+    scheduler.shutdown()
+    assert scheduler.stats()["completed"] == 3
+
+
+def test_running_jobs_are_bounded_by_max_workers(gate):
+    scheduler = JobScheduler(max_workers=2, max_queue_size=5)
+    for index in range(4):
+        scheduler.submit(f"job{index}", gate.job)
+    gate.started.acquire(timeout=5)
+    gate.started.acquire(timeout=5)
+
+    assert scheduler.stats()["running"] == 2
+    assert scheduler.stats()["queued"] == 2
+    assert sorted(scheduler.position(f"job{index}") for index in range(4)) == [0, 0, 1, 2]
+    gate.opened.set()
+    scheduler.shutdown()
+
+
+def test_waiting_jobs_are_told_their_new_position(gate):
+    scheduler = JobScheduler(max_workers=1, max_queue_size=5)
+    positions = []
+    scheduler.submit("first", gate.job)
+    gate.started.acquire(timeout=5)
+    scheduler.submit("second", gate.job)
+    scheduler.submit("third", gate.job, on_queue_position=positions.append)
+
+    gate.opened.set()
+    scheduler.shutdown()
+
+    assert positions == [2, 1]
+
+
+def test_failing_job_does_not_stop_the_worker():
+    scheduler = JobScheduler(max_workers=1, max_queue_size=5)
+    done = []
+
+    def fail():
+        raise ValueError("erreur")
+
+    scheduler.submit("fail", fail)
+    scheduler.submit("ok", done.append, "ok")
+    scheduler.shutdown()
+
+    assert done == ["ok"]
+    assert (scheduler.stats()["failed"], scheduler.stats()["completed"]) == (1, 1)
+
+
+def test_api_answers_429_when_the_queue_is_full(gate, monkeypatch):
+    api = pytest.importorskip("api")
+    monkeypatch.setattr(api, "task_store", InMemoryTaskStore())
+    monkeypatch.setattr(api, "job_scheduler", JobScheduler(max_workers=1, max_queue_size=0))
+
+    def make_task(task_id):
+        return api.EnrichmentTask(task_id, api.EnrichmentRequest(scenario_json="input/scenario.json"))
+
+    api.submit_task(make_task("accepted"), gate.job)
+    with pytest.raises(HTTPException) as error:
+        api.submit_task(make_task("rejected"), gate.job)
+
+    assert error.value.status_code == 429
+    assert error.value.headers["Retry-After"] == str(api.QUEUE_FULL_RETRY_AFTER_SECONDS)
+    assert api.task_store.get("rejected") is None
+    assert api.task_store.get("accepted") is not None
+    gate.opened.set()
+    api.job_scheduler.shutdown()
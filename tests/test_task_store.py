@@ -0,0 +1,90 @@
+"""
+Tests des stockages de tâches (src/tasks/store.py).
+"""
+
+import time
+from datetime import datetime
+
+import pytest
+
+from src.tasks.store import InMemoryTaskStore, SQLiteTaskStore
+
+
+def make_task(task_id, status="pending", **fields):
+    task = {
+        "task_id": task_id,
+        "status": status,
+        "created_at": datetime.now().isoformat(),
+        "progress": None,
+        "result": None,
+        "error": None,
+        "request": {"scenario_json": "input/scenario.json", "options": {"max_articles": 5}}
+    }
+    task.update(fields)
+    return task
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return InMemoryTaskStore()
+    return SQLiteTaskStore(str(tmp_path / "tasks.sqlite"))
+
+
+def test_round_trip(store):
+    task = make_task("t1", result={"files": ["a.md"], "pertinence": 0.8})
+    store.save(task)
+
+    assert store.get("t1") == task
+    assert store.get("inconnue") is None
+
+
+def test_save_updates_existing_task(store):
+    store.save(make_task("t1"))
+    store.save(make_task("t1", status="running", progress="Étape 2/3"))
+
+    assert store.get("t1")["status"] == "running"
+    assert store.get("t1")["progress"] == "Étape 2/3"
+    assert len(store.list()) == 1
+
+
+def test_list_and_delete(store):
+    store.save(make_task("t1", created_at="2026-01-01T10:00:00"))
+    store.save(make_task("t2", created_at="2026-01-01T09:00:00"))
+
+    assert [task["task_id"] for task in store.list()] == ["t2", "t1"]
+
+    store.delete("t2")
+    assert [task["task_id"] for task in store.list()] == ["t1"]
+
+
+def test_sqlite_tasks_survive_reopening(tmp_path):
+    path = str(tmp_path / "tasks.sqlite")
+    SQLiteTaskStore(path).save(make_task("t1", status="completed"))
+
+    assert SQLiteTaskStore(path).get("t1")["status"] == "completed"
+
+
+def test_evict_keeps_most_recent_finished_tasks(store):
+    for index in range(4):
+        store.save(make_task(f"done{index}", status="completed"))
+        time.sleep(0.01)
+    store.save(make_task("running", status="running"))
+
+    assert store.evict(ttl_seconds=0, max_finished=2) == 2
+    assert sorted(task["task_id"] for task in store.list()) == ["done2", "done3", "running"]
+
+
+def test_fail_expired_only_fails_tasks_whose_lease_expired(store):
+    now = time.time()
+    store.save(make_task("abandoned", status="running", owner="worker-a", heartbeat_at=now - 120))
+    store.save(make_task("legacy"))
+    store.save(make_task("alive", status="running", owner="worker-b", heartbeat_at=now - 5))
+    store.save(make_task("done", status="completed", heartbeat_at=now - 120))
+
+    assert store.fail_expired("Interrompue", lease_seconds=60) == 2
+    assert store.get("abandoned")["status"] == "failed"
+    assert store.get("abandoned")["error"] == "Interrompue"
+    assert store.get("legacy")["status"] == "failed"
+    assert store.get("alive")["status"] == "running"
+    assert store.get("done")["status"] == "completed"